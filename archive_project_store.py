@@ -0,0 +1,247 @@
+import io
+import os
+import json
+import zipfile
+from contextlib import contextmanager
+import numpy as np
+
+from project_store import indicator_scores, copy_project
+
+# 压缩包项目扩展名
+ARCHIVE_PROJECT_EXTENSION = ".iesz"
+
+ARCHIVE_FORMAT = "assessment-project-archive"
+ARCHIVE_VERSION = 1
+
+MANIFEST_MEMBER = "manifest.json"
+USER_INPUT_MEMBER = "User_input.json"
+INDICATOR_SYSTEM_MEMBER = "IndicatorSystem.json"
+
+
+def is_archive_project(path):
+    """判断文件是否为压缩包项目"""
+    if not os.path.isfile(path) or not zipfile.is_zipfile(path):
+        return False
+    try:
+        with zipfile.ZipFile(path) as archive:
+            manifest = json.loads(archive.read(MANIFEST_MEMBER))
+    except (KeyError, ValueError, zipfile.BadZipFile):
+        return False
+    return manifest.get("format") == ARCHIVE_FORMAT
+
+
+def _empty_manifest():
+    return {"format": ARCHIVE_FORMAT, "version": ARCHIVE_VERSION,
+            "user_input": USER_INPUT_MEMBER, "indicator_system": INDICATOR_SYSTEM_MEMBER,
+            "timeseries": {}, "arrays": {}, "outputs": {}}
+
+
+class ArchiveProjectStore:
+    """压缩包项目存储：zip容器加清单，打开时只读取中央目录，时序成员在第一次使用时才解压。
+    每次写入都把清单引用的最新成员写入临时文件后替换原文件，中断的写入不会损坏项目"""
+
+    def __init__(self, path):
+        self.path = path
+        self._archive = None
+        self._manifest = None
+        self._series_cache = {}
+        self._pending = None    # 批量写入期间尚未提交的成员
+        if not os.path.exists(path):
+            self._manifest = _empty_manifest()
+            self._commit({})
+
+    def _reader(self):
+        if self._archive is None:
+            self._archive = zipfile.ZipFile(self.path, 'r')
+        return self._archive
+
+    def _read_member(self, member):
+        if self._pending is not None and member in self._pending:
+            return self._pending[member]
+        return self._reader().read(member)
+
+    def _read_json(self, member):
+        return json.loads(self._read_member(member).decode('utf-8'))
+
+    def _members(self):
+        """清单引用的全部成员"""
+        manifest = self.manifest()
+        return [MANIFEST_MEMBER, manifest["user_input"], manifest["indicator_system"],
+                *(entry["member"] for entry in manifest["timeseries"].values()),
+                *manifest.get("arrays", {}).values(),
+                *manifest["outputs"].values()]
+
+    def _write(self, members):
+        """写入成员和当前清单，批量写入期间只记录，结束时一次提交"""
+        members = {**members, MANIFEST_MEMBER: self._manifest_bytes()}
+        if self._pending is not None:
+            self._pending.update(members)
+        else:
+            self._commit(members)
+
+    def _commit(self, members):
+        """原子提交：清单引用的成员（新写入的优先）写入临时文件，完整写出后替换原文件，
+        不再引用的旧成员同时被丢弃。写入失败时原文件保持不变，清单按原文件重新读取"""
+        tmp_path = self.path + ".tmp"
+        try:
+            reader = self._reader() if os.path.exists(self.path) else None
+            names = set(reader.namelist()) if reader is not None else set()
+            with open(tmp_path, 'wb') as file:
+                with zipfile.ZipFile(file, 'w', zipfile.ZIP_DEFLATED) as archive:
+                    for member in dict.fromkeys(self._members()):
+                        if member in members:
+                            archive.writestr(member, members[member])
+                        elif member in names:
+                            archive.writestr(reader.getinfo(member), reader.read(member))
+                # 落盘后再替换，断电时也只会留下旧文件或新文件
+                file.flush()
+                os.fsync(file.fileno())
+            # Windows 下替换前需要关闭原文件
+            if reader is not None:
+                reader.close()
+                self._archive = None
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self._manifest = None
+            self._series_cache.clear()
+            raise
+
+    @contextmanager
+    def batch(self):
+        """批量写入：期间的所有写入在退出时一次提交，出错时全部放弃"""
+        self._pending = {}
+        try:
+            yield self
+            pending = self._pending
+            self._pending = None
+            self._commit(pending)
+        except BaseException:
+            self._pending = None
+            self._manifest = None
+            self._series_cache.clear()
+            raise
+
+    def manifest(self):
+        """读取清单"""
+        if self._manifest is None:
+            self._manifest = self._read_json(MANIFEST_MEMBER)
+        return self._manifest
+
+    def _manifest_bytes(self):
+        return json.dumps(self.manifest(), ensure_ascii=False, indent=2).encode('utf-8')
+
+    def close(self):
+        """关闭压缩包（写入都已提交，无需再压缩）"""
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+    def read_user_input(self):
+        """读取 User_input.json"""
+        return self._read_json(self.manifest()["user_input"])
+
+    def write_user_input(self, data):
+        """写入 User_input.json"""
+        self._write({self.manifest()["user_input"]:
+                      json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')})
+
+    def read_indicator_system(self):
+        """读取 IndicatorSystem.json"""
+        return self._read_json(self.manifest()["indicator_system"])
+
+    def write_indicator_system(self, data):
+        """写入 IndicatorSystem.json"""
+        self._write({self.manifest()["indicator_system"]:
+                      json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')})
+
+    def read_indicator_scores(self):
+        """只读取各指标的数值和得分，返回 {指标编码: {...}}"""
+        return indicator_scores(self.read_indicator_system())
+
+    def list_timeseries(self):
+        """列出已保存的时序数据名称"""
+        return list(self.manifest()["timeseries"])
+
+    def timeseries_stamp(self, name):
+        """压缩包成员不使用文件状态缓存"""
+        return None
+
+    def read_timeseries(self, name):
+        """读取时序数据，第一次访问时解压并缓存，不存在时返回None"""
+        if name in self._series_cache:
+            return self._series_cache[name]
+        entry = self.manifest()["timeseries"].get(name)
+        if entry is None:
+            return None
+        values = np.load(io.BytesIO(self._read_member(entry["member"])), allow_pickle=False)
+        self._series_cache[name] = values
+        return values
+
+    def write_timeseries(self, name, values):
+        """写入时序数据，values 为None时从清单中移除"""
+        manifest = self.manifest()
+        if values is None:
+            manifest["timeseries"].pop(name, None)
+            self._series_cache.pop(name, None)
+            self._write({})
+            return
+
+        values = np.ascontiguousarray(values, dtype='<f8')
+        if values.ndim == 1:
+            values = values[:, None]
+        buffer = io.BytesIO()
+        np.save(buffer, values, allow_pickle=False)
+        member = f"timeseries/{name}.npy"
+        manifest["timeseries"][name] = {"member": member, "shape": list(values.shape)}
+        self._series_cache[name] = values.astype(np.float64)
+        self._write({member: buffer.getvalue()})
+
+    def list_arrays(self):
+        """列出二进制数据名称"""
+        return list(self.manifest().get("arrays", {}))
+
+    def read_array(self, name):
+        """读取二进制数据，不存在时返回None"""
+        member = self.manifest().get("arrays", {}).get(name)
+        if member is None:
+            return None
+        return np.load(io.BytesIO(self._read_member(member)), allow_pickle=False)
+
+    def write_array(self, name, values):
+        """写入二进制数据，values 为None时从清单中移除"""
+        arrays = self.manifest().setdefault("arrays", {})
+        if values is None:
+            if arrays.pop(name, None) is not None:
+                self._write({})
+            return
+        buffer = io.BytesIO()
+        np.save(buffer, np.ascontiguousarray(values, dtype='<f8'), allow_pickle=False)
+        member = f"arrays/{name}.npy"
+        arrays[name] = member
+        self._write({member: buffer.getvalue()})
+
+    def read_output_table(self, name):
+        """读取输出表格，不存在时返回None"""
+        member = self.manifest()["outputs"].get(name)
+        return None if member is None else self._read_json(member)
+
+    def write_output_table(self, name, rows):
+        """写入输出表格"""
+        member = f"outputs/{name}.json"
+        self.manifest()["outputs"][name] = member
+        self._write({member: json.dumps([list(row) for row in rows], ensure_ascii=False).encode('utf-8')})
+
+
+def pack_project(source, archive_path):
+    """把项目存储打包为压缩包项目"""
+    if os.path.exists(archive_path):
+        os.remove(archive_path)
+    target = ArchiveProjectStore(archive_path)
+    try:
+        with target.batch():
+            copy_project(source, target)
+    finally:
+        target.close()
+    return archive_path
@@ -0,0 +1,78 @@
+import numpy as np
+
+# 固定资产计划中的项目: (名称, AssetSchedule 属性)
+ASSET_ITEMS = [
+    ("折旧费", "depreciation"),
+    ("更新改造投资", "replacement"),
+    ("回收固定资产余值", "residual"),
+]
+
+
+class AssetSchedule:
+    """设备折旧、到寿更换投资和期末余值，各项均为 (方案数, 年数) 数组（万元）；
+    replacement 为含税的更换投资，replacement_vat 为其中可抵扣的进项税额，
+    by_device 为 {设备: (方案数, 年数) 折旧}"""
+
+    __slots__ = ('depreciation', 'replacement', 'replacement_vat', 'residual', 'by_device')
+
+    def __init__(self, depreciation, replacement, replacement_vat, residual, by_device):
+        self.depreciation = depreciation
+        self.replacement = replacement
+        self.replacement_vat = replacement_vat
+        self.residual = residual
+        self.by_device = by_device
+
+    def arrays(self):
+        """按 ASSET_ITEMS 的顺序返回各项数组"""
+        return [getattr(self, attr) for _, attr in ASSET_ITEMS]
+
+
+def asset_schedule(investment, lifetime, residual_ratio, years, escalation=None, codes=None, vat_rate=0.0):
+    """计算全部设备、全部方案的折旧和更换计划
+
+    investment 为各设备各方案的含税初始投资 (设备数, 方案数)，lifetime 和 residual_ratio 为
+    各设备的使用寿命（年）和残值率 (设备数,)，escalation 为各年价格系数 (年数,)。
+    进项税额可以抵扣，固定资产原值按不含税价 investment/(1+vat_rate) 计。
+    设备按直线法折旧；寿命短于计算期时在第 k×寿命 年末按当年价格更换，新设备重新折旧；
+    计算期末按最后一批设备的账面净值回收余值。
+    """
+    gross = np.asarray(investment, dtype=np.float64)
+    investment = gross / (1.0 + vat_rate)
+    devices, schemes = investment.shape
+    lifetime = np.clip(np.rint(np.asarray(lifetime, dtype=np.float64)), 1, None).astype(np.int64)
+    residual_ratio = np.asarray(residual_ratio, dtype=np.float64)
+    if escalation is None:
+        escalation = np.ones(years)
+    year = np.arange(1, years + 1)
+
+    vintage_start = (year[None, :] - 1) // lifetime[:, None] * lifetime[:, None]  # 当年在用设备的购置年份 (设备数, 年数)
+    vintage_price = escalation[vintage_start]
+    by_year = ((1.0 - residual_ratio) / lifetime)[:, None] * vintage_price
+    depreciation = investment[:, :, None] * by_year[:, None, :]                     # (设备数, 方案数, 年数)
+
+    replaced = (year[None, :] % lifetime[:, None] == 0) & (year[None, :] < years)
+    replacement_price = np.where(replaced, escalation[np.minimum(year, years - 1)][None, :], 0.0)
+    replacement = np.einsum('ds,dy->sy', gross, replacement_price)
+
+    residual = np.zeros((schemes, years))
+    if years:
+        last_start = vintage_start[:, -1]
+        age = years - last_start
+        remaining = escalation[last_start] * (1.0 - (1.0 - residual_ratio) * age / lifetime)
+        residual[:, -1] = remaining @ investment
+
+    codes = codes if codes is not None else [str(d) for d in range(devices)]
+    by_device = dict(zip(codes, depreciation))
+    return AssetSchedule(depreciation.sum(axis=0), replacement, replacement * (vat_rate / (1.0 + vat_rate)),
+                         residual, by_device)
+
+
+def schedule_from_inputs(inputs):
+    """按项目参数计算各设备的折旧和更换计划（万元）；未填写使用寿命的设备按计算期折旧"""
+    devices = list(inputs.devices.values())
+    investment = np.array([device.investment() for device in devices]).reshape(len(devices), -1) / 10000.0
+    lifetime = [device.lifetime if device.lifetime and device.lifetime > 0 else inputs.project_life
+                for device in devices]
+    residual_ratio = [device.residual_ratio for device in devices]
+    return asset_schedule(investment, lifetime, residual_ratio, inputs.project_life,
+                          inputs.escalation(), [device.code for device in devices], inputs.vat_rate)
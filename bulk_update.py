@@ -0,0 +1,44 @@
+from contextlib import contextmanager
+
+
+class BulkUpdateMixin:
+    """页面批量更新事务
+
+    页面在加载或重置时会逐个设置控件，每次 setText/setChecked 都会触发
+    data_updated 并导致一次完整的保存。在 bulk_update() 事务中，逐字段的变化
+    只做记录，事务结束后最多发出一次合并的 data_updated 信号。
+    使用该混入类的页面需要定义 data_updated 信号，并把字段变化信号连接到
+    notify_data_changed。
+    """
+
+    _bulk_update_depth = 0
+    _pending_update = False
+
+    def notify_data_changed(self, *args):
+        """字段变化时的处理，批量更新期间只记录变化"""
+        if self._bulk_update_depth:
+            self._pending_update = True
+            return
+        self.data_updated.emit()
+
+    def in_bulk_update(self):
+        """是否处于批量更新事务中"""
+        return self._bulk_update_depth > 0
+
+    @contextmanager
+    def bulk_update(self, emit=True):
+        """批量更新事务，支持嵌套，由最外层事务的 emit 决定是否发出合并通知"""
+        self._bulk_update_depth += 1
+        if self._bulk_update_depth == 1:
+            self._pending_update = False
+            self.setUpdatesEnabled(False)  # 事务期间暂停重绘
+        try:
+            yield self
+        finally:
+            self._bulk_update_depth -= 1
+            if self._bulk_update_depth == 0:
+                self.setUpdatesEnabled(True)
+                pending = self._pending_update
+                self._pending_update = False
+                if pending and emit:
+                    self.data_updated.emit()
@@ -2,14 +2,19 @@ import sys
 import os
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QFrame, QScrollArea, QTextEdit,
-                             QProgressBar, QTableWidget, QTableWidgetItem)
+                             QProgressBar, QTableWidget, QTableWidgetItem, QComboBox,
+                             QHeaderView)
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont, QIcon
+from resource_manager import get_resources, set_style_class
+from indicator_registry import INDICATORS
+from evaluation_methods import WEIGHT_METHODS, SCORE_METHODS
 
 class ComprehensiveEvaluationPage(QWidget):
     """综合评估页面"""
     
     evaluation_started = pyqtSignal()  # 评估开始信号
+    evaluation_requested = pyqtSignal(str, str, bool)  # 请求评估: (赋权方法, 排序方法, 是否重新进行财务计算)
     
     def __init__(self):
         super().__init__()
@@ -18,24 +23,8 @@ class ComprehensiveEvaluationPage(QWidget):
     
     def load_icons(self):
         """加载图标资源"""
-        self.icons = {}
-        icons_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons")
-        
-        print(f"综合评估页面 - 图标目录路径: {icons_dir}")  # 调试信息
-        
-        icon_files = {
-            'evaluation': '综合评估.svg'
-        }
-        
-        for key, filename in icon_files.items():
-            icon_path = os.path.join(icons_dir, filename)
-            print(f"综合评估页面 - 尝试加载图标: {icon_path}")  # 调试信息
-            if os.path.exists(icon_path):
-                self.icons[key] = QIcon(icon_path)
-                print(f"综合评估页面 - 成功加载图标: {key}")  # 调试信息
-            else:
-                self.icons[key] = QIcon()
-                print(f"综合评估页面 - 图标文件不存在: {icon_path}")  # 调试信息
+        self.resources = get_resources()
+        self.icons = self.resources.icons('evaluation')
 
     def init_ui(self):
         """初始化用户界面"""
@@ -54,10 +43,30 @@ class ComprehensiveEvaluationPage(QWidget):
         
         # 创建结果显示区域
         self.create_results_area(main_layout)
+        
+        # 共享样式在页面级别统一设置
+        self.setStyleSheet(self.resources.page_style('success_button', 'icon_label'))
     
     def create_control_buttons(self, parent_layout):
         """创建控制按钮"""
         button_layout = QHBoxLayout()
+        
+        # 评估方法选择，已有结果时切换方法立即重新计算
+        button_layout.addWidget(QLabel("赋权方法："))
+        self.weight_method_combo = QComboBox()
+        for method in WEIGHT_METHODS.values():
+            self.weight_method_combo.addItem(method.label, method.key)
+        button_layout.addWidget(self.weight_method_combo)
+        
+        button_layout.addWidget(QLabel("排序方法："))
+        self.score_method_combo = QComboBox()
+        for method in SCORE_METHODS.values():
+            self.score_method_combo.addItem(method.label, method.key)
+        button_layout.addWidget(self.score_method_combo)
+        
+        self.has_results = False
+        self.weight_method_combo.currentIndexChanged.connect(self.on_method_changed)
+        self.score_method_combo.currentIndexChanged.connect(self.on_method_changed)
         button_layout.addStretch()
         
         # 开始评估按钮组合
@@ -65,36 +74,17 @@ class ComprehensiveEvaluationPage(QWidget):
         eval_layout.setSpacing(8)
         
         # 添加图标
-        if 'evaluation' in self.icons and not self.icons['evaluation'].isNull():
+        if self.resources.has_icon('evaluation'):
             eval_icon = QLabel()
-            eval_icon.setPixmap(self.icons['evaluation'].pixmap(24, 24))
+            eval_icon.setPixmap(self.resources.pixmap('evaluation', 24))
             eval_icon.setAlignment(Qt.AlignCenter)
-            eval_icon.setStyleSheet("QLabel { border: none; background: transparent; }")  # 去掉边框和背景
+            set_style_class(eval_icon, "icon")  # 去掉边框和背景
             eval_layout.addWidget(eval_icon)
-            print("综合评估页面 - 已设置按钮图标")  # 调试信息
-        else:
-            print("综合评估页面 - 图标为空，未设置按钮图标")  # 调试信息
         
         # 开始评估按钮
         self.start_btn = QPushButton("开始评估")
         self.start_btn.setMinimumSize(120, 35)
-        self.start_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #27ae60;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 8px 16px;
-                font-size: 9pt;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #219a52;
-            }
-            QPushButton:pressed {
-                background-color: #1e8449;
-            }
-        """)
+        set_style_class(self.start_btn, "success")
         self.start_btn.clicked.connect(self.start_evaluation)
         eval_layout.addWidget(self.start_btn)
         
@@ -127,6 +117,15 @@ class ComprehensiveEvaluationPage(QWidget):
         result_label.setStyleSheet("QLabel { font-size: 12px; font-weight: bold; margin-top: 20px; }")
         results_layout.addWidget(result_label)
         
+        # 方案排名
+        self.ranking_table = QTableWidget(0, 3)
+        self.ranking_table.setHorizontalHeaderLabels(["排名", "方案", "综合得分"])
+        self.ranking_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.ranking_table.verticalHeader().setVisible(False)
+        self.ranking_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.ranking_table.setVisible(False)
+        results_layout.addWidget(self.ranking_table)
+        
         self.result_text = QTextEdit()
         self.result_text.setReadOnly(True)
         self.result_text.setPlainText("请先完成项目参数设计和指标选择，然后点击\"开始评估\"按钮进行综合评估。")
@@ -135,71 +134,71 @@ class ComprehensiveEvaluationPage(QWidget):
         scroll_area.setWidget(results_widget)
         parent_layout.addWidget(scroll_area)
     
+    def selected_methods(self):
+        """当前选择的 (赋权方法, 排序方法)"""
+        return self.weight_method_combo.currentData(), self.score_method_combo.currentData()
+    
     def start_evaluation(self):
         """开始评估"""
         print("开始综合评估...")
         
-        # 显示进度条
+        # 显示忙碌状态
         self.progress_bar.setVisible(True)
-        self.progress_bar.setValue(0)
+        self.progress_bar.setRange(0, 0)
         
         # 更新结果文本
         self.result_text.setPlainText("正在进行综合评估，请稍候...")
         
         # 发出评估开始信号
         self.evaluation_started.emit()
-        
-        # 这里可以添加实际的评估逻辑
-        # 暂时模拟评估过程
-        self.simulate_evaluation()
+        self.evaluation_requested.emit(*self.selected_methods(), True)
     
-    def simulate_evaluation(self):
-        """模拟评估过程"""
-        import time
-        from PyQt5.QtCore import QTimer
-        
-        self.timer = QTimer()
-        self.progress_value = 0
-        
-        def update_progress():
-            self.progress_value += 10
-            self.progress_bar.setValue(self.progress_value)
-            
-            if self.progress_value >= 100:
-                self.timer.stop()
-                self.show_evaluation_results()
-        
-        self.timer.timeout.connect(update_progress)
-        self.timer.start(200)  # 每200ms更新一次
+    def on_method_changed(self):
+        """切换评估方法：已有评估结果时直接按新方法重新计算"""
+        if self.has_results:
+            self.evaluation_requested.emit(*self.selected_methods(), False)
     
-    def show_evaluation_results(self):
-        """显示评估结果"""
-        result_text = """
-综合评估完成！
-
-评估结果摘要：
-================
-
-财务效益指标：
-- 净现值(NPV): 1234.56万元
-- 内部收益率(IRR): 12.5%
-- 投资回收期(DPP): 8.2年
-
-技术效益指标：
-- 电储能利用水平: 85%
-- 氢储能利用水平: 78%
-
-环境效益指标：
-- 可再生能源供应占比: 92%
-
-综合评估得分: 85.6分
-
-建议：
-该项目在技术经济性方面表现良好，建议进一步优化储能配置以提高整体效率。
-        """
-        
-        self.result_text.setPlainText(result_text)
+    def show_evaluation_progress(self, done, total):
+        """显示后台财务计算的进度"""
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, max(total, 1))
+        self.progress_bar.setValue(done)
+        self.result_text.setPlainText(f"正在进行财务计算：已完成 {done}/{total} 个方案...")
+    
+    def show_evaluation_results(self, result, session, notes=()):
+        """显示评估结果：方案排名和各指标权重，notes 为电、氢、氧平衡的缺额说明"""
+        self.progress_bar.setVisible(False)
+        self.has_results = True
+        
+        self.ranking_table.setRowCount(len(result.ranking))
+        for rank, scheme in enumerate(result.ranking):
+            for column, text in enumerate((str(rank + 1), f"方案{scheme + 1}", f"{result.scores[scheme]:.4f}")):
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignCenter)
+                self.ranking_table.setItem(rank, column, item)
+        self.ranking_table.setVisible(True)
+        
+        lines = [f"综合评估完成！（{WEIGHT_METHODS[result.weight_method].label} + "
+                 f"{SCORE_METHODS[result.score_method].label}）", "",
+                 f"最优方案：方案{result.ranking[0] + 1}", "", "指标权重："]
+        for code, weight in zip(session.matrix.codes, result.weights):
+            definition = INDICATORS.by_code(code)
+            lines.append(f"- {definition.label if definition else code}: {weight:.4f}")
+        if session.missing:
+            lines.append("")
+            lines.append("以下已选指标尚无数值，未参与评估：" + "、".join(session.missing))
+        if notes:
+            lines.append("")
+            lines.append("能量平衡存在缺额：")
+            lines.extend(f"- {note}" for note in notes)
+        self.result_text.setPlainText("\n".join(lines))
+    
+    def show_evaluation_error(self, message):
+        """评估无法进行时显示原因"""
         self.progress_bar.setVisible(False)
+        self.has_results = False
+        self.ranking_table.setVisible(False)
+        self.result_text.setPlainText(message)
 
 
 # 测试代码
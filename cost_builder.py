@@ -0,0 +1,50 @@
+import numpy as np
+
+# 成本费用表中经营成本的组成: (名称, CostStatement 属性)
+OPERATING_COST_ITEMS = [
+    ("外购能源费", "purchases"),
+    ("维护费用", "maintenance"),
+    ("电储能运行费用", "ess_operation"),
+    ("人员费用", "personnel"),
+]
+
+
+class CostStatement:
+    """各方案的年度经营成本（万元），各项均为 (方案数, 年数) 数组
+
+    第1年的数值由 EnergyAccounts 和设备参数直接汇总，再按通胀系数展开到各年；
+    价格变化时只需重新计价 EnergyAccounts，不需要重新处理逐时数据。
+    """
+
+    def __init__(self, inputs, accounts):
+        escalation = inputs.escalation()
+        first_year = self.first_year_costs(inputs, accounts)
+        for attr, values in first_year.items():
+            setattr(self, attr, values[:, None] * escalation)
+        self.first_year = first_year
+        self.operating_cost = sum(getattr(self, attr) for _, attr in OPERATING_COST_ITEMS)
+
+    @staticmethod
+    def first_year_costs(inputs, accounts):
+        """第1年价格水平下的各项经营成本 {属性: (方案数,)}"""
+        schemes = inputs.scheme_count
+        maintenance = sum(device.capacity * device.unit_maintenance for device in inputs.devices.values())
+        return {
+            'purchases': accounts.purchases(),
+            'maintenance': maintenance / 10000.0,
+            'ess_operation': accounts.flows.ess_throughput * inputs.ess_operation_cost / 10000.0,
+            'personnel': np.full(schemes, inputs.personnel_cost * inputs.project_people / 10000.0),
+        }
+
+    def arrays(self):
+        """按 OPERATING_COST_ITEMS 的顺序返回各项数组"""
+        return [getattr(self, attr) for _, attr in OPERATING_COST_ITEMS]
+
+    def indicators(self, inputs):
+        """成本类指标 {指标编码: 各方案数值（万元）}：A1 初始投资成本、A2 年运维成本、A3 能源外购成本"""
+        first_year = self.first_year
+        return {
+            "A1": inputs.initial_investment(),
+            "A2": first_year['maintenance'] + first_year['ess_operation'] + first_year['personnel'],
+            "A3": first_year['purchases'],
+        }
@@ -0,0 +1,76 @@
+import numpy as np
+
+from financial_inputs import EQUAL_INSTALLMENT, EQUAL_PRINCIPAL
+
+# 还本付息表中的项目: (名称, DebtSchedule 属性)
+DEBT_SERVICE_ITEMS = [
+    ("年初借款余额", "opening"),
+    ("当年还本", "principal"),
+    ("当年付息", "interest"),
+    ("还本付息合计", "payment"),
+    ("年末借款余额", "closing"),
+]
+
+
+class DebtSchedule:
+    """还本付息计划，各项均为 (方案数, 年数) 数组，单位与贷款本金相同"""
+
+    __slots__ = ('loan', 'opening', 'principal', 'interest', 'payment', 'closing')
+
+    def __init__(self, loan, opening, principal, interest):
+        self.loan = loan
+        self.opening = opening
+        self.principal = principal
+        self.interest = interest
+        self.payment = principal + interest
+        self.closing = opening - principal
+
+    def arrays(self):
+        """按 DEBT_SERVICE_ITEMS 的顺序返回各项数组"""
+        return [getattr(self, attr) for _, attr in DEBT_SERVICE_ITEMS]
+
+
+def repayment_schedule(loan, rate, years, term, grace_period=0, method=EQUAL_INSTALLMENT):
+    """计算全部方案的还本付息计划
+
+    loan 为各方案贷款本金 (方案数,)，rate 为年利率（小数），years 为计算期年数。
+    宽限期内只付息不还本，之后在 term - grace_period 年内按等额本息或等额本金还清；
+    贷款期限超过计算期时，剩余本金在计算期最后一年一次还清。
+    """
+    loan = np.asarray(loan, dtype=np.float64)
+    grace_period = max(0, min(int(grace_period), int(term) - 1))
+    periods = max(1, int(term) - grace_period)       # 还本年数
+    year = np.arange(1, years + 1, dtype=np.float64)
+    k = np.clip(year - grace_period, 0, periods)       # 截至当年已还本的年数
+    repaying = (year > grace_period) & (year <= grace_period + periods)
+    principal_loan = loan[:, None]
+
+    if method == EQUAL_PRINCIPAL:
+        installment = principal_loan / periods
+        opening = principal_loan * (1.0 - np.maximum(k - repaying, 0) / periods)
+        principal = installment * repaying
+    elif method == EQUAL_INSTALLMENT:
+        if rate > 0:
+            growth = (1.0 + rate) ** periods
+            annuity = principal_loan * rate * growth / (growth - 1.0)
+            paid = np.maximum(k - repaying, 0)
+            opening = principal_loan * (1.0 + rate) ** paid - annuity * ((1.0 + rate) ** paid - 1.0) / rate
+            principal = (annuity - opening * rate) * repaying
+        else:
+            opening = principal_loan * (1.0 - np.maximum(k - repaying, 0) / periods)
+            principal = principal_loan / periods * repaying
+    else:
+        raise ValueError(f"未知的还款方式: {method}")
+
+    opening = np.where(year > grace_period + periods, 0.0, opening)
+    if years and grace_period + periods > years:
+        # 计算期结束时仍有余额，最后一年一次还清
+        principal[:, -1] = opening[:, -1]
+    interest = opening * rate
+    return DebtSchedule(loan, opening, principal, interest)
+
+
+def schedule_from_inputs(inputs):
+    """按项目参数计算还本付息计划（万元）"""
+    return repayment_schedule(inputs.loan_principal(), inputs.loan_rate, inputs.project_life,
+                              inputs.loan_term, inputs.grace_period, inputs.repayment_method)
@@ -0,0 +1,217 @@
+import hashlib
+import numpy as np
+
+try:
+    from scipy import sparse
+    from scipy.optimize import linprog
+except ImportError:  # scipy 为可选依赖，未安装时只能使用规则调度
+    sparse = None
+    linprog = None
+
+from financial_inputs import FinancialInputError, selected_series
+from energy_accounts import (HYDROGEN_SALES_SERIES, GRID_SERIES, EXTERNAL_HYDROGEN_SERIES, ESS_SERIES,
+                             HYDROGEN_PRICE, ELECTRICITY_SELL_PRICE, ELECTRICITY_BUY_PRICE)
+from mass_balance import WT_SERIES, PV_SERIES, LOAD_SERIES, HES_SERIES, FUEL_CELL_KWH_PER_KG
+
+# 滚动优化：每个窗口求解 COMMIT_HOURS + LOOKAHEAD_HOURS 小时，只采用前 COMMIT_HOURS 小时的结果
+COMMIT_HOURS = 168
+LOOKAHEAD_HOURS = 24
+
+# 缺电、缺氢的惩罚价格（元/kWh、元/kg），远高于正常价格，只在无法满足负荷时出现
+SHORTAGE_PENALTY = 1.0e4
+# 弃电的微小代价，使富余电量优先供电解槽
+CURTAILMENT_COST = 1.0e-4
+
+# 每小时的决策变量
+VARIABLES = ('grid_buy', 'grid_sell', 'ess_charge', 'ess_discharge', 'el', 'hfc', 'curtail',
+             'power_short', 'hes_charge', 'hes_discharge', 'hydrogen_buy', 'hydrogen_short',
+             'hydrogen_vent', 'ess_level', 'hes_level')
+_INDEX = {name: k for k, name in enumerate(VARIABLES)}
+
+
+def optimal_dispatch_available():
+    """是否可以使用优化调度（需要 scipy）"""
+    return linprog is not None
+
+
+class DispatchProblem:
+    """一个窗口长度下的线性规划结构：约束矩阵只与窗口长度和效率有关，
+    各窗口、各方案之间只改变右端项、边界和价格"""
+
+    def __init__(self, hours, el_conversion, ess_efficiency):
+        self.hours = hours
+        T = hours
+        step_eff = np.sqrt(max(ess_efficiency, 1e-6))
+
+        def column(name):
+            return _INDEX[name] * T + np.arange(T)
+
+        rows, cols, vals = [], [], []
+
+        def add(row_offset, name, value, shift=0):
+            t = np.arange(shift, T)
+            rows.append(row_offset + t)
+            cols.append(column(name)[t - shift])
+            vals.append(np.full(len(t), value, dtype=np.float64))
+
+        # 电平衡（行 0..T-1）：购电-售电+放电-充电-电解槽+燃料电池-弃电+缺电 = 电负荷-风光出力
+        for name, sign in (('grid_buy', 1), ('grid_sell', -1), ('ess_discharge', 1), ('ess_charge', -1),
+                           ('el', -1), ('hfc', 1), ('curtail', -1), ('power_short', 1)):
+            add(0, name, sign)
+        # 氢平衡（行 T..2T-1）：产氢-燃料电池耗氢+放氢-加氢+购氢+缺氢-放空 = 氢负荷
+        for name, sign in (('el', 1.0 / el_conversion), ('hfc', -1.0 / FUEL_CELL_KWH_PER_KG),
+                           ('hes_discharge', 1), ('hes_charge', -1), ('hydrogen_buy', 1),
+                           ('hydrogen_short', 1), ('hydrogen_vent', -1)):
+            add(T, name, sign)
+        # 电储能储量（行 2T..3T-1）：储量_t - 储量_{t-1} - 充电×效率 + 放电/效率 = 0（t=0 时右端为初始储量）
+        add(2 * T, 'ess_level', 1)
+        add(2 * T, 'ess_level', -1, shift=1)
+        add(2 * T, 'ess_charge', -step_eff)
+        add(2 * T, 'ess_discharge', 1.0 / step_eff)
+        # 氢储能储量（行 3T..4T-1）
+        add(3 * T, 'hes_level', 1)
+        add(3 * T, 'hes_level', -1, shift=1)
+        add(3 * T, 'hes_charge', -1)
+        add(3 * T, 'hes_discharge', 1)
+
+        self.matrix = sparse.csr_matrix(
+            (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(4 * T, len(VARIABLES) * T))
+
+    def solve(self, renewable, load, hydrogen_demand, prices, limits, ess_level, hes_level, ess_cost):
+        """求解一个窗口，返回 (各变量 (变量数, 小时数) 数组)；无解时抛出 FinancialInputError"""
+        T = self.hours
+        rhs = np.zeros(4 * T)
+        rhs[:T] = load - renewable
+        rhs[T:2 * T] = hydrogen_demand
+        rhs[2 * T] = ess_level
+        rhs[3 * T] = hes_level
+
+        cost = np.zeros((len(VARIABLES), T))
+        cost[_INDEX['grid_buy']] = prices['buy']
+        cost[_INDEX['grid_sell']] = -prices['sell']
+        cost[_INDEX['hydrogen_buy']] = prices['hydrogen']
+        cost[_INDEX['ess_charge']] = ess_cost
+        cost[_INDEX['ess_discharge']] = ess_cost
+        cost[_INDEX['curtail']] = CURTAILMENT_COST
+        cost[_INDEX['power_short']] = SHORTAGE_PENALTY
+        cost[_INDEX['hydrogen_short']] = SHORTAGE_PENALTY
+
+        upper = np.repeat(np.array([limits.get(name, np.inf) for name in VARIABLES]), T)
+        bounds = np.column_stack([np.zeros_like(upper), upper])
+        result = linprog(cost.ravel(), A_eq=self.matrix, b_eq=rhs, bounds=bounds, method='highs')
+        if result.status != 0:
+            raise FinancialInputError(f"优化调度求解失败：{result.message}")
+        return result.x.reshape(len(VARIABLES), T)
+
+
+class DispatchOptimizer:
+    """滚动窗口的全年优化调度
+
+    每个窗口以上一窗口末的储量为初值，窗口长度相同的线性规划共用同一个约束矩阵；
+    容量和逐时数据完全相同的方案只求解一次。
+    """
+
+    def __init__(self, inputs, series, prices, commit_hours=COMMIT_HOURS, lookahead_hours=LOOKAHEAD_HOURS):
+        if not optimal_dispatch_available():
+            raise FinancialInputError("优化调度需要安装 scipy")
+        self.inputs = inputs
+        self.series = series
+        self.prices = prices
+        self.commit_hours = commit_hours
+        self.lookahead_hours = lookahead_hours
+        self._problems = {}
+
+    def _problem(self, hours):
+        if hours not in self._problems:
+            self._problems[hours] = DispatchProblem(hours, self.inputs.el_conversion, self.inputs.ess_efficiency)
+        return self._problems[hours]
+
+    def _price(self, name, hours):
+        price = self.prices.get(name)
+        return np.zeros(hours) if price is None else np.asarray(price[:hours], dtype=np.float64)
+
+    def run(self):
+        """求解全部方案，返回优化后的时序数据 {名称: (小时数, 方案数)}：
+        外部电网交互、外部氢源交互和电、氢储能充放"""
+        inputs = self.inputs
+
+        def values(name):
+            return selected_series(inputs, self.series, name)
+
+        renewable = values(WT_SERIES) + values(PV_SERIES)
+        load = values(LOAD_SERIES)
+        hydrogen_demand = sum(values(name) for name in HYDROGEN_SALES_SERIES)
+        hours, schemes = renewable.shape
+        prices = {'buy': self._price(ELECTRICITY_BUY_PRICE, hours),
+                  'sell': self._price(ELECTRICITY_SELL_PRICE, hours),
+                  'hydrogen': self._price(HYDROGEN_PRICE, hours)}
+
+        devices = inputs.devices
+        selected = inputs.selected_series
+        # 外部电网交互上限取各方案的最大用电和发电功率，避免购售电价倒挂时无界
+        grid_limit = np.maximum(renewable.max(axis=0), load.max(axis=0)) + devices['EL'].capacity \
+            + devices['ESS'].capacity
+        grid_enabled = GRID_SERIES in selected
+        hydrogen_enabled = EXTERNAL_HYDROGEN_SERIES in selected
+
+        outputs = {name: np.zeros((hours, schemes))
+                   for name in (GRID_SERIES, EXTERNAL_HYDROGEN_SERIES, ESS_SERIES, HES_SERIES)}
+        solved = {}
+        for s in range(schemes):
+            limits = {
+                'grid_buy': grid_limit[s] if grid_enabled else 0.0,
+                'grid_sell': grid_limit[s] if grid_enabled else 0.0,
+                'el': devices['EL'].capacity[s] if devices['EL'].selected else 0.0,
+                'hfc': devices['HFC'].capacity[s] if devices['HFC'].selected else 0.0,
+                'ess_level': devices['ESS'].capacity[s] if devices['ESS'].selected else 0.0,
+                'hes_level': devices['HES'].capacity[s] if devices['HES'].selected else 0.0,
+                'hydrogen_buy': np.inf if hydrogen_enabled else 0.0,
+            }
+            key = self._scheme_key(limits, renewable[:, s], load[:, s], hydrogen_demand[:, s])
+            if key not in solved:
+                solved[key] = self._run_scheme(renewable[:, s], load[:, s], hydrogen_demand[:, s], prices, limits)
+            for name, flow in solved[key].items():
+                outputs[name][:, s] = flow
+        return outputs
+
+    @staticmethod
+    def _scheme_key(limits, *columns):
+        digest = hashlib.sha1()
+        for column in columns:
+            digest.update(np.ascontiguousarray(column).tobytes())
+        return tuple(sorted(limits.items())), digest.hexdigest()
+
+    def _run_scheme(self, renewable, load, hydrogen_demand, prices, limits):
+        hours = len(renewable)
+        x = np.zeros((len(VARIABLES), hours))
+        ess_level = hes_level = 0.0
+        ess_cost = self.inputs.ess_operation_cost
+        for start in range(0, hours, self.commit_hours):
+            end = min(start + self.commit_hours + self.lookahead_hours, hours)
+            commit = min(self.commit_hours, hours - start)
+            window = slice(start, end)
+            solution = self._problem(end - start).solve(
+                renewable[window], load[window], hydrogen_demand[window],
+                {key: values[window] for key, values in prices.items()},
+                limits, ess_level, hes_level, ess_cost)
+            x[:, start:start + commit] = solution[:, :commit]
+            ess_level = solution[_INDEX['ess_level'], commit - 1]
+            hes_level = solution[_INDEX['hes_level'], commit - 1]
+
+        def var(name):
+            return x[_INDEX[name]]
+
+        return {
+            GRID_SERIES: var('grid_sell') - var('grid_buy'),
+            EXTERNAL_HYDROGEN_SERIES: -var('hydrogen_buy'),
+            ESS_SERIES: var('ess_discharge') - var('ess_charge'),
+            HES_SERIES: var('hes_discharge') - var('hes_charge'),
+        }
+
+
+def optimal_series(inputs, series, prices):
+    """用优化调度结果替换时序数据中的电网、外部氢源和储能充放，返回新的时序数据字典"""
+    dispatched = dict(series)
+    dispatched.update(DispatchOptimizer(inputs, series, prices).run())
+    return dispatched
@@ -0,0 +1,102 @@
+import numpy as np
+
+from financial_inputs import input_series
+from series_parser import HOURS_PER_YEAR
+
+# 价格参数名称（元/kg 或 元/kWh）
+HYDROGEN_PRICE = "单位质量氢能的价格"
+OXYGEN_PRICE = "氧气的销售价格"
+ELECTRICITY_SELL_PRICE = "电能销售价格"
+ELECTRICITY_BUY_PRICE = "电能的购买价格"
+PRICE_NAMES = (HYDROGEN_PRICE, OXYGEN_PRICE, ELECTRICITY_SELL_PRICE, ELECTRICITY_BUY_PRICE)
+
+# 按氢价计算收入的氢负荷
+HYDROGEN_SALES_SERIES = (
+    "氢负荷-合成氨所耗氢气质量(kg)",
+    "氢负荷-氢燃料电池汽车加氢所耗氢气质量(kg)",
+    "氢负荷-生产甲醇所耗氢气质量(kg)",
+    "氢负荷-用于其他方面的销售氢气年总质量(kg)",
+    "氢负荷-用于炼油所耗氢气质量(kg)",
+    "氢负荷-用于钢铁冶炼所耗氢气质量(kg)",
+)
+OXYGEN_SALES_SERIES = "氧负荷-销售氧气的质量(kg)"
+# 外部能源网交互量为正表示系统向外输出（售出），为负表示从外部购入
+GRID_SERIES = "外部能源网-系统与外部电网的交互功率(kW)"
+EXTERNAL_HYDROGEN_SERIES = "外部能源网-系统与外部氢源的交互质量(kg)"
+ESS_SERIES = "ESS-电储能装置充放功率(kW·h)"
+FLOW_SERIES = HYDROGEN_SALES_SERIES + (OXYGEN_SALES_SERIES, GRID_SERIES, EXTERNAL_HYDROGEN_SERIES, ESS_SERIES)
+
+# 年度收支项目: (名称, 逐时流量属性, 价格参数)
+SALES_ITEMS = [
+    ("售氢收入", "hydrogen_sold", HYDROGEN_PRICE),
+    ("售氧收入", "oxygen_sold", OXYGEN_PRICE),
+    ("售电收入", "electricity_sold", ELECTRICITY_SELL_PRICE),
+]
+PURCHASE_ITEMS = [
+    ("购电费用", "electricity_bought", ELECTRICITY_BUY_PRICE),
+    ("购氢费用", "hydrogen_bought", HYDROGEN_PRICE),
+]
+
+
+class EnergyFlows:
+    """各方案的逐时能源买卖量 (小时数, 1或方案数) 和电储能年充放电量 (方案数,)；
+    只有单列数据参与的流量保持单列，计价时按广播用于全部方案
+
+    只依赖时序数据和拓扑选择，与价格无关；价格变化时用 EnergyAccounts 重新计价即可。
+    """
+
+    def __init__(self, inputs, series):
+        self.scheme_count = inputs.scheme_count
+        self.key = self.cache_key(inputs, series)
+        self._inputs = inputs
+        self._series = series
+
+        external_hydrogen = self._quantity(EXTERNAL_HYDROGEN_SERIES)
+        grid = self._quantity(GRID_SERIES)
+        self.hydrogen_sold = (sum(self._quantity(name) for name in HYDROGEN_SALES_SERIES)
+                              + np.maximum(external_hydrogen, 0.0))
+        self.oxygen_sold = self._quantity(OXYGEN_SALES_SERIES)
+        self.electricity_sold = np.maximum(grid, 0.0)
+        self.electricity_bought = np.maximum(-grid, 0.0)
+        self.hydrogen_bought = np.maximum(-external_hydrogen, 0.0)
+        # 充电和放电电量之和
+        self.ess_throughput = np.broadcast_to(np.abs(self._quantity(ESS_SERIES)).sum(axis=0),
+                                              (self.scheme_count,)).copy()
+
+    @staticmethod
+    def cache_key(inputs, series):
+        """缓存键：时序数据对象和拓扑选择不变时逐时流量不变"""
+        return (inputs.scheme_count, frozenset(inputs.selected_series & set(FLOW_SERIES)),
+                tuple(id(series.get(name)) for name in FLOW_SERIES))
+
+    def _quantity(self, name):
+        values = input_series(self._inputs, self._series, name)
+        return np.zeros((HOURS_PER_YEAR, 1)) if values is None else values
+
+
+class EnergyAccounts:
+    """第1年价格水平下各方案的年度能源收支（万元，不含税），均为 (方案数,) 数组
+
+    prices 为 {价格参数名称: 逐时价格或None}，每一项为逐时价格与逐时流量的一次矩阵乘法，
+    未填写的价格按0计。
+    """
+
+    def __init__(self, flows, prices):
+        self.flows = flows
+        self.amounts = {}
+        for name, attr, price_name in SALES_ITEMS + PURCHASE_ITEMS:
+            self.amounts[name] = self._amount(prices.get(price_name), getattr(flows, attr))
+
+    def _amount(self, price, quantity):
+        if price is None or not quantity.any():
+            return np.zeros(self.flows.scheme_count)
+        amount = price[:HOURS_PER_YEAR] @ quantity / 10000.0
+        return np.broadcast_to(amount, (self.flows.scheme_count,)).copy()
+
+    def sales(self):
+        """各方案年销售收入合计（万元）"""
+        return sum(self.amounts[name] for name, _, _ in SALES_ITEMS)
+
+    def purchases(self):
+        """各方案年外购能源费用合计（万元）"""
+        return sum(self.amounts[name] for name, _, _ in PURCHASE_ITEMS)
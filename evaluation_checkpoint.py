@@ -0,0 +1,217 @@
+import hashlib
+import json
+import threading
+import numpy as np
+
+from financial_inputs import FinancialInputs, FinancialInputError, RULE_DISPATCH, subset_series
+from financial_engine import FinancialModel
+from energy_accounts import EnergyFlows, FLOW_SERIES
+from indicator_calculators import INDICATOR_CALCULATORS
+from mass_balance import SHORTFALL_ITEMS, shortfall_messages
+
+# 检查点保存在项目的二进制数据中，名称为 "评估检查点-<参数指纹>-<起始方案>-<内容>"
+CHECKPOINT_PREFIX = "评估检查点"
+INDICATOR_PART = "指标"
+SHORTFALL_PART = "缺额"
+
+# 每块的方案数：一块计算完成后才写入检查点，中断时最多损失一块的计算
+CHUNK_SCHEMES = 50
+
+
+def is_checkpoint(name):
+    """二进制数据名称是否为评估检查点"""
+    return name.startswith(CHECKPOINT_PREFIX + "-")
+
+
+def _checkpoint_names(store):
+    return [name for name in store.list_arrays() if is_checkpoint(name)]
+
+
+def _table_layout(inputs):
+    """各输出表格的表头和每个方案的项目名称 {表格名称: (表头, 项目列表)}
+
+    项目名称与数值无关，用只含一个方案、不含时序数据的模型生成，避免为此重新计算任何一块。
+    """
+    layout_inputs = inputs.subset([0])
+    layout_inputs.dispatch_mode = RULE_DISPATCH
+    tables = FinancialModel(layout_inputs).output_tables()
+    return {name: (rows[0], [row[1] for row in rows[1:]]) for name, rows in tables.items()}
+
+
+class CheckpointedRun:
+    """按方案分块进行财务和指标计算，每完成一块即写入项目存储的检查点
+
+    检查点以项目参数、时序数据、价格、指标和分块大小的指纹区分，参数不变时再次运行会跳过
+    已完成的块，从上次中断处继续；参数变化后旧的检查点在运行时清除。计算过程中可以从其他
+    线程调用 progress() 和 partial() 查询已完成部分的结果。
+    flows 为上次运行的 energy_flows()，时序数据和拓扑选择未变时各块沿用其中的逐时能源流量，
+    只按新价格重新计价。
+    """
+
+    def __init__(self, store, user_input_data, series, prices, codes, chunk_schemes=CHUNK_SCHEMES,
+                 flows=None):
+        self.store = store
+        self.inputs = FinancialInputs(user_input_data)
+        self.series = series
+        self.prices = prices
+        self.codes = [code for code in codes if code in INDICATOR_CALCULATORS]
+        self.chunk_schemes = max(1, int(chunk_schemes))
+        schemes = self.inputs.scheme_count
+        for name, values in series.items():
+            if values is not None and np.ndim(values) == 2 and np.shape(values)[1] not in (1, schemes):
+                raise FinancialInputError(f"{name} 有 {np.shape(values)[1]} 列，应与方案个数 {schemes} 一致")
+        self.key = self._fingerprint(user_input_data)
+        self.chunks = [(start, min(start + self.chunk_schemes, schemes))
+                       for start in range(0, schemes, self.chunk_schemes)]
+
+        # 各块的逐时能源流量 {(起始方案, 结束方案): (流量时序数据, EnergyFlows)}；缓存键按对象区分
+        # 时序数据，同时保留这些数组，避免被释放后新数组得到相同的 id
+        self._flows_key = EnergyFlows.cache_key(self.inputs, series)
+        self._flow_sources = [series.get(name) for name in FLOW_SERIES]
+        previous_key, _, previous_chunks = flows or (None, None, {})
+        self._flows = dict(previous_chunks) if previous_key == self._flows_key else {}
+
+        # 已完成部分的结果，未完成的方案为 NaN
+        self._lock = threading.Lock()
+        self._values = np.full((len(self.codes), schemes), np.nan)
+        self._shortfalls = np.zeros((2 * len(SHORTFALL_ITEMS), schemes))
+        self._done = set()
+        self._load()
+
+    def _fingerprint(self, user_input_data):
+        digest = hashlib.sha1()
+        digest.update(json.dumps(user_input_data, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+        digest.update(json.dumps([self.codes, self.chunk_schemes]).encode("utf-8"))
+        for group in (self.series, self.prices):
+            for name in sorted(group):
+                values = group[name]
+                digest.update(name.encode("utf-8"))
+                if values is not None:
+                    values = np.ascontiguousarray(values, dtype=np.float64)
+                    digest.update(repr(values.shape).encode("ascii"))
+                    digest.update(values.tobytes())
+        return digest.hexdigest()[:12]
+
+    def _name(self, start, part):
+        return f"{CHECKPOINT_PREFIX}-{self.key}-{start}-{part}"
+
+    def _load(self):
+        """读取已有的检查点；指标数组最后写入，读取失败（写入时中断）的块视为未完成"""
+        existing = set(_checkpoint_names(self.store))
+        self._stale = sorted(name for name in existing if not name.startswith(f"{CHECKPOINT_PREFIX}-{self.key}-"))
+        for start, stop in self.chunks:
+            if self._name(start, INDICATOR_PART) not in existing:
+                continue
+            try:
+                values = self.store.read_array(self._name(start, INDICATOR_PART))
+                shortfalls = self.store.read_array(self._name(start, SHORTFALL_PART))
+            except (OSError, ValueError):
+                continue
+            if values is None or shortfalls is None:
+                continue
+            self._store_chunk(start, stop, values.reshape(len(self.codes), stop - start),
+                              shortfalls.reshape(-1, stop - start))
+
+    def _store_chunk(self, start, stop, values, shortfalls):
+        with self._lock:
+            self._values[:, start:stop] = values
+            self._shortfalls[:, start:stop] = shortfalls
+            self._done.add(start)
+
+    def progress(self):
+        """(已完成的方案数, 方案总数)"""
+        with self._lock:
+            done = sum(stop - start for start, stop in self.chunks if start in self._done)
+        return done, self.inputs.scheme_count
+
+    def finished(self):
+        with self._lock:
+            return len(self._done) == len(self.chunks)
+
+    def partial(self):
+        """已完成部分的指标数值 {指标编码: (方案数,)}，未完成的方案为 NaN"""
+        with self._lock:
+            return {code: self._values[k].copy() for k, code in enumerate(self.codes)}
+
+    def shortfalls(self):
+        """已完成部分的缺额说明"""
+        with self._lock:
+            totals, hours = np.split(self._shortfalls.copy(), 2)
+        return shortfall_messages(totals, hours)
+
+    def run(self, progress=None, stop=None, write_array=None):
+        """计算全部未完成的块，每块完成后调用 progress(已完成方案数, 方案总数)；
+        stop() 返回真时在当前块完成后停止。全部完成时返回True。
+        write_array(名称, 数组) 默认为 store.write_array，在存储所在线程之外运行时传入
+        转到该线程写入的函数（检查点按调用顺序写入）"""
+        write_array = write_array or self.store.write_array
+        self.discard_stale(write_array)
+        for start, end in self.chunks:
+            if start in self._done:
+                continue
+            if stop is not None and stop():
+                return False
+            self._run_chunk(start, end, write_array)
+            if progress is not None:
+                progress(*self.progress())
+        return True
+
+    def _run_chunk(self, start, stop, write_array):
+        schemes = np.arange(start, stop)
+        series = subset_series(self.series, schemes)
+        previous = self._flows.get((start, stop))
+        if previous is not None:
+            # 沿用上次的流量时序数据对象，FinancialModel 据此判断可以沿用上次的 EnergyFlows
+            series.update(previous[0])
+        model = FinancialModel(self.inputs.subset(schemes), series, self.prices,
+                               previous[1] if previous is not None else None)
+        indicators = model.indicators(self.codes)
+        values = np.array([indicators[code] for code in self.codes], dtype=np.float64).reshape(-1, len(schemes))
+        balance = model.computed_balance()
+        shortfalls = np.zeros((2 * len(SHORTFALL_ITEMS), len(schemes))) if balance is None \
+            else np.concatenate(balance.shortfall_totals())
+        for name, rows in model.output_tables().items():
+            write_array(self._name(start, name), [row[2:] for row in rows[1:]])
+        write_array(self._name(start, SHORTFALL_PART), shortfalls)
+        # 指标数组最后写入，作为该块完成的标志
+        write_array(self._name(start, INDICATOR_PART), values)
+        if model.series is series:
+            # 优化调度的结果随价格变化，不沿用
+            self._flows[(start, stop)] = ({name: series.get(name) for name in FLOW_SERIES}, model.flows)
+        self._store_chunk(start, stop, values, shortfalls)
+
+    def output_tables(self):
+        """把各块的输出表格合并为全部方案的表格 {表格名称: 行列表}，须在全部完成后调用"""
+        if not self.finished():
+            raise FinancialInputError("分块计算尚未完成，不能生成输出表格")
+        tables = {}
+        for name, (header, items) in _table_layout(self.inputs).items():
+            rows = [header]
+            for start, stop in self.chunks:
+                block = self.store.read_array(self._name(start, name)).reshape(len(items) * (stop - start), -1)
+                labels = [[f"方案{s + 1}", item] for s in range(start, stop) for item in items]
+                rows.extend(label + values for label, values in zip(labels, block.tolist()))
+            tables[name] = rows
+        return tables
+
+    def energy_flows(self):
+        """各块的逐时能源流量，创建下次运行时作为 flows 传入"""
+        return self._flows_key, self._flow_sources, dict(self._flows)
+
+    def indicators(self):
+        """全部方案的指标数值 {指标编码: (方案数,)}"""
+        return self.partial()
+
+    def discard_stale(self, write_array=None):
+        """删除参数指纹与本次不同的检查点（创建时从存储中列出）"""
+        write_array = write_array or self.store.write_array
+        for name in self._stale:
+            write_array(name, None)
+        self._stale = []
+
+    def clear(self):
+        """删除本次运行的全部检查点"""
+        current = f"{CHECKPOINT_PREFIX}-{self.key}-"
+        for name in _checkpoint_names(self.store):
+            if name.startswith(current):
+                self.store.write_array(name, None)
@@ -0,0 +1,255 @@
+import numpy as np
+
+from indicator_registry import INDICATORS, EVALUATION_RESULT_KEY
+
+
+class DecisionMatrix:
+    """方案×指标决策矩阵。规范化矩阵及其统计量只计算一次，各赋权和排序方法共用"""
+
+    def __init__(self, values, indicator_types, codes=None):
+        self.values = np.asarray(values, dtype=np.float64)
+        if self.values.ndim == 1:
+            self.values = self.values[:, None]
+        self.indicator_types = np.asarray(indicator_types, dtype=np.float64)
+        self.codes = list(codes) if codes is not None else [str(i) for i in range(self.values.shape[1])]
+        self._cache = {}
+
+    @property
+    def shape(self):
+        """(方案数, 指标数)"""
+        return self.values.shape
+
+    def _cached(self, key, compute):
+        if key not in self._cache:
+            result = compute()
+            result.setflags(write=False)
+            self._cache[key] = result
+        return self._cache[key]
+
+    @property
+    def normalized(self):
+        """极差规范化矩阵，效益型指标越大越好、成本型越小越好，均映射到 [0, 1]，1 为最优；
+        各方案相同的指标取 1"""
+        def compute():
+            low = self.values.min(axis=0)
+            span = self.values.max(axis=0) - low
+            with np.errstate(divide='ignore', invalid='ignore'):
+                scaled = (self.values - low) / span
+            scaled = np.where(self.indicator_types < 0, 1.0 - scaled, scaled)
+            return np.where(span > 0, scaled, 1.0)
+        return self._cached('normalized', compute)
+
+    @property
+    def std(self):
+        """各指标规范化值的标准差"""
+        def compute():
+            ddof = 1 if self.shape[0] > 1 else 0
+            return self.normalized.std(axis=0, ddof=ddof)
+        return self._cached('std', compute)
+
+    @property
+    def correlation(self):
+        """指标间的相关系数矩阵，无法计算（如某指标各方案相同）时取 0"""
+        def compute():
+            if self.shape[0] < 2:
+                return np.zeros((self.shape[1], self.shape[1]))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                corr = np.corrcoef(self.normalized, rowvar=False)
+            return np.nan_to_num(np.atleast_2d(corr), nan=0.0)
+        return self._cached('correlation', compute)
+
+    @property
+    def entropy(self):
+        """各指标的信息熵 (0-1)"""
+        def compute():
+            schemes = self.shape[0]
+            if schemes < 2:
+                return np.ones(self.shape[1])
+            totals = self.normalized.sum(axis=0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                p = np.where(totals > 0, self.normalized / totals, 1.0 / schemes)
+                plogp = np.where(p > 0, p * np.log(p), 0.0)
+            return -plogp.sum(axis=0) / np.log(schemes)
+        return self._cached('entropy', compute)
+
+
+def _normalize_weights(raw):
+    total = raw.sum()
+    if not np.isfinite(total) or total <= 0:
+        return np.full(len(raw), 1.0 / len(raw)) if len(raw) else raw
+    return raw / total
+
+
+def equal_weights(matrix):
+    """等权重"""
+    return np.full(matrix.shape[1], 1.0 / matrix.shape[1]) if matrix.shape[1] else np.empty(0)
+
+
+def critic_weights(matrix):
+    """CRITIC法：指标对比强度（标准差）与冲突性（1-相关系数）的乘积"""
+    conflict = (1.0 - matrix.correlation).sum(axis=0)
+    return _normalize_weights(matrix.std * conflict)
+
+
+def entropy_weights(matrix):
+    """熵权法：信息熵越小的指标区分度越高，权重越大"""
+    return _normalize_weights(1.0 - matrix.entropy)
+
+
+def critic_entropy_weights(matrix):
+    """CRITIC与熵权的组合权重（算术平均）"""
+    return _normalize_weights((critic_weights(matrix) + entropy_weights(matrix)) / 2)
+
+
+def weighted_sum_scores(matrix, weights):
+    """线性加权：综合得分为规范化值与权重的加权和"""
+    return matrix.normalized @ weights
+
+
+def topsis_scores(matrix, weights):
+    """TOPSIS：按到正、负理想解的距离计算相对贴近度 (0-1)"""
+    weighted = matrix.normalized * weights
+    distance_best = np.sqrt(((weighted - weighted.max(axis=0)) ** 2).sum(axis=1))
+    distance_worst = np.sqrt(((weighted - weighted.min(axis=0)) ** 2).sum(axis=1))
+    total = distance_best + distance_worst
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # 各方案完全相同时贴近度相同
+        return np.where(total > 0, distance_worst / total, 1.0)
+
+
+class EvaluationMethod:
+    """可插拔的评估方法（赋权或排序）"""
+
+    __slots__ = ('key', 'label', 'func')
+
+    def __init__(self, key, label, func):
+        self.key = key
+        self.label = label
+        self.func = func
+
+
+# 赋权方法: func(matrix) -> 权重数组；排序方法: func(matrix, weights) -> 各方案得分
+WEIGHT_METHODS = {}
+SCORE_METHODS = {}
+
+
+def register_weight_method(key, label, func):
+    """注册赋权方法，func(DecisionMatrix) 返回和为1的权重数组"""
+    if key in WEIGHT_METHODS:
+        raise ValueError(f"赋权方法已存在: {key}")
+    WEIGHT_METHODS[key] = EvaluationMethod(key, label, func)
+    return WEIGHT_METHODS[key]
+
+
+def register_score_method(key, label, func):
+    """注册排序方法，func(DecisionMatrix, 权重) 返回各方案得分（越大越好）"""
+    if key in SCORE_METHODS:
+        raise ValueError(f"排序方法已存在: {key}")
+    SCORE_METHODS[key] = EvaluationMethod(key, label, func)
+    return SCORE_METHODS[key]
+
+
+register_weight_method("critic", "CRITIC法", critic_weights)
+register_weight_method("entropy", "熵权法", entropy_weights)
+register_weight_method("critic_entropy", "CRITIC-熵权组合", critic_entropy_weights)
+register_weight_method("equal", "等权重", equal_weights)
+register_score_method("weighted_sum", "线性加权", weighted_sum_scores)
+register_score_method("topsis", "TOPSIS", topsis_scores)
+
+
+class EvaluationResult:
+    """一次评估的结果"""
+
+    __slots__ = ('weight_method', 'score_method', 'weights', 'scores', 'ranking')
+
+    def __init__(self, weight_method, score_method, weights, scores):
+        self.weight_method = weight_method
+        self.score_method = score_method
+        self.weights = weights          # 各指标权重
+        self.scores = scores            # 各方案得分
+        self.ranking = np.argsort(-scores, kind='stable')  # 方案下标，按得分从高到低
+
+
+class EvaluationSession:
+    """在同一个决策矩阵上切换评估方法：权重和得分按方法缓存，切换方法时只计算缺少的部分"""
+
+    def __init__(self, matrix, missing=()):
+        self.matrix = matrix
+        self.missing = list(missing)    # 选中但缺少数值、未参与评估的指标编码
+        self._weights = {}
+        self._results = {}
+
+    def weights(self, method):
+        """获取某一赋权方法的权重"""
+        if method not in self._weights:
+            weights = WEIGHT_METHODS[method].func(self.matrix)
+            weights.setflags(write=False)
+            self._weights[method] = weights
+        return self._weights[method]
+
+    def evaluate(self, weight_method="critic", score_method="weighted_sum"):
+        """按指定的赋权和排序方法评估，返回 EvaluationResult"""
+        key = (weight_method, score_method)
+        if key not in self._results:
+            weights = self.weights(weight_method)
+            scores = SCORE_METHODS[score_method].func(self.matrix, weights)
+            self._results[key] = EvaluationResult(weight_method, score_method, weights, scores)
+        return self._results[key]
+
+
+def _indicator_values(value, scheme_count):
+    if value is None:
+        return None
+    values = np.atleast_1d(np.asarray(value, dtype=np.float64))
+    if len(values) == 1 and scheme_count:
+        values = np.repeat(values, scheme_count)
+    if (scheme_count and len(values) != scheme_count) or not np.isfinite(values).all():
+        return None
+    return values
+
+
+def build_decision_matrix(indicator_system_data, scheme_count=None):
+    """从 IndicatorSystem.json 中选中且已计算数值的指标构建决策矩阵，
+    返回 (DecisionMatrix或None, 缺少数值的指标编码列表)"""
+    columns, types, codes, missing = [], [], [], []
+    for definition, info in INDICATORS.entries(indicator_system_data):
+        if not info.get("选择状态"):
+            continue
+        try:
+            values = _indicator_values(info.get("数值"), scheme_count)
+        except (TypeError, ValueError):
+            values = None
+        if values is None or (columns and len(values) != len(columns[0])):
+            missing.append(definition.code)
+            continue
+        columns.append(values)
+        types.append(info.get("指标类型", definition.indicator_type))
+        codes.append(definition.code)
+    if not columns:
+        return None, missing
+    return DecisionMatrix(np.column_stack(columns), types, codes), missing
+
+
+def apply_result(indicator_system_data, session, result):
+    """把规范化值、各方法权重、得分分量和各方案得分写回 IndicatorSystem.json 数据
+
+    只有线性加权的得分是各指标得分分量之和；其他排序方法（如TOPSIS的贴近度）不能按指标
+    分解，得分分量置空，各方案得分只保存在 EVALUATION_RESULT_KEY 中。
+    """
+    indicator_system_data[EVALUATION_RESULT_KEY] = {
+        "赋权方法": result.weight_method, "排序方法": result.score_method,
+        "方案得分": result.scores.tolist()}
+    decomposable = result.score_method == "weighted_sum"
+    matrix = session.matrix
+    column = {code: k for k, code in enumerate(matrix.codes)}
+    critic = session.weights("critic")
+    entropy = session.weights("entropy")
+    for definition, info in INDICATORS.entries(indicator_system_data):
+        k = column.get(definition.code)
+        if k is None:
+            continue
+        info["规范化值"] = matrix.normalized[:, k].tolist()
+        info["critic"] = float(critic[k])
+        info["entropy"] = float(entropy[k])
+        info["组合权值"] = float(result.weights[k])
+        info["综合评估得分分量"] = (matrix.normalized[:, k] * result.weights[k]).tolist() if decomposable else None
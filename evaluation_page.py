@@ -1,6 +1,5 @@
-import os
 from PyQt5.QtWidgets import QPushButton, QHBoxLayout
-from PyQt5.QtGui import QIcon
+from resource_manager import get_resources, set_style_class
 
 class EvaluationPage:
     def __init__(self):
@@ -11,19 +10,8 @@ class EvaluationPage:
     
     def load_icons(self):
         """加载图标资源"""
-        self.icons = {}
-        icons_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons")
-        
-        icon_files = {
-            'evaluation': '综合评估.svg'
-        }
-        
-        for key, filename in icon_files.items():
-            icon_path = os.path.join(icons_dir, filename)
-            if os.path.exists(icon_path):
-                self.icons[key] = QIcon(icon_path)
-            else:
-                self.icons[key] = QIcon()
+        self.resources = get_resources()
+        self.icons = self.resources.icons('evaluation')
 
     def create_control_buttons(self, parent_layout):
         """创建控制按钮"""
@@ -35,23 +23,7 @@ class EvaluationPage:
         if 'evaluation' in self.icons:
             self.start_btn.setIcon(self.icons['evaluation'])
         self.start_btn.setMinimumSize(120, 35)
-        self.start_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #27ae60;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 8px 16px;
-                font-size: 9pt;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #219a52;
-            }
-            QPushButton:pressed {
-                background-color: #1e8449;
-            }
-        """)
+        set_style_class(self.start_btn, "success")
         self.start_btn.clicked.connect(self.start_evaluation)
         
         button_layout.addWidget(self.start_btn)
@@ -0,0 +1,84 @@
+import time
+from PyQt5.QtCore import Qt, QObject, QThread, pyqtSignal
+
+
+class EvaluationWorker(QObject):
+    """在后台线程中按方案分块进行财务计算，检查点的写入转发到主线程"""
+
+    write_requested = pyqtSignal(str, object)      # (检查点名称, 数组或None)
+    progress = pyqtSignal(int, int)                # (已完成方案数, 方案总数)
+    finished = pyqtSignal(bool, str)               # (是否全部完成, 错误信息)
+
+    def __init__(self, checkpointed_run):
+        super().__init__()
+        self.checkpointed_run = checkpointed_run
+        self._cancelled = False
+
+    def cancel(self):
+        """请求停止，当前这一块算完后停止（已完成的块保留为检查点）"""
+        self._cancelled = True
+
+    def run(self):
+        # 项目存储只在主线程使用（SQLite连接不能跨线程使用，压缩包项目不能由两个实例同时写入）
+        try:
+            ok = self.checkpointed_run.run(self.progress.emit, lambda: self._cancelled,
+                                           self.write_requested.emit)
+            self.finished.emit(ok, "")
+        except Exception as e:
+            self.finished.emit(False, str(e))
+
+
+class EvaluationRunner(QObject):
+    """管理财务计算线程，在主线程中写入检查点，对外转发进度和结束信号"""
+
+    def __init__(self, checkpointed_run, write_array, parent=None):
+        super().__init__(parent)
+        self.checkpointed_run = checkpointed_run
+        self.write_array = write_array
+        self.worker = EvaluationWorker(checkpointed_run)
+        self.thread = QThread()
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.run)
+        # 直接在计算线程中结束事件循环，主线程等待时（不处理事件）线程也能结束
+        self.worker.finished.connect(self.thread.quit, Qt.DirectConnection)
+        self.thread.finished.connect(self.worker.deleteLater)
+        self.thread.finished.connect(self.thread.deleteLater)
+
+        # 跨线程信号按发出顺序排队，检查点在结束信号之前写完
+        self.worker.write_requested.connect(self.on_write_requested)
+
+        # 便于调用方直接连接
+        self.progress = self.worker.progress
+        self.finished = self.worker.finished
+
+    def on_write_requested(self, name, values):
+        if self.write_array is not None:
+            self.write_array(name, values)
+
+    def start(self):
+        """开始计算"""
+        self.thread.start()
+
+    def cancel(self):
+        """停止计算"""
+        self.worker.cancel()
+
+    def detach(self):
+        """不再写入检查点（项目已切换或关闭时使用）"""
+        self.worker.cancel()
+        self.write_array = None
+
+    def is_running(self):
+        return self.thread.isRunning()
+
+    def wait(self, msecs=None):
+        """等待后台线程结束（关闭窗口时使用），msecs 为None时一直等到当前这一块算完
+
+        QThread.wait 等待期间不释放GIL，计算线程无法继续，因此改为短暂休眠后反复检查。
+        """
+        deadline = None if msecs is None else time.monotonic() + msecs / 1000.0
+        while not self.thread.wait(0):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.02)
+        return True
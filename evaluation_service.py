@@ -0,0 +1,695 @@
+import argparse
+import heapq
+import hmac
+import ipaddress
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import shutil
+import signal
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+import zipfile
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import numpy as np
+
+from data_manager import DataManager
+from financial_inputs import FinancialInputError
+from evaluation_methods import WEIGHT_METHODS, SCORE_METHODS
+from project_store import is_project_path
+from archive_project_store import ARCHIVE_PROJECT_EXTENSION
+from sqlite_project_store import SQLITE_PROJECT_EXTENSION
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# 访问令牌的环境变量（避免在命令行中暴露令牌）
+TOKEN_ENVIRONMENT = "IES_SERVICE_TOKEN"
+
+# 任务状态
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+# 上传项目文件允许的扩展名：单文件项目，或把项目文件夹压缩成的 zip
+FOLDER_UPLOAD_EXTENSION = ".zip"
+UPLOAD_EXTENSIONS = (ARCHIVE_PROJECT_EXTENSION, SQLITE_PROJECT_EXTENSION, FOLDER_UPLOAD_EXTENSION)
+
+# 单个上传文件（及 zip 解压后）的大小上限（字节）
+MAX_UPLOAD_BYTES = 2 * 1024 ** 3
+
+# 已结束的任务最多保留的个数和时间（秒），超出后从任务列表中删除
+MAX_FINISHED_JOBS = 200
+FINISHED_JOB_TTL = 24 * 3600
+
+
+class ServiceError(Exception):
+    """请求无效，status 为返回的 HTTP 状态码"""
+
+    def __init__(self, message, status=HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+class EvaluationJob:
+    """一个评估任务：状态和进度事件可被多个线程读取，事件只追加不修改"""
+
+    def __init__(self, project_path, weight_method, score_method, priority=0, upload=False):
+        self.id = uuid.uuid4().hex[:12]
+        self.project_path = project_path
+        self.weight_method = weight_method
+        self.score_method = score_method
+        self.priority = priority
+        self.upload = upload            # 项目为上传文件时，任务结束后删除
+        self.state = QUEUED
+        self.created = time.time()
+        self.result = None
+        self.error = None
+        self.ended = None
+        self.events = []
+        self.partial = None             # 计算进程最近发回的已完成分块结果
+        self.stop_requested = threading.Event()
+        self._condition = threading.Condition()
+
+    def emit(self, stage, state=None, **data):
+        """追加一条进度事件并唤醒等待的读取者"""
+        with self._condition:
+            if state is not None:
+                self.state = state
+                if state in FINISHED_STATES:
+                    self.ended = time.time()
+            self.events.append(dict(data, stage=stage, state=self.state, time=time.time()))
+            self._condition.notify_all()
+
+    def wait_events(self, start, timeout=None):
+        """等待第 start 条及之后的事件，返回 (新事件列表, 任务是否已结束)"""
+        with self._condition:
+            if len(self.events) <= start and self.state not in FINISHED_STATES:
+                self._condition.wait(timeout)
+            return self.events[start:], self.state in FINISHED_STATES
+
+    def summary(self):
+        """任务概况（不含结果）"""
+        partial = self.partial or {}
+        done, schemes = partial.get("completed_schemes"), partial.get("schemes")
+        return {"id": self.id, "project": self.project_path, "state": self.state,
+                "priority": self.priority, "weight_method": self.weight_method,
+                "score_method": self.score_method, "created": self.created, "error": self.error,
+                "stage": self.events[-1]["stage"] if self.events else None,
+                "completed_schemes": done, "schemes": schemes}
+
+
+class JobQueue:
+    """按优先级（大者优先）、同优先级按提交顺序出队的任务队列"""
+
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def put(self, job):
+        with self._condition:
+            heapq.heappush(self._heap, (-job.priority, next(self._counter), job))
+            self._condition.notify()
+
+    def get(self):
+        """取出下一个未取消的任务并标记为运行中，队列关闭后返回None"""
+        with self._condition:
+            while True:
+                while not self._heap and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return None
+                job = heapq.heappop(self._heap)[2]
+                if job.state == QUEUED:
+                    job.emit("开始", RUNNING)
+                    return job
+
+    def cancel(self, job):
+        """取消排队中的任务，已开始的任务返回False"""
+        with self._condition:
+            if job.state != QUEUED:
+                return False
+            job.emit("已取消", CANCELLED)
+            return True
+
+    def position(self, job):
+        """任务在队列中的位置（0 为下一个），不在队列中时返回None"""
+        with self._condition:
+            order = sorted(entry for entry in self._heap if entry[2].state == QUEUED)
+            for index, entry in enumerate(order):
+                if entry[2] is job:
+                    return index
+            return None
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+def run_job(project_path, weight_method, score_method, emit, stop=None, publish=None):
+    """在独立的 DataManager 中执行一次完整评估：加载项目、分块财务和指标计算、综合评估
+
+    emit(阶段, 状态=None, **数据) 接收进度事件，publish(分块计算) 在每块完成后调用；
+    返回结果字典，stop() 为真而停止时返回None。分块结果写入项目的检查点，任务中断或
+    被停止后再次提交同一项目时从检查点继续。
+    """
+    data_manager = DataManager()
+    try:
+        emit("加载项目")
+        data_manager.begin_load(project_path)
+        store = data_manager.get_store()
+        data_manager.finish_json_load(store.read_user_input(), store.read_indicator_system())
+
+        emit("财务计算")
+        run = data_manager.create_checkpointed_run()
+        done, schemes = run.progress()
+        if publish is not None:
+            publish(run)
+        if done:
+            emit("从检查点继续", completed=done, schemes=schemes)
+
+        def progress(done, schemes):
+            if publish is not None:
+                publish(run)
+            emit("财务计算", completed=done, schemes=schemes)
+
+        if not run.run(progress, stop):
+            emit("已停止", CANCELLED, completed=run.progress()[0], schemes=schemes)
+            return None
+        notes = run.shortfalls()
+        data_manager.finish_checkpointed_run(run)
+
+        emit("综合评估")
+        result, missing = data_manager.evaluate(weight_method, score_method)
+        if result is None:
+            raise FinancialInputError("已选指标尚无计算数值，无法进行综合评估"
+                                      + (f"，缺少数值的指标：{'、'.join(missing)}" if missing else ""))
+        session = data_manager.evaluation_session
+        return {
+            "ranking": [int(s) + 1 for s in result.ranking],
+            "scores": result.scores.tolist(),
+            "weights": dict(zip(session.matrix.codes, result.weights.tolist())),
+            "indicators": dict(zip(session.matrix.codes, session.matrix.values.T.tolist())),
+            "missing": missing,
+            "notes": notes,
+        }
+    finally:
+        data_manager.close_store()
+
+
+def partial_results(run):
+    """分块计算已完成部分的指标数值（可转为JSON），未完成的方案为None"""
+    done, schemes = run.progress()
+    indicators = {code: [None if np.isnan(value) else float(value) for value in values]
+                  for code, values in run.partial().items()}
+    return {"completed_schemes": done, "schemes": schemes, "indicators": indicators,
+            "notes": run.shortfalls()}
+
+
+def _job_process(project_path, weight_method, score_method, messages, stop):
+    """计算进程的入口：事件、部分结果和最终结果通过 messages 队列发回服务进程"""
+    # 中断由服务进程通过 stop 传递，计算进程在当前分块完成后停止
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    def emit(stage, state=None, **data):
+        messages.put(("event", stage, state, data))
+
+    try:
+        result = run_job(project_path, weight_method, score_method, emit, stop.is_set,
+                         lambda run: messages.put(("partial", partial_results(run))))
+        if result is not None:
+            messages.put(("result", result))
+            emit("完成", DONE)
+    except Exception as e:      # 任务失败不影响服务和其他任务
+        emit("失败", FAILED, error=str(e))
+    finally:
+        messages.put(("exit",))
+
+
+def _remove_path(path):
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def _member_name(info):
+    """zip 成员的文件名；未标记UTF-8的文件名（Windows 自带压缩工具）按GBK解码"""
+    if info.flag_bits & 0x800:
+        return info.filename
+    raw = info.filename.encode("cp437")
+    for encoding in ("utf-8", "gbk"):
+        try:
+            return raw.decode(encoding)
+        except UnicodeDecodeError:
+            pass
+    return info.filename
+
+
+def extract_project_zip(zip_path, target):
+    """把压缩的项目文件夹解压到 target，成员路径不能离开 target，解压总大小受 MAX_UPLOAD_BYTES 限制；
+    项目文件夹可以位于压缩包根目录或唯一的顶层文件夹中，返回项目文件夹路径"""
+    root = os.path.realpath(target)
+    budget = MAX_UPLOAD_BYTES
+    try:
+        with zipfile.ZipFile(zip_path) as archive:
+            for info in archive.infolist():
+                name = _member_name(info).replace("\\", "/")
+                parts = [part for part in name.split("/") if part not in ("", ".")]
+                if name.startswith("/") or ".." in parts or (parts and ":" in parts[0]):
+                    raise ServiceError(f"压缩包中的路径无效: {name}")
+                if (info.external_attr >> 16) & 0o170000 == 0o120000:
+                    raise ServiceError(f"压缩包中不能包含符号链接: {name}")
+                if not parts:
+                    continue
+                path = os.path.join(root, *parts)
+                if os.path.commonpath([root, os.path.realpath(path)]) != root:
+                    raise ServiceError(f"压缩包中的路径无效: {name}")
+                if info.is_dir():
+                    os.makedirs(path, exist_ok=True)
+                    continue
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with archive.open(info) as source, open(path, "wb") as f:
+                    while True:
+                        chunk = source.read(1024 * 1024)
+                        if not chunk:
+                            break
+                        budget -= len(chunk)
+                        if budget < 0:
+                            raise ServiceError("压缩包解压后过大", HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+                        f.write(chunk)
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, NotImplementedError) as e:
+        raise ServiceError(f"无法读取压缩包: {e}")
+    if is_project_path(root):
+        return root
+    entries = os.listdir(root)
+    if len(entries) == 1 and is_project_path(os.path.join(root, entries[0])):
+        return os.path.join(root, entries[0])
+    raise ServiceError("压缩包中没有找到项目文件夹（应包含 User_input.json 和 IndicatorSystem.json）")
+
+
+class EvaluationService:
+    """评估服务：任务队列加固定数量的工作线程，每个任务在独立的计算进程中运行
+
+    工作线程只负责启动计算进程并转发它发回的事件，计算本身不受服务进程GIL的限制。
+    project_root 不为None时，按路径提交的项目必须位于该目录下（上传的项目不受限制）。
+    """
+
+    def __init__(self, workers=None, spool_dir=None, project_root=None):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.spool_dir = spool_dir or tempfile.mkdtemp(prefix="ies-service-")
+        os.makedirs(self.spool_dir, exist_ok=True)
+        self.project_root = os.path.realpath(project_root) if project_root else None
+        self.queue = JobQueue()
+        self.jobs = {}
+        self._lock = threading.Lock()
+        self._project_locks = {}
+        self._threads = []
+        # 服务进程中有多个线程，计算进程用 spawn 方式启动而不是 fork
+        self._context = multiprocessing.get_context("spawn")
+
+    def start(self):
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"evaluation-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """停止服务：运行中的任务在当前分块完成后停止，排队中的任务不再运行"""
+        self.queue.close()
+        with self._lock:
+            jobs = list(self.jobs.values())
+        for job in jobs:
+            if job.state == RUNNING:
+                job.stop_requested.set()
+        for thread in self._threads:
+            thread.join()
+
+    def _work(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+            # 同一项目的任务依次运行，避免同时写入项目文件
+            with self._lock:
+                project_lock = self._project_locks.setdefault(job.project_path, threading.Lock())
+            with project_lock:
+                self._execute(job)
+            if job.upload:
+                with self._lock:
+                    self._project_locks.pop(job.project_path, None)
+
+    def _execute(self, job):
+        """在计算进程中运行任务，转发进程发回的消息，直到进程结束"""
+        messages = self._context.Queue()
+        stop = self._context.Event()
+        process = self._context.Process(
+            target=_job_process, name=f"evaluation-{job.id}", daemon=True,
+            args=(job.project_path, job.weight_method, job.score_method, messages, stop))
+        try:
+            process.start()
+            while True:
+                if job.stop_requested.is_set():
+                    stop.set()
+                try:
+                    message = messages.get(timeout=0.2)
+                except queue.Empty:
+                    if process.is_alive():
+                        continue
+                    break
+                if message[0] == "exit":
+                    break
+                self._receive(job, message)
+            process.join()
+        except Exception as e:
+            job.error = str(e)
+        finally:
+            if job.state not in FINISHED_STATES:
+                job.error = job.error or f"计算进程异常退出（退出码 {process.exitcode}）"
+                job.emit("失败", FAILED, error=job.error)
+            messages.close()
+            if job.upload:
+                _remove_path(job.project_path)
+
+    def _receive(self, job, message):
+        kind, payload = message[0], message[1:]
+        if kind == "event":
+            stage, state, data = payload
+            if state == FAILED:
+                job.error = data.get("error")
+            job.emit(stage, state, **data)
+        elif kind == "partial":
+            job.partial = payload[0]
+        elif kind == "result":
+            job.result = payload[0]
+
+    def _prune(self):
+        """删除超出保留个数或保留时间的已结束任务（调用时已持有 self._lock）"""
+        finished = sorted((job for job in self.jobs.values() if job.ended is not None),
+                          key=lambda job: job.ended)
+        expire = time.time() - FINISHED_JOB_TTL
+        excess = len(finished) - MAX_FINISHED_JOBS
+        for index, job in enumerate(finished):
+            if index < excess or job.ended < expire:
+                del self.jobs[job.id]
+
+    def check_project_path(self, project_path):
+        """检查按路径提交的项目，返回绝对路径"""
+        if not project_path:
+            raise ServiceError("缺少项目路径")
+        path = os.path.realpath(project_path)
+        if self.project_root is not None and os.path.commonpath([self.project_root, path]) != self.project_root:
+            raise ServiceError("项目不在服务允许的目录中", HTTPStatus.FORBIDDEN)
+        if not os.path.exists(path) or not is_project_path(path):
+            raise ServiceError(f"项目不存在: {project_path}")
+        return path
+
+    def submit(self, project_path, weight_method="critic", score_method="weighted_sum", priority=0,
+               upload=False):
+        """提交任务，参数无效时抛出 ServiceError"""
+        if weight_method not in WEIGHT_METHODS:
+            raise ServiceError(f"未知的赋权方法: {weight_method}")
+        if score_method not in SCORE_METHODS:
+            raise ServiceError(f"未知的排序方法: {score_method}")
+        if not upload:
+            project_path = self.check_project_path(project_path)
+        job = EvaluationJob(os.path.abspath(project_path), weight_method, score_method, int(priority), upload)
+        with self._lock:
+            self._prune()
+            self.jobs[job.id] = job
+        job.emit("排队")
+        self.queue.put(job)
+        return job
+
+    def save_upload(self, filename, stream, length):
+        """保存上传的单文件项目或压缩的项目文件夹，返回项目路径"""
+        extension = os.path.splitext(filename or "")[1].lower()
+        if extension not in UPLOAD_EXTENSIONS:
+            raise ServiceError(f"只支持上传 {'、'.join(UPLOAD_EXTENSIONS)} 项目文件")
+        if length <= 0 or length > MAX_UPLOAD_BYTES:
+            raise ServiceError("上传文件为空或过大", HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        name = uuid.uuid4().hex
+        path = os.path.join(self.spool_dir, name + extension)
+        remaining = length
+        with open(path, "wb") as f:
+            while remaining > 0:
+                chunk = stream.read(min(remaining, 1024 * 1024))
+                if not chunk:
+                    break
+                f.write(chunk)
+                remaining -= len(chunk)
+        if remaining:
+            os.remove(path)
+            raise ServiceError("上传数据不完整")
+        if extension != FOLDER_UPLOAD_EXTENSION:
+            return path
+
+        # 解压到临时目录，项目文件夹移到 spool 目录下，任务结束后整个删除
+        target = os.path.join(self.spool_dir, name + ".extracting")
+        try:
+            project = extract_project_zip(path, target)
+            folder = os.path.join(self.spool_dir, name)
+            os.rename(project, folder)
+            return folder
+        finally:
+            os.remove(path)
+            _remove_path(target)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self.jobs.get(job_id)
+        if job is None:
+            raise ServiceError(f"任务不存在: {job_id}", HTTPStatus.NOT_FOUND)
+        return job
+
+    def cancel(self, job_id):
+        """取消排队中的任务；正在运行的任务在当前分块完成后停止，已完成的分块保留在检查点中"""
+        job = self.get(job_id)
+        if self.queue.cancel(job):
+            if job.upload:
+                _remove_path(job.project_path)
+        elif job.state == RUNNING:
+            job.stop_requested.set()
+        else:
+            raise ServiceError("任务已结束", HTTPStatus.CONFLICT)
+        return job
+
+    def partial(self, job_id):
+        """任务已完成分块的指标数值，未完成的方案为None"""
+        job = self.get(job_id)
+        return job.partial or {"completed_schemes": 0, "schemes": None, "indicators": {}, "notes": []}
+
+    def list_jobs(self):
+        with self._lock:
+            self._prune()
+            jobs = list(self.jobs.values())
+        return [job.summary() for job in sorted(jobs, key=lambda job: job.created)]
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """HTTP/JSON 接口
+
+    POST   /jobs                提交任务：JSON {"project": 服务器上的路径, "weight_method", "score_method",
+                                "priority"}，或以 application/octet-stream 上传 .iesz/.iesdb 单文件项目
+                                或压缩成 .zip 的项目文件夹（参数放在查询字符串中，需要 filename）
+    GET    /jobs                任务列表
+    GET    /jobs/<id>           任务状态和结果
+    GET    /jobs/<id>/events    逐行推送进度事件（JSON Lines），任务结束时关闭
+    GET    /jobs/<id>/partial   已完成分块的指标数值，计算过程中即可查询
+    DELETE /jobs/<id>           取消排队中的任务，或在当前分块完成后停止运行中的任务
+    GET    /methods             可用的赋权和排序方法
+
+    服务默认只监听本机。供其他电脑提交时用 --host 0.0.0.0 监听所有地址，此时必须设置访问令牌，
+    每个请求带上 "Authorization: Bearer <令牌>"；按路径提交的项目可用 --project-root 限制在
+    指定目录下，其他电脑上的项目应以上传方式提交。
+    """
+
+    protocol_version = "HTTP/1.1"
+    service = None      # 由 make_server 设置
+    token = None        # 不为None时每个请求都要带上该令牌
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, data, status=HTTPStatus.OK):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        return parts, {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+    def _authorized(self):
+        if self.token is None:
+            return True
+        scheme, _, value = self.headers.get("Authorization", "").partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(value.strip().encode("utf-8"),
+                                                                  self.token.encode("utf-8"))
+
+    def _handle(self, method):
+        try:
+            if not self._authorized():
+                raise ServiceError("缺少或错误的访问令牌", HTTPStatus.UNAUTHORIZED)
+            parts, query = self._route()
+            method(parts, query)
+        except ServiceError as e:
+            self._send_json({"error": str(e)}, e.status)
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json({"error": str(e)}, HTTPStatus.BAD_REQUEST)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        except Exception as e:      # 意外错误返回500，不中断服务
+            traceback.print_exc()
+            self.close_connection = True
+            self._send_json({"error": f"服务内部错误: {e}"}, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    def do_GET(self):
+        self._handle(self._get)
+
+    def do_POST(self):
+        self._handle(self._post)
+
+    def do_DELETE(self):
+        self._handle(self._delete)
+
+    def _get(self, parts, query):
+        service = self.service
+        if parts == ["methods"]:
+            self._send_json({"weight_methods": {key: m.label for key, m in WEIGHT_METHODS.items()},
+                             "score_methods": {key: m.label for key, m in SCORE_METHODS.items()}})
+        elif parts == ["jobs"]:
+            self._send_json(service.list_jobs())
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = service.get(parts[1])
+            data = job.summary()
+            data["queue_position"] = service.queue.position(job)
+            data["result"] = job.result
+            self._send_json(data)
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "events":
+            self._stream_events(service.get(parts[1]))
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "partial":
+            self._send_json(service.partial(parts[1]))
+        else:
+            raise ServiceError("接口不存在", HTTPStatus.NOT_FOUND)
+
+    def _post(self, parts, query):
+        if parts != ["jobs"]:
+            raise ServiceError("接口不存在", HTTPStatus.NOT_FOUND)
+        service = self.service
+        length = int(self.headers.get("Content-Length") or 0)
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip()
+        if content_type == "application/octet-stream":
+            path = service.save_upload(query.get("filename"), self.rfile, length)
+            params, upload = query, True
+        else:
+            params = json.loads(self.rfile.read(length) or b"{}") if length else {}
+            path, upload = params.get("project"), False
+        try:
+            job = service.submit(path, params.get("weight_method", "critic"),
+                                 params.get("score_method", "weighted_sum"),
+                                 int(params.get("priority", 0)), upload)
+        except (ServiceError, ValueError):
+            if upload:
+                _remove_path(path)
+            raise
+        self._send_json(job.summary(), HTTPStatus.ACCEPTED)
+
+    def _delete(self, parts, query):
+        if len(parts) != 2 or parts[0] != "jobs":
+            raise ServiceError("接口不存在", HTTPStatus.NOT_FOUND)
+        self._send_json(self.service.cancel(parts[1]).summary())
+
+    def _stream_events(self, job):
+        """用分块传输逐条发送事件，直到任务结束"""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        sent = 0
+        try:
+            while True:
+                events, finished = job.wait_events(sent, timeout=15)
+                sent += len(events)
+                payload = "".join(json.dumps(event, ensure_ascii=False) + "\n" for event in events)
+                if not events:
+                    payload = "\n"      # 心跳，及时发现客户端断开
+                self._write_chunk(payload.encode("utf-8"))
+                if finished and not job.events[sent:]:
+                    break
+            self._write_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+def make_server(service, host=DEFAULT_HOST, port=DEFAULT_PORT, token=None):
+    """创建绑定到 service 的 HTTP 服务器，token 不为None时要求请求带上该访问令牌"""
+    handler = type("BoundServiceHandler", (ServiceHandler,), {"service": service, "token": token or None})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def is_local_host(host):
+    """监听地址是否只允许本机访问"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="可再生能源-氢能耦合项目评估服务",
+        epilog="供其他电脑提交任务时用 --host 0.0.0.0 监听所有地址，此时必须设置访问令牌"
+               f"（--token 或环境变量 {TOKEN_ENVIRONMENT}），客户端在请求头中带上 "
+               "\"Authorization: Bearer <令牌>\"；建议同时用 --project-root 限制按路径提交的项目，"
+               "其他电脑上的项目以 .iesz/.iesdb 文件或 .zip 压缩的项目文件夹上传。")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="监听地址（默认只允许本机访问）")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="同时运行的任务数，默认为CPU核数")
+    parser.add_argument("--spool", default=None, help="上传项目的临时保存目录")
+    parser.add_argument("--token", default=os.environ.get(TOKEN_ENVIRONMENT),
+                        help=f"访问令牌，默认读取环境变量 {TOKEN_ENVIRONMENT}；监听非本机地址时必须设置")
+    parser.add_argument("--project-root", default=None,
+                        help="按路径提交的项目必须位于此目录下（默认不限制）")
+    args = parser.parse_args(argv)
+    if not args.token and not is_local_host(args.host):
+        parser.error(f"监听非本机地址 {args.host} 时必须用 --token 或环境变量 {TOKEN_ENVIRONMENT} 设置访问令牌")
+
+    service = EvaluationService(args.workers, args.spool, args.project_root)
+    service.start()
+    server = make_server(service, args.host, args.port, args.token)
+    print(f"评估服务已启动：http://{args.host}:{server.server_port}（{service.workers} 个计算进程）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+
+
+if __name__ == "__main__":
+    main()
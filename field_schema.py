@@ -0,0 +1,303 @@
+# User_input.json 字段表
+# 界面数据使用扁平的键（如 wt_investment_cost），User_input.json 使用嵌套结构
+# （如 WT.单位容量投资成本.数值）。字段表在模块导入时编译成访问器，
+# 保存和加载都只是对访问器表的一次循环，新增字段只需在表中增加一行。
+
+import numpy as np
+from series_parser import (parse_series, fit_series_length,
+                           HOURS_PER_DAY, SERIES_LENGTHS)
+
+# 路径不存在时的占位值
+MISSING = object()
+
+# 输入无效时的占位值，保存时跳过该字段
+INVALID = object()
+
+
+def parse_number(value):
+    """解析数值，如果是None或空字符串则返回None"""
+    if value is None or value == "":
+        return None
+    try:
+        if isinstance(value, str):
+            value = value.strip()
+            if value == "":
+                return None
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_price_list(value):
+    """解析价格列表，支持24小时、12×24逐月或8760小时数据，其他长度调整为24小时"""
+    if value is None or value == "":
+        # 默认返回24个0.0
+        return [0.0] * HOURS_PER_DAY
+
+    values, bad_positions = parse_series(value)
+    if bad_positions:
+        # 存在无效数值时不写入，保留原有数据，由界面提示出错位置
+        return INVALID
+    if len(values) == 1:
+        # 如果是单个数值，复制24次
+        values = np.repeat(values, HOURS_PER_DAY)
+    elif len(values) not in SERIES_LENGTHS:
+        values = fit_series_length(values, HOURS_PER_DAY)
+    return values.tolist()
+
+
+def parse_capacity_list(value):
+    """解析容量列表，根据方案数量返回对应数组"""
+    if value is None or value == "":
+        return None
+
+    values, bad_positions = parse_series(value)
+    if bad_positions:
+        return INVALID
+    if len(values) == 0:
+        return None
+    return values.tolist()
+
+
+def format_text(value):
+    """格式化文本字段"""
+    return "" if value is None else str(value)
+
+
+def format_number(value):
+    """格式化数值字段"""
+    return "" if value is None else str(value)
+
+
+def format_price_list(price_list):
+    """格式化价格列表为字符串"""
+    if not price_list or not isinstance(price_list, list):
+        return ""
+
+    # 支持的长度原样输出，其他长度补全或截断为24个值
+    if len(price_list) not in SERIES_LENGTHS:
+        price_list = fit_series_length(np.asarray(price_list, dtype=np.float64), HOURS_PER_DAY).tolist()
+
+    return ",".join(str(float(x)) for x in price_list)
+
+
+def format_capacity_list(capacity_list):
+    """格式化容量列表为字符串"""
+    if not capacity_list:
+        return ""
+
+    if isinstance(capacity_list, list):
+        return ",".join(str(x) for x in capacity_list)
+    return str(capacity_list)
+
+
+def _identity(value):
+    return value
+
+
+# 字段类型: (保存时的解析函数, 加载时的格式化函数, 路径缺失时界面使用的值)
+# 解析函数返回 INVALID 时保存会跳过该字段
+FIELD_KINDS = {
+    'text': (_identity, format_text, ""),
+    'number': (parse_number, format_number, ""),
+    'price_list': (parse_price_list, format_price_list, ""),
+    'capacity_list': (parse_capacity_list, format_capacity_list, ""),
+    'flag': (_identity, _identity, None),  # 缺失时使用字段默认值
+}
+
+
+# 字段表: (界面键, JSON路径, 字段类型, 默认值[, 仅当该界面键为真时才写入])
+USER_INPUT_FIELDS = [
+    # 项目基本信息
+    ('project_name', '项目基本信息.项目名称.数值', 'text', None),
+    ('project_life', '项目基本信息.项目生命周期.数值', 'number', None),
+    ('project_people', '项目基本信息.项目人数.数值', 'number', None),
+    ('scheme_count', '项目基本信息.方案个数.数值', 'number', None),
+
+    # 财税与融资参数
+    ('vat_rate', '财税与融资参数.增值税率.数值', 'number', None),
+    ('income_tax_rate', '财税与融资参数.企业所得税率.数值', 'number', None),
+    ('vat_additional_rate', '财税与融资参数.增值税附加税率.数值', 'number', None),
+    ('equity_ratio', '财税与融资参数.自有资金比例.数值', 'number', None),
+    ('loan_rate', '财税与融资参数.贷款利率.数值', 'number', None),
+    ('loan_term', '财税与融资参数.贷款期限.数值', 'number', None),
+    ('grace_period', '财税与融资参数.宽限期.数值', 'number', None),
+    ('repayment_method', '财税与融资参数.还款方式.数值', 'text', None),
+
+    # 财务分析参数
+    ('nominal_discount_rate', '财务分析参数.名义贴现率.数值', 'number', None),
+    ('inflation_rate_enabled', '财务分析参数.预期通货膨胀率.选择状态', 'flag', True),
+    ('inflation_rate', '财务分析参数.预期通货膨胀率.数值', 'number', None, 'inflation_rate_enabled'),
+    ('dispatch_mode', '财务分析参数.调度方式.数值', 'text', None),
+
+    # 价格参数
+    ('oxygen_price', '价格参数.氧气的销售价格.数值', 'price_list', None),
+    ('electricity_sell_price', '价格参数.电能销售价格.数值', 'price_list', None),
+    ('electricity_buy_price', '价格参数.电能的购买价格.数值', 'price_list', None),
+    ('hydrogen_price', '价格参数.单位质量氢能的价格.数值', 'price_list', None),
+
+    # 成本参数
+    ('site_cost_enabled', '成本参数.场地购置费用.选择状态', 'flag', True),
+    ('construction_cost_enabled', '成本参数.工程施工费用.选择状态', 'flag', True),
+    ('site_cost', '成本参数.场地购置费用.数值', 'number', None),
+    ('construction_cost', '成本参数.工程施工费用.数值', 'number', None),
+    ('personnel_cost', '成本参数.年人员费用.数值', 'number', None),
+
+    # WT参数
+    ('wt_lifetime', 'WT.设备使用寿命.数值', 'number', None),
+    ('wt_investment_cost', 'WT.单位容量投资成本.数值', 'number', None),
+    ('wt_maintenance_cost', 'WT.单位容量维护成本.数值', 'number', None),
+    ('wt_residual_value', 'WT.单位容量残值系数.数值', 'number', None),
+    ('wt_total_capacity', 'WT.风力发电总装机.数值', 'capacity_list', None),
+    ('wt_power_electronics_enabled', 'WT.电力电子接口装置成本设备成本的比例.选择状态', 'flag', True),
+    ('wt_power_electronics_ratio', 'WT.电力电子接口装置成本设备成本的比例.数值', 'number', None),
+
+    # PV参数
+    ('pv_lifetime', 'PV.设备使用寿命.数值', 'number', None),
+    ('pv_investment_cost', 'PV.单位容量投资成本.数值', 'number', None),
+    ('pv_maintenance_cost', 'PV.单位容量维护成本.数值', 'number', None),
+    ('pv_residual_value', 'PV.单位容量残值系数.数值', 'number', None),
+    ('pv_total_capacity', 'PV.光伏机组总装机.数值', 'capacity_list', None),
+    ('pv_power_electronics_enabled', 'PV.电力电子接口装置成本设备成本的比例.选择状态', 'flag', True),
+    ('pv_power_electronics_ratio', 'PV.电力电子接口装置成本设备成本的比例.数值', 'number', None),
+
+    # EL参数
+    ('el_lifetime', 'EL.设备使用寿命.数值', 'number', None),
+    ('el_efficiency', 'EL.能量转化系数.数值', 'number', None),
+    ('el_investment_cost', 'EL.单位容量投资成本.数值', 'number', None),
+    ('el_maintenance_cost', 'EL.单位容量维护成本.数值', 'number', None),
+    ('el_residual_value', 'EL.单位容量残值系数.数值', 'number', None),
+    ('el_capacity', 'EL.电解槽配置容量.数值', 'capacity_list', None),
+    ('el_power_electronics_enabled', 'EL.电力电子接口装置成本设备成本的比例.选择状态', 'flag', True),
+    ('el_power_electronics_ratio', 'EL.电力电子接口装置成本设备成本的比例.数值', 'number', None),
+
+    # HES参数
+    ('hes_lifetime', 'HES.设备使用寿命.数值', 'number', None),
+    ('hes_investment_cost', 'HES.单位容量投资成本.数值', 'number', None),
+    ('hes_maintenance_cost', 'HES.单位容量维护成本.数值', 'number', None),
+    ('hes_residual_value', 'HES.单位容量残值系数.数值', 'number', None),
+    ('hes_capacity', 'HES.氢储能装置配置容量.数值', 'capacity_list', None),
+
+    # HFC参数
+    ('hfc_lifetime', 'HFC.设备使用寿命.数值', 'number', None),
+    ('hfc_investment_cost', 'HFC.单位容量投资成本.数值', 'number', None),
+    ('hfc_maintenance_cost', 'HFC.单位容量维护成本.数值', 'number', None),
+    ('hfc_residual_value', 'HFC.单位容量残值系数.数值', 'number', None),
+    ('hfc_capacity', 'HFC.燃料电池配置容量.数值', 'capacity_list', None),
+    ('hfc_power_electronics_enabled', 'HFC.电力电子接口装置成本设备成本的比例.选择状态', 'flag', True),
+    ('hfc_power_electronics_ratio', 'HFC.电力电子接口装置成本设备成本的比例.数值', 'number', None),
+
+    # ESS参数
+    ('ess_efficiency', 'ESS.蓄电池充放电效率.数值', 'number', None),
+    ('ess_operation_cost', 'ESS.蓄电池单位运行成本.数值', 'number', None),
+    ('ess_lifetime', 'ESS.设备使用寿命.数值', 'number', None),
+    ('ess_investment_cost', 'ESS.单位容量投资成本.数值', 'number', None),
+    ('ess_residual_value', 'ESS.单位容量残值系数.数值', 'number', None),
+    ('ess_capacity', 'ESS.蓄电池配置容量.数值', 'capacity_list', None),
+    ('ess_power_electronics_enabled', 'ESS.电力电子接口装置成本设备成本的比例.选择状态', 'flag', True),
+    ('ess_power_electronics_ratio', 'ESS.电力电子接口装置成本设备成本的比例.数值', 'number', None),
+
+    # 设备选择状态
+    ('wind_turbine', 'WT.设备选择状态', 'flag', False),
+    ('pv', 'PV.设备选择状态', 'flag', False),
+    ('electrolyzer', 'EL.设备选择状态', 'flag', False),
+    ('hydrogen_storage', 'HES.设备选择状态', 'flag', False),
+    ('fuel_cell', 'HFC.设备选择状态', 'flag', False),
+    ('battery_storage', 'ESS.设备选择状态', 'flag', False),
+    ('external_grid', '外部电网.设备选择状态', 'flag', True),
+    ('external_hydrogen', '外部氢源.设备选择状态', 'flag', True),
+
+    # 负荷选择状态
+    ('oxygen_load', '氧负荷.售氧.设备选择状态', 'flag', False),
+    ('ammonia_load', '氢负荷.合成氨.设备选择状态', 'flag', False),
+    ('methanol_load', '氢负荷.合成甲醇.设备选择状态', 'flag', False),
+    ('oil_refining_load', '氢负荷.成品油加工.设备选择状态', 'flag', False),
+    ('vehicle_hydrogen_load', '氢负荷.燃料电池汽车加氢.设备选择状态', 'flag', False),
+    ('steel_load', '氢负荷.钢铁冶炼.设备选择状态', 'flag', False),
+    ('other_hydrogen_load', '氢负荷.其他用途售氢.设备选择状态', 'flag', False),
+    ('electrical_load', '电负荷.系统内用电单元.设备选择状态', 'flag', False),
+]
+
+
+class FieldAccessor:
+    """编译后的字段访问器，路径在编译时拆分，读写时不再做字符串处理"""
+
+    __slots__ = ('ui_key', 'path', 'parent_keys', 'leaf', 'parse', 'format',
+                 'missing_value', 'default', 'write_if')
+
+    def __init__(self, ui_key, path, kind, default=None, write_if=None):
+        keys = tuple(path.split('.'))
+        parse, fmt, missing_value = FIELD_KINDS[kind]
+        self.ui_key = ui_key
+        self.path = path
+        self.parent_keys = keys[:-1]
+        self.leaf = keys[-1]
+        self.parse = parse
+        self.format = fmt
+        self.missing_value = default if missing_value is None else missing_value
+        self.default = default
+        self.write_if = write_if
+
+    def _parent(self, data):
+        for key in self.parent_keys:
+            if not isinstance(data, dict):
+                return None
+            data = data.get(key)
+        return data if isinstance(data, dict) else None
+
+    def get(self, data):
+        """读取JSON中的原始值，路径不存在时返回 MISSING"""
+        parent = self._parent(data)
+        if parent is None or self.leaf not in parent:
+            return MISSING
+        return parent[self.leaf]
+
+    def set(self, data, value):
+        """写入JSON，父路径不存在时跳过并返回False"""
+        parent = self._parent(data)
+        if parent is None:
+            return False
+        parent[self.leaf] = value
+        return True
+
+
+def compile_schema(fields):
+    """把字段表编译成访问器列表"""
+    return [FieldAccessor(*field) for field in fields]
+
+
+USER_INPUT_ACCESSORS = compile_schema(USER_INPUT_FIELDS)
+ACCESSORS_BY_UI_KEY = {accessor.ui_key: accessor for accessor in USER_INPUT_ACCESSORS}
+ACCESSORS_BY_PATH = {accessor.path: accessor for accessor in USER_INPUT_ACCESSORS}
+
+
+def apply_ui_data(user_input_data, project_data, accessors=USER_INPUT_ACCESSORS):
+    """把界面数据写入 User_input.json 结构"""
+    for accessor in accessors:
+        if accessor.write_if and not project_data.get(accessor.write_if):
+            continue
+        value = accessor.parse(project_data.get(accessor.ui_key, accessor.default))
+        if value is INVALID:
+            continue
+        accessor.set(user_input_data, value)
+
+
+def extract_ui_data(user_input_data, accessors=USER_INPUT_ACCESSORS):
+    """从 User_input.json 结构提取界面数据"""
+    ui_data = {}
+    for accessor in accessors:
+        value = accessor.get(user_input_data)
+        if value is MISSING:
+            ui_data[accessor.ui_key] = accessor.missing_value
+        else:
+            ui_data[accessor.ui_key] = accessor.format(value)
+    return ui_data
+
+
+def get_value(user_input_data, path, default=None):
+    """按点分路径读取 User_input.json 中的值"""
+    accessor = ACCESSORS_BY_PATH.get(path)
+    if accessor is None:
+        accessor = FieldAccessor(path, path, 'text')
+    value = accessor.get(user_input_data)
+    return default if value is MISSING or value is None else value
@@ -0,0 +1,237 @@
+import numpy as np
+
+from financial_inputs import FinancialInputs, OPTIMAL_DISPATCH
+from debt_service import DEBT_SERVICE_ITEMS, schedule_from_inputs
+import asset_schedule
+from energy_accounts import EnergyFlows, EnergyAccounts, SALES_ITEMS
+from cost_builder import CostStatement, OPERATING_COST_ITEMS
+from mass_balance import MassBalance
+from indicator_calculators import compute_indicators
+from dispatch_optimizer import optimal_series
+from tax_engine import value_added_tax, income_tax
+
+# 输出表格数值保留的小数位数
+TABLE_DECIMALS = 4
+
+
+def year_header(years, first_year=1):
+    """输出表格表头：方案、项目和各年份"""
+    return ["方案", "项目"] + [f"第{year}年" for year in range(first_year, first_year + years)]
+
+
+def scheme_table(items, arrays, first_year=1):
+    """把各项 (方案数, 年数) 数组整理为输出表格行：每个方案依次列出各项
+
+    数值在一次 tolist 中转换，不逐行构建中间对象。first_year 为第一列的年份，
+    含建设期的表格为0。
+    """
+    block = np.round(np.stack(arrays, axis=1), TABLE_DECIMALS)   # (方案数, 项目数, 年数)
+    schemes, count, years = block.shape
+    values = block.reshape(schemes * count, years).tolist()
+    labels = [[f"方案{s + 1}", item] for s in range(schemes) for item in items]
+    return [year_header(years, first_year)] + [label + row for label, row in zip(labels, values)]
+
+
+class FinancialModel:
+    """项目财务计算：各部分结果在第一次使用时计算并缓存，全部以 (方案数, 年数) 数组表示
+
+    series 和 prices 为逐时数据和逐时价格（见 EnergyAccounts），不提供时不计能源收支；
+    调度方式为优化调度时，电网、外部氢源和储能充放由 DispatchOptimizer 求解后替换。
+    flows 为之前计算的 EnergyFlows，时序数据和拓扑选择未变时直接使用。
+    """
+
+    def __init__(self, inputs, series=None, prices=None, flows=None):
+        self.inputs = inputs
+        self.input_series = series or {}
+        self.prices = prices or {}
+        self._previous_flows = flows
+        self._cache = {}
+
+    @classmethod
+    def from_user_input(cls, user_input_data, series=None, prices=None, flows=None):
+        """从 User_input.json 数据创建财务模型"""
+        return cls(FinancialInputs(user_input_data), series, prices, flows)
+
+    def _cached(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    @property
+    def debt(self):
+        """还本付息计划（万元）"""
+        return self._cached('debt', lambda: schedule_from_inputs(self.inputs))
+
+    @property
+    def assets(self):
+        """设备折旧、更换投资和期末余值（万元）"""
+        return self._cached('assets', lambda: asset_schedule.schedule_from_inputs(self.inputs))
+
+    @property
+    def series(self):
+        """参与计算的时序数据，优化调度时为调度结果"""
+        def compute():
+            if self.inputs.dispatch_mode == OPTIMAL_DISPATCH:
+                return optimal_series(self.inputs, self.input_series, self.prices)
+            return self.input_series
+        return self._cached('series', compute)
+
+    @property
+    def flows(self):
+        """逐时能源买卖量，与价格无关"""
+        def compute():
+            previous = self._previous_flows
+            if previous is not None and previous.key == EnergyFlows.cache_key(self.inputs, self.series):
+                return previous
+            return EnergyFlows(self.inputs, self.series)
+        return self._cached('flows', compute)
+
+    @property
+    def balance(self):
+        """逐时电、氢、氧平衡"""
+        return self._cached('balance', lambda: MassBalance(self.inputs, self.series))
+
+    def computed_balance(self):
+        """已经计算的逐时平衡，所选指标未用到时为None（不为缺额说明单独计算）"""
+        return self._cache.get('balance')
+
+    def balance_notes(self):
+        """缺额说明，只在所选指标已计算逐时平衡时给出"""
+        balance = self.computed_balance()
+        return balance.shortfalls() if balance is not None else []
+
+    @property
+    def energy(self):
+        """第1年价格水平下的年度能源收支（万元）"""
+        return self._cached('energy', lambda: EnergyAccounts(self.flows, self.prices))
+
+    @property
+    def costs(self):
+        """各项经营成本（万元）"""
+        return self._cached('costs', lambda: CostStatement(self.inputs, self.energy))
+
+    def _annual(self, values):
+        """把第1年的数值 (方案数,) 按通胀系数展开为 (方案数, 年数)"""
+        return np.asarray(values, dtype=np.float64)[:, None] * self.inputs.escalation()
+
+    def sales_items(self):
+        """各项销售收入，按 SALES_ITEMS 的顺序"""
+        return self._cached('sales_items', lambda: [self._annual(self.energy.amounts[name])
+                                                   for name, _, _ in SALES_ITEMS])
+
+    @property
+    def revenue(self):
+        """营业收入（不含税）"""
+        return self._cached('revenue', lambda: sum(self.sales_items()))
+
+    @property
+    def purchases(self):
+        """外购能源费用（不含税）"""
+        return self.costs.purchases
+
+    @property
+    def operating_cost(self):
+        """经营成本"""
+        return self.costs.operating_cost
+
+    @property
+    def depreciation(self):
+        """折旧费"""
+        return self.assets.depreciation
+
+    @property
+    def total_cost(self):
+        """总成本费用：经营成本、折旧和利息支出"""
+        return self._cached('total_cost',
+                            lambda: self.operating_cost + self.depreciation + self.debt.interest)
+
+    @property
+    def vat(self):
+        """增值税及附加，设备投资的进项税（投资按含税价）作为第1年初的留抵税额，
+        设备更换的进项税在更换当年抵减应纳增值税"""
+        def compute():
+            rate = self.inputs.vat_rate
+            equipment_input = self.inputs.equipment_investment() * rate / (1.0 + rate)
+            return value_added_tax(self.revenue, self.purchases, rate, self.inputs.surcharge_rate,
+                                   equipment_input, self.assets.replacement_vat)
+        return self._cached('vat', compute)
+
+    @property
+    def profit(self):
+        """利润总额"""
+        return self._cached('profit', lambda: self.revenue - self.total_cost - self.vat.surcharge)
+
+    @property
+    def income_tax(self):
+        """企业所得税（含亏损结转）"""
+        return self._cached('income_tax', lambda: income_tax(self.profit, self.inputs.income_tax_rate))
+
+    @property
+    def net_profit(self):
+        """净利润"""
+        return self._cached('net_profit', lambda: self.profit - self.income_tax.tax)
+
+    def cash_flows(self):
+        """项目投资现金流量 (方案数, 年数+1)，第0列为建设期，返回 {项目: 数组}"""
+        def compute():
+            def with_construction(values, construction=None):
+                first = np.zeros(values.shape[0]) if construction is None else construction
+                return np.column_stack([first, values])
+            zeros = np.zeros_like(self.revenue)
+            vat = self.vat
+            residual = with_construction(self.assets.residual)
+            inflow = with_construction(self.revenue + vat.output) + residual
+            outflows = {
+                "建设投资": with_construction(zeros, self.inputs.initial_investment()),
+                "更新改造投资": with_construction(self.assets.replacement),
+                "经营成本": with_construction(self.operating_cost),
+                "进项税额": with_construction(vat.input),
+                "应纳增值税": with_construction(vat.payable),
+                "增值税附加": with_construction(vat.surcharge),
+                "所得税": with_construction(self.income_tax.tax),
+            }
+            flows = {"现金流入": inflow, "销售收入": with_construction(self.revenue),
+                     "销项税额": with_construction(vat.output), "回收固定资产余值": residual,
+                     "现金流出": sum(outflows.values())}
+            flows.update(outflows)
+            flows["净现金流量"] = inflow - flows["现金流出"]
+            flows["累计净现金流量"] = np.cumsum(flows["净现金流量"], axis=1)
+            return flows
+        return self._cached('cash_flows', compute)
+
+    def profit_table(self):
+        """利润表"""
+        tax = self.income_tax
+        items = ["营业收入"] + [name for name, _, _ in SALES_ITEMS] + [
+            "总成本费用", "增值税附加", "利润总额", "弥补以前年度亏损", "应纳税所得额", "所得税", "净利润"]
+        arrays = [self.revenue] + self.sales_items() + [
+            self.total_cost, self.vat.surcharge, self.profit, tax.loss_offset, tax.taxable, tax.tax,
+            self.net_profit]
+        return scheme_table(items, arrays)
+
+    def cost_table(self):
+        """成本费用表"""
+        items = [name for name, _ in OPERATING_COST_ITEMS] + ["经营成本", "折旧费", "利息支出", "总成本费用"]
+        arrays = self.costs.arrays() + [self.operating_cost, self.depreciation, self.debt.interest,
+                                        self.total_cost]
+        return scheme_table(items, arrays)
+
+    def cash_flow_table(self):
+        """现金流量表（项目投资，融资前），第0年为建设期"""
+        flows = self.cash_flows()
+        return scheme_table(list(flows), list(flows.values()), first_year=0)
+
+    def debt_service_table(self):
+        """还本付息表"""
+        return scheme_table([name for name, _ in DEBT_SERVICE_ITEMS], self.debt.arrays())
+
+    def indicators(self, codes=None):
+        """计算指定编码（默认全部可计算）的指标 {指标编码: 各方案数值}"""
+        return compute_indicators(self, codes)
+
+    def output_tables(self):
+        """生成输出表格，返回 {表格名称: 行列表}"""
+        return {"利润表": self.profit_table(),
+                "成本费用表": self.cost_table(),
+                "现金流量表": self.cash_flow_table(),
+                "还本付息表": self.debt_service_table()}
@@ -0,0 +1,223 @@
+import copy
+import numpy as np
+
+from field_schema import ACCESSORS_BY_UI_KEY, get_value
+from project_store import TIMESERIES_SELECTION
+from series_parser import HOURS_PER_YEAR
+
+# 还款方式
+EQUAL_INSTALLMENT = "等额本息"
+EQUAL_PRINCIPAL = "等额本金"
+REPAYMENT_METHODS = (EQUAL_INSTALLMENT, EQUAL_PRINCIPAL)
+
+# 调度方式：规则调度按固定优先级逐时平衡，优化调度按分时电价求解线性规划（需要 scipy）
+RULE_DISPATCH = "规则调度"
+OPTIMAL_DISPATCH = "优化调度"
+DISPATCH_MODES = (RULE_DISPATCH, OPTIMAL_DISPATCH)
+
+# 未填写贷款期限时使用的默认值（年）
+DEFAULT_LOAN_TERM = 10
+
+# 设备: (User_input.json 分区, 配置容量参数名称)
+DEVICE_SECTIONS = {
+    'WT': "风力发电总装机",
+    'PV': "光伏机组总装机",
+    'EL': "电解槽配置容量",
+    'HES': "氢储能装置配置容量",
+    'HFC': "燃料电池配置容量",
+    'ESS': "蓄电池配置容量",
+}
+
+# 逐时数据分块处理的块长（小时）
+CHUNK_HOURS = 730
+
+# 电解槽每产1kg氢气消耗的电量（kWh/kg）
+DEFAULT_EL_CONVERSION = 33.4
+
+POWER_ELECTRONICS_NAME = "电力电子接口装置成本设备成本的比例"
+
+
+class FinancialInputError(ValueError):
+    """项目参数不足以进行财务计算"""
+
+
+def _number(data, path, default=None):
+    value = get_value(data, path)
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else default
+
+
+def _flag(data, path, default=True):
+    value = get_value(data, path)
+    return default if value is None else bool(value)
+
+
+def _percent(data, path, default=0.0):
+    """读取百分比参数并转换为小数"""
+    value = _number(data, path)
+    return default if value is None else value / 100.0
+
+
+def input_series(inputs, series, name):
+    """取出参与计算的逐时数据 (小时数, 1或方案数)，未选择或未提供时返回None；
+    单列数据不展开，参与运算时按广播用于全部方案"""
+    values = series.get(name) if name in inputs.selected_series else None
+    if values is None:
+        return None
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    hours, schemes = values.shape
+    if hours != HOURS_PER_YEAR:
+        raise FinancialInputError(f"{name} 有 {hours} 行，应为 {HOURS_PER_YEAR} 行逐时数据")
+    if schemes not in (1, inputs.scheme_count):
+        raise FinancialInputError(f"{name} 有 {schemes} 列，应与方案个数 {inputs.scheme_count} 一致")
+    return values
+
+
+def selected_series(inputs, series, name):
+    """取出参与计算的逐时数据 (小时数, 方案数)：未选择或未提供时为全0，单列数据展开到全部方案；
+    只需要逐时运算或求和时用 input_series，避免展开"""
+    values = input_series(inputs, series, name)
+    if values is None:
+        return np.zeros((HOURS_PER_YEAR, inputs.scheme_count))
+    if values.shape[1] != inputs.scheme_count:
+        values = np.repeat(values, inputs.scheme_count, axis=1)
+    return values
+
+
+def hour_chunks(hours=HOURS_PER_YEAR, chunk=CHUNK_HOURS):
+    """按 chunk 小时分块的切片，逐块处理时每块的临时数组不超过 (块长, 方案数)"""
+    return [slice(start, min(start + chunk, hours)) for start in range(0, hours, chunk)]
+
+
+def subset_series(series, schemes):
+    """取出时序数据中 schemes 对应的列，单列数据（用于全部方案）保持不变"""
+    subset = {}
+    for name, values in series.items():
+        if values is not None and np.ndim(values) == 2 and np.shape(values)[1] > 1:
+            values = values[:, schemes]
+        subset[name] = values
+    return subset
+
+
+class DeviceInputs:
+    """单个设备的财务参数，容量为各方案数组"""
+
+    __slots__ = ('code', 'selected', 'capacity', 'unit_investment', 'unit_maintenance',
+                 'residual_ratio', 'lifetime', 'power_electronics_ratio')
+
+    def __init__(self, code, data, scheme_count):
+        self.code = code
+        self.selected = _flag(data, f"{code}.设备选择状态", False)
+        capacity = get_value(data, f"{code}.{DEVICE_SECTIONS[code]}.数值")
+        self.capacity = np.zeros(scheme_count)
+        if self.selected and capacity is not None:
+            values = np.atleast_1d(np.asarray(capacity, dtype=np.float64))
+            if len(values) == 1:
+                values = np.repeat(values, scheme_count)
+            if len(values) != scheme_count:
+                raise FinancialInputError(
+                    f"{code} 配置容量有 {len(values)} 个数值，应与方案个数 {scheme_count} 一致")
+            self.capacity = values
+        self.unit_investment = _number(data, f"{code}.单位容量投资成本.数值", 0.0)
+        self.unit_maintenance = _number(data, f"{code}.单位容量维护成本.数值", 0.0)
+        self.residual_ratio = _percent(data, f"{code}.单位容量残值系数.数值")
+        self.lifetime = _number(data, f"{code}.设备使用寿命.数值")
+        self.power_electronics_ratio = 0.0
+        if _flag(data, f"{code}.{POWER_ELECTRONICS_NAME}.选择状态"):
+            self.power_electronics_ratio = _percent(data, f"{code}.{POWER_ELECTRONICS_NAME}.数值")
+
+    def investment(self):
+        """各方案的设备投资（元），含电力电子接口装置成本"""
+        return self.capacity * self.unit_investment * (1.0 + self.power_electronics_ratio)
+
+
+class FinancialInputs:
+    """从 User_input.json 数据中一次性提取财务计算所需的参数，比例均已换算为小数"""
+
+    def __init__(self, user_input_data):
+        data = user_input_data
+        scheme_count = _number(data, "项目基本信息.方案个数.数值")
+        project_life = _number(data, "项目基本信息.项目生命周期.数值")
+        if not scheme_count or scheme_count < 1:
+            raise FinancialInputError("请先填写评估方案数")
+        if not project_life or project_life < 1:
+            raise FinancialInputError("请先填写项目生命周期")
+        self.scheme_count = int(scheme_count)
+        self.project_life = int(project_life)
+        self.project_people = _number(data, "项目基本信息.项目人数.数值", 0.0)
+
+        # 财税与融资参数
+        self.vat_rate = _percent(data, "财税与融资参数.增值税率.数值")
+        self.income_tax_rate = _percent(data, "财税与融资参数.企业所得税率.数值")
+        self.surcharge_rate = _percent(data, "财税与融资参数.增值税附加税率.数值")
+        self.equity_ratio = _percent(data, "财税与融资参数.自有资金比例.数值", 1.0)
+        self.loan_rate = _percent(data, "财税与融资参数.贷款利率.数值")
+        self.loan_term = int(_number(data, "财税与融资参数.贷款期限.数值", DEFAULT_LOAN_TERM))
+        self.grace_period = int(_number(data, "财税与融资参数.宽限期.数值", 0))
+        method = get_value(data, "财税与融资参数.还款方式.数值")
+        self.repayment_method = method if method in REPAYMENT_METHODS else EQUAL_INSTALLMENT
+
+        # 财务分析参数
+        self.discount_rate = _percent(data, "财务分析参数.名义贴现率.数值")
+        self.inflation_rate = 0.0
+        if _flag(data, "财务分析参数.预期通货膨胀率.选择状态"):
+            self.inflation_rate = _percent(data, "财务分析参数.预期通货膨胀率.数值")
+        mode = get_value(data, "财务分析参数.调度方式.数值")
+        self.dispatch_mode = mode if mode in DISPATCH_MODES else RULE_DISPATCH
+
+        # 成本参数（万元）
+        self.site_cost = 0.0
+        if _flag(data, "成本参数.场地购置费用.选择状态"):
+            self.site_cost = _number(data, "成本参数.场地购置费用.数值", 0.0)
+        self.construction_cost = 0.0
+        if _flag(data, "成本参数.工程施工费用.选择状态"):
+            self.construction_cost = _number(data, "成本参数.工程施工费用.数值", 0.0)
+        self.personnel_cost = 0.0      # 元/年·人
+        if _flag(data, "成本参数.年人员费用.选择状态"):
+            self.personnel_cost = _number(data, "成本参数.年人员费用.数值", 0.0)
+        # 电解槽能量转化系数（kWh/kg）
+        self.el_conversion = _number(data, "EL.能量转化系数.数值", DEFAULT_EL_CONVERSION)
+        if self.el_conversion <= 0:
+            raise FinancialInputError("电解槽能量转化系数应大于0")
+        self.ess_efficiency = _percent(data, "ESS.蓄电池充放电效率.数值", 1.0)
+        self.ess_operation_cost = 0.0  # 元/kWh 充放电量
+        if _flag(data, "ESS.蓄电池单位运行成本.选择状态"):
+            self.ess_operation_cost = _number(data, "ESS.蓄电池单位运行成本.数值", 0.0)
+
+        self.devices = {code: DeviceInputs(code, data, self.scheme_count) for code in DEVICE_SECTIONS}
+
+        # 拓扑中已选择的设备和负荷对应的时序数据名称
+        self.selected_series = set()
+        for name, ui_key in TIMESERIES_SELECTION.items():
+            accessor = ACCESSORS_BY_UI_KEY[ui_key]
+            if _flag(data, accessor.path, accessor.default):
+                self.selected_series.add(name)
+
+    def subset(self, schemes):
+        """只包含 schemes（方案序号数组）的参数副本，用于分块计算"""
+        schemes = np.asarray(schemes, dtype=np.intp)
+        inputs = copy.copy(self)
+        inputs.scheme_count = len(schemes)
+        inputs.devices = {}
+        for code, device in self.devices.items():
+            device = copy.copy(device)
+            device.capacity = device.capacity[schemes]
+            inputs.devices[code] = device
+        return inputs
+
+    def escalation(self):
+        """各年价格相对第1年的通胀系数 (年数,)"""
+        return (1.0 + self.inflation_rate) ** np.arange(self.project_life, dtype=np.float64)
+
+    def equipment_investment(self):
+        """各方案的设备投资合计（万元）"""
+        return sum(device.investment() for device in self.devices.values()) / 10000.0
+
+    def initial_investment(self):
+        """各方案的初始投资（万元）：设备投资加场地购置和工程施工费用"""
+        return self.equipment_investment() + self.site_cost + self.construction_cost
+
+    def loan_principal(self):
+        """各方案的贷款本金（万元）：初始投资中自有资金以外的部分"""
+        return self.initial_investment() * (1.0 - self.equity_ratio)
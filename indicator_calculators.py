@@ -0,0 +1,132 @@
+import numpy as np
+
+from indicator_registry import INDICATORS
+from financial_inputs import input_series, CHUNK_HOURS
+from energy_accounts import GRID_SERIES, EXTERNAL_HYDROGEN_SERIES, ESS_SERIES
+from mass_balance import WT_SERIES, PV_SERIES, HES_SERIES
+
+DAYS_PER_YEAR = 365
+
+# 指标编码 -> func(FinancialModel) 返回各方案数值
+INDICATOR_CALCULATORS = {}
+
+
+def register_calculator(code, func):
+    """注册指标计算方法，func(FinancialModel) 返回各方案数值 (方案数,)"""
+    if code in INDICATOR_CALCULATORS:
+        raise ValueError(f"指标计算方法已存在: {code}")
+    INDICATOR_CALCULATORS[code] = func
+    return func
+
+
+def chunked_sum(func, *arrays, chunk=CHUNK_HOURS):
+    """按小时分块计算 func(各数组的同一块) 并沿小时求和，返回 (列数,)；
+    不生成与全年逐时数据同样大小的中间数组。单列数据的结果为 (1,)，与各方案数组运算时按广播"""
+    hours = arrays[0].shape[0]
+    total = 0.0
+    for start in range(0, hours, chunk):
+        total = total + func(*(values[start:start + chunk] for values in arrays)).sum(axis=0)
+    return total
+
+
+def _series(model, name):
+    """参与计算的逐时数据 (小时数, 1或方案数)，未选择或未提供时返回None；单列数据不展开"""
+    return input_series(model.inputs, model.series, name)
+
+
+def _imported_energy(model):
+    """从外部电网购入的电量加外部氢源购入氢气折算的电量（kWh）(方案数,)"""
+    imported = np.zeros(model.inputs.scheme_count)
+    grid = _series(model, GRID_SERIES)
+    if grid is not None:
+        imported = imported + chunked_sum(lambda g: np.maximum(-g, 0.0), grid)
+    hydrogen = _series(model, EXTERNAL_HYDROGEN_SERIES)
+    if hydrogen is not None:
+        imported = imported + chunked_sum(lambda h: np.maximum(-h, 0.0), hydrogen) * model.inputs.el_conversion
+    return imported
+
+
+def _renewable_generation(model):
+    """风电和光伏的全年发电量（kWh）(方案数,)"""
+    total = np.zeros(model.inputs.scheme_count)
+    for name in (WT_SERIES, PV_SERIES):
+        values = _series(model, name)
+        if values is not None:
+            total = total + values.sum(axis=0)
+    return total
+
+
+def _renewable_used(model):
+    """风电和光伏扣除弃电后的发电量（kWh）"""
+    return np.maximum(_renewable_generation(model) - model.balance.totals['curtailment'], 0.0)
+
+
+def _ratio(numerator, denominator):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, numerator / denominator, 0.0)
+
+
+def energy_supply_ratio(model):
+    """B1 能源网供应占比（%）：外部电网和外部氢源供应的能量占总供能的比例"""
+    imported = _imported_energy(model)
+    return _ratio(imported, imported + _renewable_used(model)) * 100.0
+
+
+def _storage_utilization(model, code, name, discharged):
+    """全年放出量与每天满充满放一次的放出量之比（%），每天超过一次满充满放的按100%计"""
+    device = model.inputs.devices[code]
+    if discharged is None:
+        flow = _series(model, name)
+        if flow is None:
+            return np.zeros(model.inputs.scheme_count)
+        discharged = chunked_sum(lambda f: np.maximum(f, 0.0), flow)
+    return np.minimum(_ratio(discharged, device.capacity * DAYS_PER_YEAR) * 100.0, 100.0)
+
+
+def battery_utilization(model):
+    """B2 电储能利用水平（%）：全年放电量与每天满充满放一次的放电量之比，上限100%"""
+    return _storage_utilization(model, 'ESS', ESS_SERIES, model.balance.ess_discharged)
+
+
+def hydrogen_utilization(model):
+    """B3 氢储能利用水平（%）：全年放氢量与每天满充满放一次的放氢量之比，上限100%"""
+    return _storage_utilization(model, 'HES', HES_SERIES, model.balance.hes_discharged)
+
+
+def equivalent_hours(model):
+    """B4 等效可利用小时数：风电和光伏扣除弃电后的发电量除以总装机"""
+    devices = model.inputs.devices
+    capacity = sum(devices[code].capacity for code in ('WT', 'PV') if devices[code].selected)
+    return _ratio(_renewable_used(model), np.broadcast_to(capacity, (model.inputs.scheme_count,)))
+
+
+def renewable_ratio(model):
+    """C1 可再生能源供应占比（%）：扣除弃电后的风光发电量占总供能的比例"""
+    renewable = _renewable_used(model)
+    return _ratio(renewable, renewable + _imported_energy(model)) * 100.0
+
+
+def _cost_indicator(code):
+    return lambda model: model.costs.indicators(model.inputs)[code]
+
+
+for _code in ("A1", "A2", "A3"):
+    register_calculator(_code, _cost_indicator(_code))
+register_calculator("B1", energy_supply_ratio)
+register_calculator("B2", battery_utilization)
+register_calculator("B3", hydrogen_utilization)
+register_calculator("B4", equivalent_hours)
+register_calculator("C1", renewable_ratio)
+
+
+def compute_indicators(model, codes=None):
+    """计算指定编码（默认全部已注册）的指标，返回 {指标编码: 各方案数值}；
+    没有计算方法的编码跳过"""
+    codes = INDICATOR_CALCULATORS if codes is None else codes
+    return {code: INDICATOR_CALCULATORS[code](model) for code in codes if code in INDICATOR_CALCULATORS}
+
+
+def selected_codes(indicator_system_data):
+    """IndicatorSystem.json 中选择状态为真的指标编码"""
+    return [definition.code for definition, info in INDICATORS.entries(indicator_system_data)
+            if info.get("选择状态")]
@@ -6,8 +6,11 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
                              QStackedWidget, QButtonGroup)
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont, QIcon
+from resource_manager import get_resources, set_style_class
+from bulk_update import BulkUpdateMixin
+from indicator_registry import INDICATORS, INDICATOR_CATEGORIES
 
-class IndicatorManagementPage(QWidget):
+class IndicatorManagementPage(BulkUpdateMixin, QWidget):
     """指标管理页面"""
     
     data_updated = pyqtSignal()  # 数据更新信号
@@ -20,24 +23,8 @@ class IndicatorManagementPage(QWidget):
     
     def load_icons(self):
         """加载图标资源"""
-        self.icons = {}
-        icons_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons")
-        
-        print(f"指标管理页面 - 图标目录路径: {icons_dir}")  # 调试信息
-        
-        icon_files = {
-            'indicator_management': '指标管理.svg'
-        }
-        
-        for key, filename in icon_files.items():
-            icon_path = os.path.join(icons_dir, filename)
-            print(f"指标管理页面 - 尝试加载图标: {icon_path}")  # 调试信息
-            if os.path.exists(icon_path):
-                self.icons[key] = QIcon(icon_path)
-                print(f"指标管理页面 - 成功加载图标: {key}")  # 调试信息
-            else:
-                self.icons[key] = QIcon()
-                print(f"指标管理页面 - 图标文件不存在: {icon_path}")  # 调试信息
+        self.resources = get_resources()
+        self.icons = self.resources.icons('indicator_management')
 
     def init_ui(self):
         """初始化用户界面"""
@@ -57,188 +44,55 @@ class IndicatorManagementPage(QWidget):
         content_widget_layout = QVBoxLayout(content_widget)
         content_widget_layout.setSpacing(20)
         
-        # 创建各个指标组
-        self.create_financial_indicators(content_widget_layout)
-        self.create_technical_indicators(content_widget_layout)
-        self.create_environmental_indicators(content_widget_layout)
+        # 按指标注册表创建各个指标组
+        self.indicator_checkboxes = {}
+        for category, _ in INDICATOR_CATEGORIES:
+            self.create_indicator_group(category, content_widget_layout)
         
         # 创建更新数据按钮
         self.create_update_button(content_widget_layout)
         
+        # 共享样式在页面级别统一设置
+        self.setStyleSheet(self.resources.page_style(
+            'indicator_group', 'detail_button', 'primary_button', 'icon_label'))
+        
         scroll_area.setWidget(content_widget)
         main_layout.addWidget(scroll_area)
     
-    def create_financial_indicators(self, parent_layout):
-        """创建财务效益指标组"""
-        group = QGroupBox("财务效益指标")
-        group.setFont(QFont("微软雅黑", 10, QFont.Bold))
-        group.setStyleSheet("""
-            QGroupBox {
-                border: 2px solid #cccccc;
-                border-radius: 5px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 20px;
-                padding: 0 10px 0 10px;
-            }
-        """)
-        
-        layout = QGridLayout(group)
-        layout.setSpacing(10)
-        layout.setContentsMargins(20, 20, 20, 20)
-        
-        # 创建指标项
-        indicators = [
-            ("初始投资成本", "initial_investment"),
-            ("内部收益率IRR", "irr"),
-            ("投资回收期DPP", "dpp"),
-            ("净现值NPV", "npv"),
-            ("年运维成本", "annual_maintenance"),
-            ("能源外购成本", "energy_purchase")
-        ]
-        
-        row = 0
-        for indicator_name, indicator_id in indicators:
-            # 复选框
-            checkbox = QCheckBox()
-            checkbox.setChecked(True)
-            checkbox.setObjectName(f"checkbox_{indicator_id}")
-            layout.addWidget(checkbox, row, 0)
-            
-            # 指标名称
-            label = QLabel(indicator_name)
-            label.setFont(QFont("微软雅黑", 9))
-            layout.addWidget(label, row, 1)
-            
-            # 指标详情按钮
-            detail_btn = QPushButton("指标详情")
-            detail_btn.setObjectName(f"detail_{indicator_id}")
-            detail_btn.setFixedWidth(120)
-            detail_btn.setStyleSheet(self.get_detail_button_style())
-            detail_btn.clicked.connect(lambda checked, ind=indicator_name: self.show_indicator_detail(ind))
-            layout.addWidget(detail_btn, row, 2)
-            
-            row += 1
-        
-        # 设置列宽比例
-        layout.setColumnStretch(0, 1)
-        layout.setColumnStretch(1, 4)
-        layout.setColumnStretch(2, 2)
-        
-        parent_layout.addWidget(group)
-    
-    def create_technical_indicators(self, parent_layout):
-        """创建技术效益指标组"""
-        group = QGroupBox("技术效益指标")
-        group.setFont(QFont("微软雅黑", 10, QFont.Bold))
-        group.setStyleSheet("""
-            QGroupBox {
-                border: 2px solid #cccccc;
-                border-radius: 5px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 20px;
-                padding: 0 10px 0 10px;
-            }
-        """)
+    def create_indicator_group(self, category, parent_layout):
+        """创建指标组，指标项来自指标注册表"""
+        definitions = INDICATORS.in_category(category)
+        if not definitions:
+            return
         
-        layout = QGridLayout(group)
-        layout.setSpacing(10)
-        layout.setContentsMargins(20, 20, 20, 20)
-        
-        # 创建指标项
-        indicators = [
-            ("能源网供应占比", "energy_supply_ratio"),
-            ("电储能利用水平", "battery_utilization"),
-            ("氢储能利用水平", "hydrogen_utilization"),
-            ("等效可利用小时数", "equivalent_hours")
-        ]
-        
-        row = 0
-        for indicator_name, indicator_id in indicators:
-            # 复选框
-            checkbox = QCheckBox()
-            checkbox.setChecked(True)
-            checkbox.setObjectName(f"checkbox_{indicator_id}")
-            layout.addWidget(checkbox, row, 0)
-            
-            # 指标名称
-            label = QLabel(indicator_name)
-            label.setFont(QFont("微软雅黑", 9))
-            layout.addWidget(label, row, 1)
-            
-            # 指标详情按钮
-            detail_btn = QPushButton("指标详情")
-            detail_btn.setObjectName(f"detail_{indicator_id}")
-            detail_btn.setFixedWidth(120)
-            detail_btn.setStyleSheet(self.get_detail_button_style())
-            detail_btn.clicked.connect(lambda checked, ind=indicator_name: self.show_indicator_detail(ind))
-            layout.addWidget(detail_btn, row, 2)
-            
-            row += 1
-        
-        # 设置列宽比例
-        layout.setColumnStretch(0, 1)
-        layout.setColumnStretch(1, 4)
-        layout.setColumnStretch(2, 2)
-        
-        parent_layout.addWidget(group)
-    
-    def create_environmental_indicators(self, parent_layout):
-        """创建环境效益指标组"""
-        group = QGroupBox("环境效益指标")
+        group = QGroupBox(category)
         group.setFont(QFont("微软雅黑", 10, QFont.Bold))
-        group.setStyleSheet("""
-            QGroupBox {
-                border: 2px solid #cccccc;
-                border-radius: 5px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 20px;
-                padding: 0 10px 0 10px;
-            }
-        """)
+        set_style_class(group, "indicator")
         
         layout = QGridLayout(group)
         layout.setSpacing(10)
         layout.setContentsMargins(20, 20, 20, 20)
         
-        # 创建指标项
-        indicators = [
-            ("可再生能源供应占比", "renewable_ratio")
-        ]
-        
-        row = 0
-        for indicator_name, indicator_id in indicators:
+        for row, definition in enumerate(definitions):
             # 复选框
             checkbox = QCheckBox()
-            checkbox.setChecked(True)
-            checkbox.setObjectName(f"checkbox_{indicator_id}")
+            checkbox.setChecked(definition.default_selected)
+            checkbox.setObjectName(f"checkbox_{definition.ui_id}")
             layout.addWidget(checkbox, row, 0)
+            self.indicator_checkboxes[definition.ui_id] = checkbox
             
             # 指标名称
-            label = QLabel(indicator_name)
+            label = QLabel(definition.label)
             label.setFont(QFont("微软雅黑", 9))
             layout.addWidget(label, row, 1)
             
             # 指标详情按钮
             detail_btn = QPushButton("指标详情")
-            detail_btn.setObjectName(f"detail_{indicator_id}")
+            detail_btn.setObjectName(f"detail_{definition.ui_id}")
             detail_btn.setFixedWidth(120)
-            detail_btn.setStyleSheet(self.get_detail_button_style())
-            detail_btn.clicked.connect(lambda checked, ind=indicator_name: self.show_indicator_detail(ind))
+            set_style_class(detail_btn, "detail")
+            detail_btn.clicked.connect(lambda checked, ind=definition.label: self.show_indicator_detail(ind))
             layout.addWidget(detail_btn, row, 2)
-            
-            row += 1
         
         # 设置列宽比例
         layout.setColumnStretch(0, 1)
@@ -257,70 +111,30 @@ class IndicatorManagementPage(QWidget):
         update_layout.setSpacing(8)
         
         # 添加图标
-        if 'indicator_management' in self.icons and not self.icons['indicator_management'].isNull():
+        if self.resources.has_icon('indicator_management'):
             update_icon = QLabel()
-            update_icon.setPixmap(self.icons['indicator_management'].pixmap(24, 24))
+            update_icon.setPixmap(self.resources.pixmap('indicator_management', 24))
             update_icon.setAlignment(Qt.AlignCenter)
-            update_icon.setStyleSheet("QLabel { border: none; background: transparent; }")  # 去掉边框和背景
+            set_style_class(update_icon, "icon")  # 去掉边框和背景
             update_layout.addWidget(update_icon)
-            print("指标管理页面 - 已设置按钮图标")  # 调试信息
-        else:
-            print("指标管理页面 - 图标为空，未设置按钮图标")  # 调试信息
         
         self.update_btn = QPushButton("更新数据")
         self.update_btn.setMinimumSize(120, 35)
-        self.update_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 8px 16px;
-                font-size: 9pt;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
-            }
-            QPushButton:pressed {
-                background-color: #21618c;
-            }
-        """)
+        set_style_class(self.update_btn, "primary")
         self.update_btn.clicked.connect(self.update_data)
         update_layout.addWidget(self.update_btn)
         
         button_layout.addLayout(update_layout)
         parent_layout.addLayout(button_layout)
     
-    def get_detail_button_style(self):
-        """获取详情按钮样式"""
-        return """
-            QPushButton {
-                background-color: #ecf0f1;
-                color: #2c3e50;
-                border: 1px solid #bdc3c7;
-                border-radius: 3px;
-                padding: 5px 15px;
-                font-size: 9pt;
-            }
-            QPushButton:hover {
-                background-color: #d5dbdb;
-            }
-            QPushButton:pressed {
-                background-color: #aeb6bf;
-            }
-        """
-    
     def setup_connections(self):
         """设置信号连接"""
-        # 这里可以添加各个复选框状态变化的连接
-        for checkbox in self.findChildren(QCheckBox):
-            if checkbox.objectName().startswith("checkbox_"):
-                checkbox.toggled.connect(self.on_indicator_selection_changed)
+        for checkbox in self.indicator_checkboxes.values():
+            checkbox.toggled.connect(self.on_indicator_selection_changed)
     
     def on_indicator_selection_changed(self):
         """指标选择变化时的处理"""
-        self.data_updated.emit()
+        self.notify_data_changed()
     
     def show_indicator_detail(self, indicator_name):
         """显示指标详情"""
@@ -337,42 +151,30 @@ class IndicatorManagementPage(QWidget):
     
     def get_selected_indicators(self):
         """获取所有选中的指标"""
-        selected = []
-        
-        # 遍历所有复选框
-        for checkbox in self.findChildren(QCheckBox):
-            if checkbox.isChecked() and checkbox.objectName().startswith("checkbox_"):
-                indicator_id = checkbox.objectName().replace("checkbox_", "")
-                selected.append(indicator_id)
-        
-        return selected
+        return [indicator_id for indicator_id, checkbox in self.indicator_checkboxes.items()
+                if checkbox.isChecked()]
     
     def set_selected_indicators(self, indicators):
         """设置选中的指标"""
-        # 先取消所有选中
-        for checkbox in self.findChildren(QCheckBox):
-            if checkbox.objectName().startswith("checkbox_"):
-                checkbox.setChecked(False)
-        
-        # 设置指定的指标为选中
-        for indicator_id in indicators:
-            checkbox = self.findChild(QCheckBox, f"checkbox_{indicator_id}")
-            if checkbox:
-                checkbox.setChecked(True)
+        selected = set(indicators)
+        # 批量设置期间只在结束后发出一次更新信号
+        with self.bulk_update():
+            for indicator_id, checkbox in self.indicator_checkboxes.items():
+                checkbox.setChecked(indicator_id in selected)
     
     def get_indicator_data(self):
         """获取指标数据"""
-        return {
-            'selected_indicators': self.get_selected_indicators(),
-            'financial_indicators': ['initial_investment', 'irr', 'dpp', 'npv', 'annual_maintenance', 'energy_purchase'],
-            'technical_indicators': ['energy_supply_ratio', 'battery_utilization', 'hydrogen_utilization', 'equivalent_hours'],
-            'environmental_indicators': ['renewable_ratio']
-        }
+        data = {'selected_indicators': self.get_selected_indicators()}
+        for category, key in INDICATOR_CATEGORIES:
+            data[f'{key}_indicators'] = [d.ui_id for d in INDICATORS.in_category(category)]
+        return data
     
     def load_indicator_data(self, data):
         """加载指标数据"""
         if data and 'selected_indicators' in data:
-            self.set_selected_indicators(data['selected_indicators'])
+            # 数据来自磁盘，加载后无需回写
+            with self.bulk_update(emit=False):
+                self.set_selected_indicators(data['selected_indicators'])
 
 
 # 测试代码
@@ -0,0 +1,148 @@
+# 指标类别: (IndicatorSystem.json 中的类别名, 界面数据中的键前缀)
+INDICATOR_CATEGORIES = [
+    ("财务效益指标", "financial"),
+    ("技术效益指标", "technical"),
+    ("环境效益指标", "environmental")
+]
+
+# IndicatorSystem.json 中保存最近一次综合评估结果的键：{"赋权方法", "排序方法", "方案得分"}
+EVALUATION_RESULT_KEY = "综合评估结果"
+
+
+class IndicatorDefinition:
+    """指标定义，描述一个指标的编码、界面ID和元数据"""
+
+    __slots__ = ('code', 'ui_id', 'name', 'label', 'category', 'indicator_type',
+                 'unit', 'default_selected')
+
+    def __init__(self, code, ui_id, name, label, category, indicator_type, unit,
+                 default_selected=True):
+        self.code = code                          # 指标编码，如 A1
+        self.ui_id = ui_id                        # 界面ID，如 initial_investment
+        self.name = name                          # IndicatorSystem.json 中的指标名称
+        self.label = label                        # 界面显示名称
+        self.category = category                  # 所属类别
+        self.indicator_type = indicator_type      # 1 为效益型，-1 为成本型
+        self.unit = unit
+        self.default_selected = default_selected
+
+    def default_system_entry(self, selected=None):
+        """生成 IndicatorSystem.json 中的默认条目"""
+        return {
+            "指标编码": self.code, "指标类型": self.indicator_type, "单位": self.unit,
+            "选择状态": self.default_selected if selected is None else selected,
+            "数值": None, "规范化值": None, "综合评估得分分量": None,
+            "critic": None, "entropy": None, "demantel": None, "组合权值": None, "备注": ""
+        }
+
+
+class IndicatorRegistry:
+    """指标注册表，是指标编码、界面ID与元数据的唯一来源，支持双向O(1)查找"""
+
+    def __init__(self):
+        self._definitions = []
+        self._by_code = {}
+        self._by_id = {}
+        self._by_name = {}
+
+    def register(self, code, ui_id, name, label=None, category="财务效益指标",
+                 indicator_type=1, unit="-", default_selected=True):
+        """注册指标，编码或界面ID重复时抛出 ValueError"""
+        if code in self._by_code or ui_id in self._by_id:
+            raise ValueError(f"指标已存在: {code} / {ui_id}")
+        if category not in dict(INDICATOR_CATEGORIES):
+            raise ValueError(f"未知的指标类别: {category}")
+        definition = IndicatorDefinition(code, ui_id, name, label or name, category,
+                                         indicator_type, unit, default_selected)
+        self._definitions.append(definition)
+        self._by_code[code] = definition
+        self._by_id[ui_id] = definition
+        self._by_name[name] = definition
+        return definition
+
+    def __iter__(self):
+        return iter(self._definitions)
+
+    def __len__(self):
+        return len(self._definitions)
+
+    def by_code(self, code):
+        """按指标编码查找，不存在时返回None"""
+        return self._by_code.get(code)
+
+    def by_id(self, ui_id):
+        """按界面ID查找，不存在时返回None"""
+        return self._by_id.get(ui_id)
+
+    def by_name(self, name):
+        """按指标名称查找，不存在时返回None"""
+        return self._by_name.get(name)
+
+    def code_to_id(self, code):
+        """指标编码转界面ID"""
+        definition = self._by_code.get(code)
+        return definition.ui_id if definition else None
+
+    def id_to_code(self, ui_id):
+        """界面ID转指标编码"""
+        definition = self._by_id.get(ui_id)
+        return definition.code if definition else None
+
+    def in_category(self, category):
+        """获取某一类别下的全部指标"""
+        return [d for d in self._definitions if d.category == category]
+
+    def default_selected_ids(self):
+        """获取默认选中的指标界面ID"""
+        return [d.ui_id for d in self._definitions if d.default_selected]
+
+    def default_indicator_system(self):
+        """生成默认的 IndicatorSystem.json 数据"""
+        return {
+            category: {d.name: d.default_system_entry() for d in self.in_category(category)}
+            for category, _ in INDICATOR_CATEGORIES
+        }
+
+    def entries(self, indicator_system_data):
+        """遍历 IndicatorSystem.json 中已注册的指标，返回 (指标定义, 指标数据)"""
+        for indicators in indicator_system_data.values():
+            if not isinstance(indicators, dict):
+                continue
+            for indicator_info in indicators.values():
+                if isinstance(indicator_info, dict):
+                    definition = self._by_code.get(indicator_info.get("指标编码", ""))
+                    if definition:
+                        yield definition, indicator_info
+
+    def ensure_in_system(self, indicator_system_data):
+        """把注册表中缺失的指标（如新增的自定义指标）补充到 IndicatorSystem.json 数据中"""
+        existing = {info.get("指标编码") for _, info in self.entries(indicator_system_data)}
+        for definition in self._definitions:
+            if definition.code not in existing:
+                category = indicator_system_data.setdefault(definition.category, {})
+                category[definition.name] = definition.default_system_entry()
+
+
+INDICATORS = IndicatorRegistry()
+
+# 内置指标
+INDICATORS.register("A1", "initial_investment", "初始投资成本", "初始投资成本", "财务效益指标", -1, "万元")
+INDICATORS.register("A2", "annual_maintenance", "年运维成本", "年运维成本", "财务效益指标", -1, "万元")
+INDICATORS.register("A3", "energy_purchase", "能源外购成本", "能源外购成本", "财务效益指标", -1, "万元")
+INDICATORS.register("A4", "npv", "净现值", "净现值NPV", "财务效益指标", 1, "万元")
+INDICATORS.register("A5", "irr", "内部收益率", "内部收益率IRR", "财务效益指标", 1, "%")
+INDICATORS.register("A6", "dpp", "投资回收期", "投资回收期DPP", "财务效益指标", 1, "年")
+INDICATORS.register("B1", "energy_supply_ratio", "能源网供应占比", "能源网供应占比", "技术效益指标", -1, "%",
+                    default_selected=False)
+INDICATORS.register("B2", "battery_utilization", "电储能利用水平", "电储能利用水平", "技术效益指标", 1, "%")
+INDICATORS.register("B3", "hydrogen_utilization", "氢储能利用水平", "氢储能利用水平", "技术效益指标", 1, "%")
+INDICATORS.register("B4", "equivalent_hours", "等效可利用小时数", "等效可利用小时数", "技术效益指标", 1, "小时",
+                    default_selected=False)
+INDICATORS.register("C1", "renewable_ratio", "可再生能源供应占比", "可再生能源供应占比", "环境效益指标", 1, "%")
+
+
+def register_indicator(code, ui_id, name, label=None, category="财务效益指标",
+                       indicator_type=1, unit="-", default_selected=True):
+    """注册自定义指标，界面、持久化和评估都会自动包含该指标"""
+    return INDICATORS.register(code, ui_id, name, label, category, indicator_type,
+                               unit, default_selected)
@@ -1,11 +1,24 @@
 import sys
 import os
+import sqlite3
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QPushButton, QListWidget, QStackedWidget,
-                             QLabel, QFrame, QSizePolicy, QMessageBox, QFileDialog)
+                             QLabel, QFrame, QSizePolicy, QMessageBox, QFileDialog,
+                             QDialog, QProgressBar)
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QIcon
 from data_manager import DataManager
+from resource_manager import get_resources, set_style_class
+from indicator_registry import INDICATORS
+from workspace_catalog import WorkspaceCatalog
+from project_store import is_project_path
+from timeseries_import import supported_extensions
+from series_editor import SeriesEditorDialog
+from project_loader import ProjectLoader
+from evaluation_runner import EvaluationRunner
+from project_validation import ProjectValidator
+from financial_inputs import FinancialInputError
+from project_browser_dialog import ProjectBrowserDialog
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -13,34 +26,22 @@ class MainWindow(QMainWindow):
         self.data_manager = DataManager()
         self.project_design_page = None
         self.indicator_management_page = None
+        self.comprehensive_evaluation_page = None
+        self.workspace_catalog = None
+        self.project_loader = None
+        self.evaluation_runner = None
+        self.validator = ProjectValidator(self)
+        self.balance_notes = []     # 最近一次计算的电、氢、氧平衡缺额
         self.load_icons()  # 添加图标加载
         self.init_ui()
     
     def load_icons(self):
         """加载图标资源"""
-        self.icons = {}
-        icons_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons")
-        
-        print(f"图标目录路径: {icons_dir}")  # 调试信息
-        
-        icon_files = {
-            'new_project': '新建评估.svg',
-            'open_project': '打开评估文件.svg',
-            'project_design': '项目参数设计.svg',
-            'indicator_management': '指标管理.svg',
-            'evaluation': '综合评估.svg',
-            'help': '查看帮助文档.svg'
-        }
-        
-        for key, filename in icon_files.items():
-            icon_path = os.path.join(icons_dir, filename)
-            print(f"尝试加载图标: {icon_path}")  # 调试信息
-            if os.path.exists(icon_path):
-                self.icons[key] = QIcon(icon_path)
-                print(f"成功加载图标: {key}")  # 调试信息
-            else:
-                self.icons[key] = QIcon()  # 空图标
-                print(f"图标文件不存在: {icon_path}")  # 调试信息
+        self.resources = get_resources()
+        self.icons = self.resources.icons(
+            'new_project', 'open_project', 'project_design',
+            'indicator_management', 'evaluation', 'help'
+        )
 
     def init_ui(self):
         # 设置窗口基本属性
@@ -48,7 +49,7 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 100, 1000, 700)
         
         # 设置窗口图标
-        if 'evaluation' in self.icons and not self.icons['evaluation'].isNull():
+        if self.resources.has_icon('evaluation'):
             self.setWindowIcon(self.icons['evaluation'])
         
         # 创建中央部件
@@ -69,14 +70,19 @@ class MainWindow(QMainWindow):
         # 设置样式
         self.set_styles()
         
-        # 创建状态栏
+        # 创建状态栏，后台加载项目时显示进度
         self.statusBar()
+        self.load_progress = QProgressBar()
+        self.load_progress.setMaximumWidth(240)
+        self.load_progress.setTextVisible(True)
+        self.load_progress.hide()
+        self.statusBar().addPermanentWidget(self.load_progress)
     
     def create_top_toolbar(self, parent_layout):
         """创建顶部工具栏"""
         toolbar_frame = QFrame()
         toolbar_frame.setFrameStyle(QFrame.Box)
-        toolbar_frame.setStyleSheet("QFrame { border: 1px solid #ddd; background-color: #f5f5f5; }")
+        toolbar_frame.setObjectName("toolbarFrame")
         toolbar_frame.setMaximumHeight(100)  # 增加高度以容纳更大的图标
         
         toolbar_layout = QHBoxLayout(toolbar_frame)
@@ -88,11 +94,11 @@ class MainWindow(QMainWindow):
         new_eval_layout.setAlignment(Qt.AlignCenter)
         new_eval_layout.setSpacing(5)
         
-        if 'new_project' in self.icons and not self.icons['new_project'].isNull():
+        if self.resources.has_icon('new_project'):
             new_eval_icon = QLabel()
-            new_eval_icon.setPixmap(self.icons['new_project'].pixmap(32, 32))
+            new_eval_icon.setPixmap(self.resources.pixmap('new_project', 32))
             new_eval_icon.setAlignment(Qt.AlignCenter)
-            new_eval_icon.setStyleSheet("QLabel { border: none; background: transparent; }")  # 去掉边框
+            set_style_class(new_eval_icon, "icon")  # 去掉边框
             new_eval_layout.addWidget(new_eval_icon)
         
         self.btn_new_evaluation = QPushButton("新建评估")
@@ -106,11 +112,11 @@ class MainWindow(QMainWindow):
         open_file_layout.setAlignment(Qt.AlignCenter)
         open_file_layout.setSpacing(5)
         
-        if 'open_project' in self.icons and not self.icons['open_project'].isNull():
+        if self.resources.has_icon('open_project'):
             open_file_icon = QLabel()
-            open_file_icon.setPixmap(self.icons['open_project'].pixmap(32, 32))
+            open_file_icon.setPixmap(self.resources.pixmap('open_project', 32))
             open_file_icon.setAlignment(Qt.AlignCenter)
-            open_file_icon.setStyleSheet("QLabel { border: none; background: transparent; }")  # 去掉边框
+            set_style_class(open_file_icon, "icon")  # 去掉边框
             open_file_layout.addWidget(open_file_icon)
         
         self.btn_open_file = QPushButton("打开评估文件")
@@ -124,11 +130,11 @@ class MainWindow(QMainWindow):
         help_layout.setAlignment(Qt.AlignCenter)
         help_layout.setSpacing(5)
         
-        if 'help' in self.icons and not self.icons['help'].isNull():
+        if self.resources.has_icon('help'):
             help_icon = QLabel()
-            help_icon.setPixmap(self.icons['help'].pixmap(32, 32))
+            help_icon.setPixmap(self.resources.pixmap('help', 32))
             help_icon.setAlignment(Qt.AlignCenter)
-            help_icon.setStyleSheet("QLabel { border: none; background: transparent; }")  # 去掉边框
+            set_style_class(help_icon, "icon")  # 去掉边框
             help_layout.addWidget(help_icon)
         
         self.btn_help = QPushButton("查看帮助文档")
@@ -162,7 +168,7 @@ class MainWindow(QMainWindow):
         """创建左侧导航栏"""
         nav_frame = QFrame()
         nav_frame.setFrameStyle(QFrame.Box)
-        nav_frame.setStyleSheet("QFrame { border: 1px solid #ddd; background-color: #f9f9f9; }")
+        nav_frame.setObjectName("navFrame")
         nav_frame.setFixedWidth(220)  # 增加宽度以容纳图标
         
         nav_layout = QVBoxLayout(nav_frame)
@@ -179,11 +185,11 @@ class MainWindow(QMainWindow):
         project_design_layout = QHBoxLayout()
         project_design_layout.setSpacing(10)
         
-        if 'project_design' in self.icons and not self.icons['project_design'].isNull():
+        if self.resources.has_icon('project_design'):
             project_design_icon = QLabel()
-            project_design_icon.setPixmap(self.icons['project_design'].pixmap(32, 32))
+            project_design_icon.setPixmap(self.resources.pixmap('project_design', 32))
             project_design_icon.setAlignment(Qt.AlignCenter)
-            project_design_icon.setStyleSheet("QLabel { border: none; background: transparent; }")  # 去掉边框
+            set_style_class(project_design_icon, "icon")  # 去掉边框
             project_design_layout.addWidget(project_design_icon)
         
         self.btn_project_design = QPushButton("项目参数设计")
@@ -195,11 +201,11 @@ class MainWindow(QMainWindow):
         indicator_mgmt_layout = QHBoxLayout()
         indicator_mgmt_layout.setSpacing(10)
         
-        if 'indicator_management' in self.icons and not self.icons['indicator_management'].isNull():
+        if self.resources.has_icon('indicator_management'):
             indicator_mgmt_icon = QLabel()
-            indicator_mgmt_icon.setPixmap(self.icons['indicator_management'].pixmap(32, 32))
+            indicator_mgmt_icon.setPixmap(self.resources.pixmap('indicator_management', 32))
             indicator_mgmt_icon.setAlignment(Qt.AlignCenter)
-            indicator_mgmt_icon.setStyleSheet("QLabel { border: none; background: transparent; }")  # 去掉边框
+            set_style_class(indicator_mgmt_icon, "icon")  # 去掉边框
             indicator_mgmt_layout.addWidget(indicator_mgmt_icon)
         
         self.btn_indicator_management = QPushButton("指标管理")
@@ -211,11 +217,11 @@ class MainWindow(QMainWindow):
         evaluation_layout = QHBoxLayout()
         evaluation_layout.setSpacing(10)
         
-        if 'evaluation' in self.icons and not self.icons['evaluation'].isNull():
+        if self.resources.has_icon('evaluation'):
             evaluation_icon = QLabel()
-            evaluation_icon.setPixmap(self.icons['evaluation'].pixmap(32, 32))
+            evaluation_icon.setPixmap(self.resources.pixmap('evaluation', 32))
             evaluation_icon.setAlignment(Qt.AlignCenter)
-            evaluation_icon.setStyleSheet("QLabel { border: none; background: transparent; }")  # 去掉边框
+            set_style_class(evaluation_icon, "icon")  # 去掉边框
             evaluation_layout.addWidget(evaluation_icon)
         
         self.btn_comprehensive_evaluation = QPushButton("综合评估")
@@ -251,6 +257,10 @@ class MainWindow(QMainWindow):
         
         # 连接数据更新信号
         self.project_design_page.data_updated.connect(self.on_project_data_updated)
+        self.project_design_page.timeseries_import_requested.connect(self.import_timeseries)
+        self.project_design_page.series_edit_requested.connect(self.edit_timeseries)
+        self.project_design_page.validation_requested.connect(self.request_validation)
+        self.validator.validated.connect(self.project_design_page.show_validation_results)
         
         self.stacked_widget.addWidget(self.project_design_page)
         return self.project_design_page
@@ -269,72 +279,34 @@ class MainWindow(QMainWindow):
     
     def create_comprehensive_evaluation_page(self):
         """创建综合评估页面"""
-        page = QWidget()
-        layout = QVBoxLayout(page)
-        layout.setContentsMargins(20, 20, 20, 20)
-        
-        title = QLabel("综合评估")
-        title.setStyleSheet("QLabel { font-size: 18px; font-weight: bold; color: #2c3e50; }")
-        layout.addWidget(title)
+        from comprehensive_evaluation_page import ComprehensiveEvaluationPage
         
-        content = QLabel("这里将显示综合评估的具体内容...")
-        content.setStyleSheet("QLabel { font-size: 12px; color: #666; margin-top: 20px; }")
-        layout.addWidget(content)
+        self.comprehensive_evaluation_page = ComprehensiveEvaluationPage()
+        self.comprehensive_evaluation_page.evaluation_requested.connect(self.run_evaluation)
         
-        layout.addStretch()
-        self.stacked_widget.addWidget(page)
+        self.stacked_widget.addWidget(self.comprehensive_evaluation_page)
+        return self.comprehensive_evaluation_page
     
     def set_styles(self):
         """设置样式"""
-        # 设置顶部按钮样式 - 为平面按钮设计
-        top_button_style = """
-        QPushButton {
-            background-color: #3498db;
-            color: white;
-            border: none;
-            border-radius: 5px;
-            padding: 8px 12px;
-            font-size: 12px;
-            font-weight: bold;
-        }
-        QPushButton:hover {
-            background-color: #2980b9;
-        }
-        QPushButton:pressed {
-            background-color: #21618c;
-        }
-        QPushButton:flat {
-            border: none;
-        }
-        """
-        
-        # 应用样式到顶部按钮
-        self.btn_new_evaluation.setStyleSheet(top_button_style)
-        self.btn_open_file.setStyleSheet(top_button_style)
-        self.btn_help.setStyleSheet(top_button_style)
-        
-        # 导航按钮样式
-        nav_button_style = """
-        QPushButton {
-            background-color: #ecf0f1;
-            color: #2c3e50;
-            border: 1px solid #bdc3c7;
-            border-radius: 5px;
-            padding: 10px;
-            font-size: 12px;
-            text-align: left;
-        }
-        QPushButton:hover {
-            background-color: #d5dbdb;
+        # 顶部按钮、导航按钮和图标标签使用共享样式类
+        for button in (self.btn_new_evaluation, self.btn_open_file, self.btn_help):
+            set_style_class(button, "toolbar")
+        for button in (self.btn_project_design, self.btn_indicator_management,
+                       self.btn_comprehensive_evaluation):
+            set_style_class(button, "nav")
+        
+        # 在窗口级别统一设置样式表，框架样式按对象名限定，避免影响内部标签
+        self.setStyleSheet(self.resources.page_style('toolbar_button', 'nav_button', 'icon_label') + """
+        QFrame#toolbarFrame {
+            border: 1px solid #ddd;
+            background-color: #f5f5f5;
         }
-        QPushButton:pressed {
-            background-color: #aeb6bf;
+        QFrame#navFrame {
+            border: 1px solid #ddd;
+            background-color: #f9f9f9;
         }
-        """
-        
-        self.btn_project_design.setStyleSheet(nav_button_style)
-        self.btn_indicator_management.setStyleSheet(nav_button_style)
-        self.btn_comprehensive_evaluation.setStyleSheet(nav_button_style)
+        """)
     
     def switch_content(self, index):
         """切换内容页面"""
@@ -345,6 +317,8 @@ class MainWindow(QMainWindow):
         """新建评估"""
         project_path = self.data_manager.create_new_project(self)
         if project_path:
+            self.cancel_project_load()
+            self.cancel_evaluation()
             QMessageBox.information(self, "成功", f"项目创建成功！\n项目路径：{project_path}")
             
             # 重置项目参数设计页面并设置默认值
@@ -353,15 +327,16 @@ class MainWindow(QMainWindow):
             
             # 重置指标管理页面
             if self.indicator_management_page:
-                self.indicator_management_page.set_selected_indicators([
-                    'initial_investment', 'irr', 'dpp', 'npv', 
-                    'annual_maintenance', 'energy_purchase',
-                    'battery_utilization', 'hydrogen_utilization',
-                    'renewable_ratio'
-                ])
+                self.indicator_management_page.set_selected_indicators(
+                    INDICATORS.default_selected_ids())
             
             # 立即保存默认数据
             self.save_default_data()
+            
+            # 把新项目加入工作区目录
+            catalog = self.get_workspace_catalog()
+            if catalog:
+                catalog.index_project(project_path)
     
     def save_default_data(self):
         """保存默认数据"""
@@ -377,36 +352,282 @@ class MainWindow(QMainWindow):
             if self.data_manager.save_project_data(project_data, indicator_data):
                 self.statusBar().showMessage("默认数据已保存", 2000)
     
+    def get_workspace_catalog(self):
+        """获取工作区项目目录，目录数据库不可用时返回None"""
+        if self.workspace_catalog is None:
+            try:
+                self.workspace_catalog = WorkspaceCatalog()
+            except sqlite3.Error as e:
+                print(f"打开工作区目录失败：{str(e)}")
+        return self.workspace_catalog
+    
     def open_file(self):
         """打开评估文件"""
-        folder_path = QFileDialog.getExistingDirectory(
+        catalog = self.get_workspace_catalog()
+        if catalog:
+            # 从工作区目录中搜索并选择项目
+            dialog = ProjectBrowserDialog(catalog, self)
+            if dialog.exec_() != QDialog.Accepted:
+                return
+            folder_path = dialog.selected_path
+        else:
+            folder_path = QFileDialog.getExistingDirectory(
+                self,
+                "选择项目文件夹",
+                os.path.expanduser("~"),
+                QFileDialog.ShowDirsOnly
+            )
+        
+        if folder_path:
+            self.open_project_folder(folder_path)
+    
+    def open_project_folder(self, folder_path):
+        """打开指定的项目文件夹或单文件项目"""
+        # 检查是否是有效的项目
+        if not is_project_path(folder_path):
+            QMessageBox.warning(self, "错误", "选择的文件夹不是有效的项目文件夹！")
+            return False
+        
+        # 取消正在进行的加载和计算
+        self.cancel_project_load()
+        self.cancel_evaluation()
+        
+        # 后台分阶段加载：JSON读取完成后页面即可编辑，时序数据和计算结果随后读入
+        self.data_manager.begin_load(folder_path)
+        loader = ProjectLoader(folder_path, self)
+        loader.json_loaded.connect(
+            lambda project_data, indicator_data: self.on_project_json_loaded(loader, project_data, indicator_data))
+        loader.timeseries_loaded.connect(
+            lambda name, values: self.on_project_timeseries_loaded(loader, name, values))
+        loader.output_loaded.connect(lambda name, rows: self.on_project_output_loaded(loader, name, rows))
+        loader.progress.connect(
+            lambda done, total, message: self.on_project_load_progress(loader, done, total, message))
+        loader.finished.connect(lambda ok, error: self.on_project_load_finished(loader, ok, error))
+        self.project_loader = loader
+        
+        self.load_progress.setRange(0, 0)  # 读取JSON时显示忙碌状态
+        self.load_progress.setFormat("正在打开项目...")
+        self.load_progress.show()
+        loader.start()
+        return True
+    
+    def is_current_loader(self, loader):
+        """忽略已被取消的加载任务发出的信号"""
+        return loader is self.project_loader
+    
+    def cancel_project_load(self):
+        """取消正在进行的项目加载"""
+        if self.project_loader is not None:
+            self.project_loader.cancel()
+            self.project_loader = None
+            self.load_progress.hide()
+    
+    def on_project_json_loaded(self, loader, project_data, indicator_data):
+        """第一阶段完成：项目参数和指标数据已读取，加载到页面"""
+        if not self.is_current_loader(loader):
+            return
+        self.data_manager.finish_json_load(project_data, indicator_data)
+        
+        # 加载数据到UI
+        if self.project_design_page:
+            self.project_design_page.load_project_data(self.data_manager.get_project_data_for_ui())
+        
+        if self.indicator_management_page:
+            self.indicator_management_page.load_indicator_data(self.data_manager.get_indicator_data_for_ui())
+        
+        self.statusBar().showMessage("项目参数已加载，正在后台读取时序数据...", 3000)
+    
+    def on_project_timeseries_loaded(self, loader, name, values):
+        """第二阶段：缓存后台读取的时序数据"""
+        if self.is_current_loader(loader):
+            self.data_manager.cache_loaded_timeseries(name, values)
+    
+    def on_project_output_loaded(self, loader, name, rows):
+        """第二阶段：缓存后台读取的输出表格"""
+        if self.is_current_loader(loader):
+            self.data_manager.cache_output_table(name, rows)
+    
+    def on_project_load_progress(self, loader, done, total, message):
+        """更新后台加载进度"""
+        if not self.is_current_loader(loader):
+            return
+        self.load_progress.setRange(0, max(total, 1))
+        self.load_progress.setValue(done)
+        self.load_progress.setFormat(f"%v/%m {message}" if message else "%v/%m")
+    
+    def on_project_load_finished(self, loader, ok, error):
+        """后台加载结束"""
+        if not self.is_current_loader(loader):
+            return
+        self.project_loader = None
+        self.load_progress.hide()
+        if ok:
+            self.statusBar().showMessage("项目加载成功！", 3000)
+            self.request_validation()
+        elif not self.data_manager.project_data:
+            # JSON阶段失败，项目不可用
+            self.data_manager.begin_load(None)
+            QMessageBox.warning(self, "错误", f"加载项目失败！\n{error}")
+        else:
+            QMessageBox.warning(self, "错误", f"读取项目时序数据失败：{error}")
+    
+    def import_timeseries(self):
+        """批量导入时序数据文件"""
+        if not self.data_manager.current_project_path:
+            QMessageBox.warning(self, "提示", "请先新建或打开项目！")
+            return
+        
+        patterns = " ".join(f"*{ext}" for ext in supported_extensions())
+        paths, _ = QFileDialog.getOpenFileNames(
             self,
-            "选择项目文件夹",
+            "选择时序数据文件",
             os.path.expanduser("~"),
-            QFileDialog.ShowDirsOnly
+            f"时序数据文件 ({patterns});;所有文件 (*)"
         )
-        
-        if folder_path:
-            # 检查是否是有效的项目文件夹
-            if os.path.exists(os.path.join(folder_path, "User_input.json")) and \
-               os.path.exists(os.path.join(folder_path, "IndicatorSystem.json")):
-                
-                if self.data_manager.load_project(folder_path):
-                    # 加载数据到UI
-                    project_data = self.data_manager.get_project_data_for_ui()
-                    indicator_data = self.data_manager.get_indicator_data_for_ui()
-                    
-                    if self.project_design_page:
-                        self.project_design_page.load_project_data(project_data)
-                    
-                    if self.indicator_management_page:
-                        self.indicator_management_page.load_indicator_data(indicator_data)
-                    
-                    QMessageBox.information(self, "成功", "项目加载成功！")
-                else:
-                    QMessageBox.warning(self, "错误", "加载项目失败！")
-            else:
-                QMessageBox.warning(self, "错误", "选择的文件夹不是有效的项目文件夹！")
+        if not paths:
+            return
+        
+        results, errors = self.data_manager.import_timeseries(paths)
+        lines = [f"已导入 {len(results)} 个文件"]
+        for result in results:
+            lines.append(f"{result.name}：{result.values.shape[1]} 个方案")
+            lines.extend(f"    {warning}" for warning in result.warnings)
+        if errors:
+            lines.append("")
+            lines.append("以下文件导入失败：")
+            lines.extend(errors)
+        if results:
+            self.request_validation()
+        if errors:
+            QMessageBox.warning(self, "导入时序数据", "\n".join(lines))
+        else:
+            QMessageBox.information(self, "导入时序数据", "\n".join(lines))
+    
+    def edit_timeseries(self, series_name):
+        """在表格中编辑各方案逐时数据"""
+        if not self.data_manager.current_project_path:
+            QMessageBox.warning(self, "提示", "请先新建或打开项目！")
+            return
+        
+        dialog = SeriesEditorDialog(series_name, self.data_manager.get_timeseries(series_name),
+                                    self.data_manager.get_scheme_count(), self)
+        if dialog.exec_() == QDialog.Accepted and dialog.model.modified:
+            self.data_manager.set_timeseries(series_name, dialog.values())
+            self.statusBar().showMessage(f"{series_name} 已保存", 2000)
+            self.request_validation()
+    
+    def request_validation(self):
+        """在后台校验当前项目，结果显示在项目参数设计页面上"""
+        if not self.project_design_page or not self.data_manager.current_project_path:
+            return
+        if self.project_loader is not None:
+            return  # 时序数据仍在后台读取，加载完成后再校验
+        self.validator.submit(self.project_design_page.get_project_data(),
+                              self.data_manager.get_all_timeseries())
+    
+    def run_evaluation(self, weight_method, score_method, recompute=True):
+        """按选择的方法综合评估各方案；recompute 为True时先重新进行财务计算，
+        只切换方法时只重新计算权重和得分"""
+        page = self.comprehensive_evaluation_page
+        if not self.data_manager.current_project_path:
+            page.show_evaluation_error("请先新建或打开项目！")
+            return
+        if not recompute:
+            self.show_evaluation(weight_method, score_method)
+            return
+        if self.evaluation_runner is not None:
+            self.statusBar().showMessage("财务计算正在进行中", 3000)
+            return
+        if self.project_loader is not None:
+            page.show_evaluation_error("时序数据仍在后台读取，请稍候再评估。")
+            return
+        
+        # 后台分块计算，每块完成后写入检查点，中断后再次评估时从检查点继续
+        try:
+            run = self.data_manager.create_checkpointed_run()
+        except FinancialInputError as e:
+            page.show_evaluation_error(f"无法进行财务计算：{str(e)}")
+            return
+        runner = EvaluationRunner(run, self.data_manager.get_store().write_array, self)
+        runner.progress.connect(lambda done, total: self.on_evaluation_progress(runner, done, total))
+        runner.finished.connect(
+            lambda ok, error: self.on_evaluation_finished(runner, weight_method, score_method, ok, error))
+        self.evaluation_runner = runner
+        
+        done, total = run.progress()
+        self.on_evaluation_progress(runner, done, total)
+        runner.start()
+    
+    def cancel_evaluation(self):
+        """停止正在进行的财务计算（项目切换时不再写入原项目）"""
+        if self.evaluation_runner is not None:
+            self.evaluation_runner.detach()
+            self.evaluation_runner = None
+            self.load_progress.hide()
+    
+    def on_evaluation_progress(self, runner, done, total):
+        """更新后台财务计算进度"""
+        if runner is not self.evaluation_runner:
+            return
+        self.load_progress.setRange(0, max(total, 1))
+        self.load_progress.setValue(done)
+        self.load_progress.setFormat("%v/%m 个方案")
+        self.load_progress.show()
+        self.comprehensive_evaluation_page.show_evaluation_progress(done, total)
+    
+    def on_evaluation_finished(self, runner, weight_method, score_method, ok, error):
+        """后台财务计算结束：全部完成时写入结果并综合评估"""
+        if runner is not self.evaluation_runner:
+            return
+        self.evaluation_runner = None
+        self.load_progress.hide()
+        page = self.comprehensive_evaluation_page
+        if error:
+            page.show_evaluation_error(f"无法进行财务计算：{error}")
+            return
+        run = runner.checkpointed_run
+        if not ok:
+            done, total = run.progress()
+            page.show_evaluation_error(f"财务计算已停止，已完成 {done}/{total} 个方案，再次评估时继续。")
+            return
+        try:
+            self.data_manager.finish_checkpointed_run(run)
+        except FinancialInputError as e:
+            page.show_evaluation_error(f"无法进行财务计算：{str(e)}")
+            return
+        self.balance_notes = run.shortfalls()
+        self.show_evaluation(weight_method, score_method)
+    
+    def show_evaluation(self, weight_method, score_method):
+        """按当前指标数值综合评估并显示结果"""
+        page = self.comprehensive_evaluation_page
+        result, missing = self.data_manager.evaluate(weight_method, score_method)
+        if result is None:
+            message = "已选指标尚无计算数值，无法进行综合评估。"
+            if missing:
+                message += "\n缺少数值的指标：" + "、".join(missing)
+            page.show_evaluation_error(message)
+            return
+        page.show_evaluation_results(result, self.data_manager.evaluation_session, self.balance_notes)
+    
+    def closeEvent(self, event):
+        """关闭窗口时释放项目存储（压缩包项目会在此时整理）"""
+        loader = self.project_loader
+        self.cancel_project_load()
+        if loader is not None:
+            loader.wait()
+        runner = self.evaluation_runner
+        if runner is not None:
+            # 停止计算并等待当前这一块算完（优化调度时可能较久），把已排队的检查点写入后
+            # 不再接受写入，再关闭存储
+            self.evaluation_runner = None
+            runner.cancel()
+            runner.wait()
+            QApplication.processEvents()
+            runner.detach()
+        self.validator.stop()
+        self.data_manager.close_store()
+        super().closeEvent(event)
     
     def show_help(self):
         """查看帮助文档"""
@@ -10,6 +10,7 @@ from project_design_page import ProjectDesignPage
 from indicator_management_page import IndicatorManagementPage
 from evaluation_page import EvaluationPage
 from data_manager import DataManager
+from resource_manager import get_resources
 
 class MainWindow(QMainWindow):
     """主窗口类"""
@@ -24,24 +25,10 @@ class MainWindow(QMainWindow):
     
     def load_icons(self):
         """加载图标资源"""
-        self.icons = {}
-        icons_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons")
-        
-        icon_files = {
-            'new_project': '新建评估.svg',
-            'open_project': '打开评估文件.svg',
-            'project_design': '项目参数设计.svg',
-            'indicator_management': '指标管理.svg',
-            'evaluation': '综合评估.svg',
-            'help': '查看帮助文档.svg'
-        }
-        
-        for key, filename in icon_files.items():
-            icon_path = os.path.join(icons_dir, filename)
-            if os.path.exists(icon_path):
-                self.icons[key] = QIcon(icon_path)
-            else:
-                self.icons[key] = QIcon()  # 空图标
+        self.icons = get_resources().icons(
+            'new_project', 'open_project', 'project_design',
+            'indicator_management', 'evaluation', 'help'
+        )
     
     def init_ui(self):
         """初始化用户界面"""
@@ -97,7 +84,7 @@ class MainWindow(QMainWindow):
             QTabBar::tab:hover {
                 background-color: #f0f0f0;
             }
-        """)
+        """ + get_resources().page_style('success_button'))
 
     def create_menu_bar(self):
         """创建菜单栏"""
@@ -0,0 +1,156 @@
+import numpy as np
+
+from financial_inputs import input_series, hour_chunks
+from storage_kernel import run_storage
+from energy_accounts import (HYDROGEN_SALES_SERIES, OXYGEN_SALES_SERIES, GRID_SERIES,
+                             EXTERNAL_HYDROGEN_SERIES, ESS_SERIES)
+
+WT_SERIES = "WT-风力发电单元出力(kW)"
+PV_SERIES = "PV-光伏机组出力(kW)"
+LOAD_SERIES = "电负荷-电负荷所消耗的功率(kW)"
+# 储能时序数据为正表示放出（向系统供能），为负表示充入
+HES_SERIES = "HES-氢储能装置加氢放氢(kg)"
+
+# 电解水每产1kg氢气副产的氧气质量（kg），按摩尔质量 32/(2×2.016)
+OXYGEN_PER_HYDROGEN = 7.94
+# 燃料电池每消耗1kg氢气的发电量（kWh/kg），按氢气低位热值 33.3 kWh/kg、发电效率50%
+FUEL_CELL_KWH_PER_KG = 16.65
+
+# 年度汇总项目: (名称, MassBalance 属性)
+BALANCE_ITEMS = [
+    ("电解槽用电量(kWh)", "el_power"),
+    ("产氢量(kg)", "hydrogen_production"),
+    ("副产氧气量(kg)", "oxygen_production"),
+    ("燃料电池发电量(kWh)", "hfc_power"),
+    ("燃料电池耗氢量(kg)", "hfc_hydrogen"),
+    ("氢负荷需求(kg)", "hydrogen_demand"),
+    ("缺氢量(kg)", "hydrogen_shortfall"),
+    ("富余氢气(kg)", "hydrogen_surplus"),
+    ("缺氧量(kg)", "oxygen_shortfall"),
+    ("富余氧气(kg)", "oxygen_surplus"),
+    ("缺电量(kWh)", "electricity_shortfall"),
+    ("弃电量(kWh)", "curtailment"),
+]
+
+# 缺额项目: (名称, MassBalance 属性, 单位)
+SHORTFALL_ITEMS = [
+    ("缺氢", "hydrogen_shortfall", "kg"),
+    ("缺氧", "oxygen_shortfall", "kg"),
+    ("缺电", "electricity_shortfall", "kWh"),
+]
+# 小于该值的缺额视为0
+SHORTFALL_TOLERANCE = 1e-9
+
+
+class MassBalance:
+    """电解槽制氢链的逐时电、氢、氧平衡，只保存各项的年度合计 totals {属性: (方案数,)}
+
+    每个小时先做电平衡：可再生出力加电储能放电、减去电负荷和向电网的净输出后，
+    富余电量在容量范围内供电解槽，不足部分由燃料电池补充；再做氢平衡：
+    产氢量加氢储能放氢和外部氢源净输入，供各氢负荷和燃料电池，差额记为缺氢或富余氢气。
+    逐时数据按 CHUNK_HOURS 分块推进，单列数据按广播参与运算，每块的临时数组不超过
+    (块长, 方案数)。已选择电储能或氢储能但未提供其充放数据时，由储能按电、氢余缺自动充放
+    （run_storage，储量跨块衔接），ess_discharged、hes_discharged 为其全年放出量，否则为None。
+    """
+
+    def __init__(self, inputs, series, tolerance=SHORTFALL_TOLERANCE):
+        schemes = inputs.scheme_count
+        el = inputs.devices['EL']
+        hfc = inputs.devices['HFC']
+        raw = {name: input_series(inputs, series, name)
+               for name in (WT_SERIES, PV_SERIES, GRID_SERIES, LOAD_SERIES, ESS_SERIES, HES_SERIES,
+                            EXTERNAL_HYDROGEN_SERIES, OXYGEN_SALES_SERIES) + HYDROGEN_SALES_SERIES}
+
+        def auto_storage(code, name):
+            return inputs.devices[code].selected and series.get(name) is None
+
+        auto_ess = auto_storage('ESS', ESS_SERIES)
+        auto_hes = auto_storage('HES', HES_SERIES)
+        ess_level = np.zeros(schemes)
+        hes_level = np.zeros(schemes)
+        self.ess_discharged = np.zeros(schemes) if auto_ess else None
+        self.hes_discharged = np.zeros(schemes) if auto_hes else None
+        self.totals = {attr: np.zeros(schemes) for _, attr in BALANCE_ITEMS}
+        self.shortfall_hour_counts = {attr: np.zeros(schemes, dtype=np.int64) for _, attr, _ in SHORTFALL_ITEMS}
+        self.any_shortfall_hours = np.zeros(schemes, dtype=np.int64)
+
+        for rows in hour_chunks():
+            def block(*names):
+                total = np.zeros((rows.stop - rows.start, schemes))
+                for name in names:
+                    if raw[name] is not None:
+                        total += raw[name][rows]
+                return total
+
+            # 电平衡
+            surplus = block(WT_SERIES, PV_SERIES) - block(GRID_SERIES, LOAD_SERIES)
+            hourly = {}
+            if auto_ess:
+                result = run_storage(-surplus, inputs.devices['ESS'].capacity, inputs.ess_efficiency,
+                                     level=ess_level)
+                ess_level = result.level[-1]
+                self.ess_discharged += np.maximum(result.flow, 0.0).sum(axis=0)
+                surplus += result.flow
+            else:
+                surplus += block(ESS_SERIES)
+            available = np.maximum(surplus, 0.0)
+            deficit = np.maximum(-surplus, 0.0)
+            hourly['el_power'] = np.minimum(available, el.capacity) if el.selected else np.zeros_like(surplus)
+            hourly['curtailment'] = available - hourly['el_power']
+            hourly['hfc_power'] = np.minimum(deficit, hfc.capacity) if hfc.selected else np.zeros_like(surplus)
+            hourly['electricity_shortfall'] = deficit - hourly['hfc_power']
+
+            # 氢、氧平衡
+            hourly['hydrogen_production'] = hourly['el_power'] / inputs.el_conversion
+            hourly['oxygen_production'] = hourly['hydrogen_production'] * OXYGEN_PER_HYDROGEN
+            hourly['hfc_hydrogen'] = hourly['hfc_power'] / FUEL_CELL_KWH_PER_KG
+            hourly['hydrogen_demand'] = block(*HYDROGEN_SALES_SERIES)
+            hydrogen_net = hourly['hydrogen_production'] - block(EXTERNAL_HYDROGEN_SERIES) \
+                - hourly['hydrogen_demand'] - hourly['hfc_hydrogen']
+            if auto_hes:
+                result = run_storage(-hydrogen_net, inputs.devices['HES'].capacity, level=hes_level)
+                hes_level = result.level[-1]
+                self.hes_discharged += np.maximum(result.flow, 0.0).sum(axis=0)
+                hydrogen_net += result.flow
+            else:
+                hydrogen_net += block(HES_SERIES)
+            hourly['hydrogen_shortfall'] = np.maximum(-hydrogen_net, 0.0)
+            hourly['hydrogen_surplus'] = np.maximum(hydrogen_net, 0.0)
+            oxygen_net = hourly['oxygen_production'] - block(OXYGEN_SALES_SERIES)
+            hourly['oxygen_shortfall'] = np.maximum(-oxygen_net, 0.0)
+            hourly['oxygen_surplus'] = np.maximum(oxygen_net, 0.0)
+
+            for attr, total in self.totals.items():
+                total += hourly[attr].sum(axis=0)
+            for attr, count in self.shortfall_hour_counts.items():
+                count += (hourly[attr] > tolerance).sum(axis=0)
+            self.any_shortfall_hours += ((hourly['hydrogen_shortfall'] > 0) | (hourly['oxygen_shortfall'] > 0)
+                                         | (hourly['electricity_shortfall'] > 0)).sum(axis=0)
+
+    def annual(self):
+        """各项的年度合计 {名称: (方案数,)}"""
+        return {name: self.totals[attr] for name, attr in BALANCE_ITEMS}
+
+    def shortfall_hours(self):
+        """各方案出现缺氢、缺氧或缺电的小时数 (方案数,)"""
+        return self.any_shortfall_hours
+
+    def shortfall_totals(self):
+        """各项缺额的年度合计和出现小时数，均为 (缺额项数, 方案数)，顺序同 SHORTFALL_ITEMS"""
+        totals = np.stack([self.totals[attr] for _, attr, _ in SHORTFALL_ITEMS])
+        hours = np.stack([self.shortfall_hour_counts[attr] for _, attr, _ in SHORTFALL_ITEMS])
+        return totals, hours
+
+    def shortfalls(self):
+        """缺额说明列表，各方案没有缺额时为空"""
+        return shortfall_messages(*self.shortfall_totals())
+
+
+def shortfall_messages(totals, hours, first_scheme=0, tolerance=SHORTFALL_TOLERANCE):
+    """按 shortfall_totals 的结果生成缺额说明，first_scheme 为第一列对应的方案序号"""
+    messages = []
+    for (name, _, unit), item_totals, item_hours in zip(SHORTFALL_ITEMS, totals, hours):
+        for s in np.flatnonzero(item_totals > tolerance):
+            messages.append(f"方案{first_scheme + s + 1} {name} {item_totals[s]:.1f} {unit}，"
+                            f"共 {int(item_hours[s])} 小时")
+    return messages
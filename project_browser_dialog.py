@@ -0,0 +1,193 @@
+import os
+from datetime import datetime
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
+                             QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
+                             QAbstractItemView, QFileDialog)
+from PyQt5.QtCore import Qt
+
+from workspace_catalog import is_project_folder, is_project_file
+from sqlite_project_store import SQLITE_PROJECT_EXTENSION
+from archive_project_store import ARCHIVE_PROJECT_EXTENSION
+
+
+class ProjectBrowserDialog(QDialog):
+    """项目浏览对话框，从工作区目录中搜索、排序并打开项目"""
+
+    # 表格列: (标题, 排序列)
+    COLUMNS = [
+        ("项目名称", "project_name"),
+        ("生命周期（年）", "lifecycle"),
+        ("方案数", "scheme_count"),
+        ("已选设备", None),
+        ("综合得分", "total_score"),
+        ("修改时间", "mtime"),
+        ("项目路径", "path")
+    ]
+
+    def __init__(self, catalog, parent=None):
+        super().__init__(parent)
+        self.catalog = catalog
+        self.root = catalog.get_setting("last_root")
+        self.order_by = "mtime"
+        self.descending = True
+        self.selected_path = None
+        self.init_ui()
+        if self.root and os.path.isdir(self.root):
+            self.rescan()
+        else:
+            self.root = None
+            self.refresh_list()
+
+    def init_ui(self):
+        """初始化用户界面"""
+        self.setWindowTitle("打开评估项目")
+        self.resize(900, 520)
+
+        layout = QVBoxLayout(self)
+
+        # 工作区目录
+        root_layout = QHBoxLayout()
+        root_layout.addWidget(QLabel("工作区目录："))
+        self.root_label = QLabel(self.root or "未选择")
+        root_layout.addWidget(self.root_label, 1)
+        choose_root_btn = QPushButton("选择目录")
+        choose_root_btn.clicked.connect(self.choose_root)
+        root_layout.addWidget(choose_root_btn)
+        rescan_btn = QPushButton("刷新")
+        rescan_btn.clicked.connect(self.rescan)
+        root_layout.addWidget(rescan_btn)
+        layout.addLayout(root_layout)
+
+        # 搜索框
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("按项目名称、文件夹或设备搜索")
+        self.search_edit.textChanged.connect(self.refresh_list)
+        layout.addWidget(self.search_edit)
+
+        # 项目列表
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels([title for title, _ in self.COLUMNS])
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.horizontalHeader().sectionClicked.connect(self.on_header_clicked)
+        self.table.itemDoubleClicked.connect(self.open_selected)
+        layout.addWidget(self.table)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        # 底部按钮
+        button_layout = QHBoxLayout()
+        browse_btn = QPushButton("浏览其他文件夹...")
+        browse_btn.clicked.connect(self.browse_folder)
+        button_layout.addWidget(browse_btn)
+        browse_file_btn = QPushButton("打开项目文件...")
+        browse_file_btn.clicked.connect(self.browse_file)
+        button_layout.addWidget(browse_file_btn)
+        button_layout.addStretch()
+        open_btn = QPushButton("打开")
+        open_btn.setDefault(True)
+        open_btn.clicked.connect(self.open_selected)
+        button_layout.addWidget(open_btn)
+        cancel_btn = QPushButton("取消")
+        cancel_btn.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_btn)
+        layout.addLayout(button_layout)
+
+    def choose_root(self):
+        """选择工作区目录"""
+        folder_path = QFileDialog.getExistingDirectory(
+            self,
+            "选择工作区目录",
+            self.root or os.path.expanduser("~"),
+            QFileDialog.ShowDirsOnly
+        )
+        if folder_path:
+            self.root = folder_path
+            self.root_label.setText(folder_path)
+            self.rescan()
+
+    def rescan(self):
+        """增量扫描工作区目录并刷新列表"""
+        if self.root:
+            updated, removed = self.catalog.scan(self.root)
+            self.status_label.setText(f"已更新 {updated} 个项目，移除 {removed} 个项目")
+        self.refresh_list()
+
+    def on_header_clicked(self, column):
+        """点击表头切换排序"""
+        order_by = self.COLUMNS[column][1]
+        if not order_by:
+            return
+        if order_by == self.order_by:
+            self.descending = not self.descending
+        else:
+            self.order_by = order_by
+            self.descending = order_by in ("mtime", "total_score")
+        self.refresh_list()
+
+    def refresh_list(self):
+        """按搜索条件和排序刷新项目列表"""
+        projects = self.catalog.search(self.search_edit.text(), root=self.root,
+                                       order_by=self.order_by, descending=self.descending)
+
+        self.table.setUpdatesEnabled(False)
+        self.table.setRowCount(len(projects))
+        for row, project in enumerate(projects):
+            values = [
+                project['project_name'] or project['folder_name'],
+                "" if project['lifecycle'] is None else f"{project['lifecycle']:g}",
+                "" if project['scheme_count'] is None else str(project['scheme_count']),
+                project['equipment'] or "",
+                "" if project['total_score'] is None else f"{project['total_score']:.2f}",
+                datetime.fromtimestamp(project['mtime']).strftime("%Y-%m-%d %H:%M"),
+                project['path']
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                item.setData(Qt.UserRole, project['path'])
+                self.table.setItem(row, column, item)
+        self.table.setUpdatesEnabled(True)
+
+        if projects:
+            self.table.selectRow(0)
+
+    def open_selected(self, *args):
+        """打开选中的项目"""
+        item = self.table.currentItem()
+        if item is None:
+            return
+        self.selected_path = item.data(Qt.UserRole)
+        self.accept()
+
+    def browse_folder(self):
+        """直接浏览选择项目文件夹"""
+        folder_path = QFileDialog.getExistingDirectory(
+            self,
+            "选择项目文件夹",
+            self.root or os.path.expanduser("~"),
+            QFileDialog.ShowDirsOnly
+        )
+        if folder_path:
+            if is_project_folder(folder_path):
+                self.catalog.index_project(folder_path)
+            self.selected_path = folder_path
+            self.accept()
+
+    def browse_file(self):
+        """直接浏览选择单文件项目"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "选择项目文件",
+            self.root or os.path.expanduser("~"),
+            f"评估项目文件 (*{SQLITE_PROJECT_EXTENSION} *{ARCHIVE_PROJECT_EXTENSION});;所有文件 (*)"
+        )
+        if file_path:
+            if is_project_file(file_path):
+                self.catalog.index_project(file_path)
+            self.selected_path = file_path
+            self.accept()
@@ -4,13 +4,21 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
                              QLabel, QLineEdit, QGroupBox, QCheckBox, QPushButton,
                              QScrollArea, QFrame, QComboBox, QSpinBox, QDoubleSpinBox,
                              QTextEdit, QSplitter)
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont, QIcon
+from resource_manager import get_resources, set_style_class
+from bulk_update import BulkUpdateMixin
+from series_parser import parse_series, describe_bad_positions
+from project_validation import validate_project, has_errors, ERROR, PROJECT_KEY
+from financial_inputs import REPAYMENT_METHODS, DISPATCH_MODES
 
-class ProjectDesignPage(QWidget):
+class ProjectDesignPage(BulkUpdateMixin, QWidget):
     """项目参数设计页面"""
     
     data_updated = pyqtSignal()  # 数据更新信号
+    timeseries_import_requested = pyqtSignal()  # 请求批量导入时序数据
+    series_edit_requested = pyqtSignal(str)  # 请求编辑时序数据，参数为时序数据名称
+    validation_requested = pyqtSignal()  # 字段编辑后请求后台校验（已合并连续的编辑）
     
     def __init__(self):
         super().__init__()
@@ -20,24 +28,8 @@ class ProjectDesignPage(QWidget):
     
     def load_icons(self):
         """加载图标资源"""
-        self.icons = {}
-        icons_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons")
-        
-        print(f"项目设计页面 - 图标目录路径: {icons_dir}")  # 调试信息
-        
-        icon_files = {
-            'project_design': '项目参数设计.svg'
-        }
-        
-        for key, filename in icon_files.items():
-            icon_path = os.path.join(icons_dir, filename)
-            print(f"项目设计页面 - 尝试加载图标: {icon_path}")  # 调试信息
-            if os.path.exists(icon_path):
-                self.icons[key] = QIcon(icon_path)
-                print(f"项目设计页面 - 成功加载图标: {key}")  # 调试信息
-            else:
-                self.icons[key] = QIcon()
-                print(f"项目设计页面 - 图标文件不存在: {icon_path}")  # 调试信息
+        self.resources = get_resources()
+        self.icons = self.resources.icons('project_design')
 
     def init_ui(self):
         """初始化用户界面"""
@@ -45,6 +37,9 @@ class ProjectDesignPage(QWidget):
         main_layout.setContentsMargins(10, 10, 10, 10)
         main_layout.setSpacing(10)
         
+        # 时序数据名称 -> “在列表中输入各方案数据”按钮，用于显示校验结果
+        self.series_buttons = {}
+        
         # 创建顶部项目名称输入区域
         self.create_project_header(main_layout)
         
@@ -73,6 +68,10 @@ class ProjectDesignPage(QWidget):
         # 创建底部按钮
         self.create_bottom_buttons(content_layout)
         
+        # 共享样式在页面级别统一设置
+        self.setStyleSheet(self.resources.page_style(
+            'note_label', 'sub_group', 'primary_button', 'icon_label', 'invalid_input'))
+        
         scroll_area.setWidget(content_widget)
         main_layout.addWidget(scroll_area)
     
@@ -155,6 +154,22 @@ class ProjectDesignPage(QWidget):
         self.loan_rate_edit = QLineEdit()
         layout.addWidget(self.loan_rate_edit, 4, 1)
         
+        # 贷款期限
+        layout.addWidget(QLabel("贷款期限（年）"), 5, 0)
+        self.loan_term_edit = QLineEdit()
+        layout.addWidget(self.loan_term_edit, 5, 1)
+        
+        # 宽限期
+        layout.addWidget(QLabel("宽限期（年，只付息不还本）"), 6, 0)
+        self.grace_period_edit = QLineEdit()
+        layout.addWidget(self.grace_period_edit, 6, 1)
+        
+        # 还款方式
+        layout.addWidget(QLabel("还款方式"), 7, 0)
+        self.repayment_method_combo = QComboBox()
+        self.repayment_method_combo.addItems(REPAYMENT_METHODS)
+        layout.addWidget(self.repayment_method_combo, 7, 1)
+        
         parent_layout.addWidget(group)
     
     def create_financial_analysis_group(self, parent_layout):
@@ -175,6 +190,15 @@ class ProjectDesignPage(QWidget):
         self.inflation_rate_edit = QLineEdit()
         layout.addWidget(self.inflation_rate_edit, 1, 1)
         
+        # 调度方式
+        layout.addWidget(QLabel("调度方式"), 2, 0)
+        self.dispatch_mode_combo = QComboBox()
+        self.dispatch_mode_combo.addItems(DISPATCH_MODES)
+        # 校验无误时恢复的提示
+        self.dispatch_mode_combo.setProperty("hint", "优化调度按分时电价滚动求解线性规划，需要安装 scipy")
+        self.dispatch_mode_combo.setToolTip(self.dispatch_mode_combo.property("hint"))
+        layout.addWidget(self.dispatch_mode_combo, 2, 1)
+        
         parent_layout.addWidget(group)
     
     def create_price_parameters_group(self, parent_layout):
@@ -184,8 +208,8 @@ class ProjectDesignPage(QWidget):
         layout = QVBoxLayout(group)
         
         # 添加说明文字
-        note_label = QLabel("※在输入框中输入价格的24h分时数据，使用半角逗号\",\"隔开")
-        note_label.setStyleSheet("QLabel { color: #666; font-size: 9pt; }")  # 使用pt单位
+        note_label = QLabel("※在输入框中输入价格的24h分时数据（也可输入12×24逐月或8760h全年数据），使用半角逗号\",\"隔开")
+        set_style_class(note_label, "note")  # 使用pt单位
         layout.addWidget(note_label)
         
         grid_layout = QGridLayout()
@@ -233,7 +257,7 @@ class ProjectDesignPage(QWidget):
         layout.addWidget(self.construction_cost_edit, 1, 1)
         
         # 年人员费用
-        layout.addWidget(QLabel("年人员费用（万元/年·人）"), 2, 0)
+        layout.addWidget(QLabel("年人员费用（元/年·人）"), 2, 0)
         self.personnel_cost_edit = QLineEdit()
         layout.addWidget(self.personnel_cost_edit, 2, 1)
         
@@ -299,7 +323,7 @@ class ProjectDesignPage(QWidget):
         
         # 氧负荷组
         oxygen_group = QGroupBox("氧负荷")
-        oxygen_group.setStyleSheet("QGroupBox { border: 1px solid gray; margin: 5px; padding-top: 15px; }")
+        set_style_class(oxygen_group, "sub")
         oxygen_layout = QVBoxLayout(oxygen_group)
         self.oxygen_sell_checkbox = QCheckBox("售氧")
         # 默认不选中
@@ -309,7 +333,7 @@ class ProjectDesignPage(QWidget):
         
         # 氢负荷组
         hydrogen_group = QGroupBox("氢负荷")
-        hydrogen_group.setStyleSheet("QGroupBox { border: 1px solid gray; margin: 5px; padding-top: 15px; }")
+        set_style_class(hydrogen_group, "sub")
         hydrogen_layout = QGridLayout(hydrogen_group)
         
         self.ammonia_checkbox = QCheckBox("合成氨")
@@ -336,7 +360,7 @@ class ProjectDesignPage(QWidget):
         
         # 电负荷组
         power_group = QGroupBox("电负荷")
-        power_group.setStyleSheet("QGroupBox { border: 1px solid gray; margin: 5px; padding-top: 15px; }")
+        set_style_class(power_group, "sub")
         power_layout = QVBoxLayout(power_group)
         self.internal_power_checkbox = QCheckBox("系统内用电单元")
         self.internal_power_checkbox.setChecked(True)
@@ -375,7 +399,7 @@ class ProjectDesignPage(QWidget):
         
         # 风力发电单元出力
         layout.addWidget(QLabel("风力发电单元出力（kW）"), 0, 0)
-        list_input_btn = QPushButton("在列表中输入各方案数据")
+        list_input_btn = self.create_series_button("WT-风力发电单元出力(kW)")
         list_input_btn.setMaximumWidth(250)
         layout.addWidget(list_input_btn, 0, 1)
         
@@ -407,7 +431,7 @@ class ProjectDesignPage(QWidget):
         
         # 说明文字和总装机
         note_label = QLabel("※在输入框中输入各方案WT容量，使用半角逗号\",\"隔开")
-        note_label.setStyleSheet("QLabel { color: #666; font-size: 9pt; }")
+        set_style_class(note_label, "note")
         layout.addWidget(note_label, 6, 0, 1, 2)
         
         layout.addWidget(QLabel("风力发电总装机（kW）"), 7, 0)
@@ -425,7 +449,7 @@ class ProjectDesignPage(QWidget):
         
         # 光伏机组出力
         layout.addWidget(QLabel("光伏机组出力（kW）"), 0, 0)
-        list_input_btn = QPushButton("在列表中输入各方案数据")
+        list_input_btn = self.create_series_button("PV-光伏机组出力(kW)")
         list_input_btn.setMaximumWidth(250)
         layout.addWidget(list_input_btn, 0, 1)
         
@@ -457,7 +481,7 @@ class ProjectDesignPage(QWidget):
         
         # 说明文字和总装机
         note_label = QLabel("※在输入框中输入各方案PV容量，使用半角逗号\",\"隔开")
-        note_label.setStyleSheet("QLabel { color: #666; font-size: 9pt; }")
+        set_style_class(note_label, "note")
         layout.addWidget(note_label, 6, 0, 1, 2)
         
         layout.addWidget(QLabel("光伏机组总装机（kW）"), 7, 0)
@@ -474,7 +498,7 @@ class ProjectDesignPage(QWidget):
         
         # ESS的充放功率
         layout.addWidget(QLabel("ESS的充放功率（kW）"), 0, 0)
-        list_input_btn = QPushButton("在列表中输入各方案数据")
+        list_input_btn = self.create_series_button("ESS-电储能装置充放功率(kW·h)")
         list_input_btn.setMaximumWidth(250)
         layout.addWidget(list_input_btn, 0, 1)
         
@@ -511,7 +535,7 @@ class ProjectDesignPage(QWidget):
         
         # 说明文字和总容量
         note_label = QLabel("※在输入框中输入各方案ESS容量，使用半角逗号\",\"隔开")
-        note_label.setStyleSheet("QLabel { color: #666; font-size: 9pt; }")
+        set_style_class(note_label, "note")
         layout.addWidget(note_label, 7, 0, 1, 2)
         
         layout.addWidget(QLabel("蓄电池配置容量（kW·h）"), 8, 0)
@@ -528,7 +552,7 @@ class ProjectDesignPage(QWidget):
         
         # 氢储能装置加氢放氢
         layout.addWidget(QLabel("氢储能装置加氢放氢（kg）"), 0, 0)
-        list_input_btn = QPushButton("在列表中输入各方案数据")
+        list_input_btn = self.create_series_button("HES-氢储能装置加氢放氢(kg)")
         list_input_btn.setMaximumWidth(250)
         layout.addWidget(list_input_btn, 0, 1)
         
@@ -554,7 +578,7 @@ class ProjectDesignPage(QWidget):
         
         # 说明文字和配置容量
         note_label = QLabel("※在输入框中输入各方案HES容量，使用半角逗号\",\"隔开")
-        note_label.setStyleSheet("QLabel { color: #666; font-size: 9pt; }")
+        set_style_class(note_label, "note")
         layout.addWidget(note_label, 6, 0, 1, 2)
         
         layout.addWidget(QLabel("氢储能装置配置容量（kg）"), 7, 0)
@@ -597,7 +621,7 @@ class ProjectDesignPage(QWidget):
         
         # 说明文字和配置容量
         note_label = QLabel("※在输入框中输入各方案HFC容量，使用半角逗号\",\"隔开")
-        note_label.setStyleSheet("QLabel { color: #666; font-size: 9pt; }")
+        set_style_class(note_label, "note")
         layout.addWidget(note_label, 5, 0, 1, 2)
         
         layout.addWidget(QLabel("燃料电池配置容量（kW）"), 6, 0)
@@ -614,13 +638,13 @@ class ProjectDesignPage(QWidget):
         
         # 系统与外部氢源的交互质量
         layout.addWidget(QLabel("系统与外部氢源的交互质量（kg）"), 0, 0)
-        hydrogen_input_btn = QPushButton("在列表中输入各方案数据")
+        hydrogen_input_btn = self.create_series_button("外部能源网-系统与外部氢源的交互质量(kg)")
         hydrogen_input_btn.setMaximumWidth(250)
         layout.addWidget(hydrogen_input_btn, 0, 1)
         
         # 系统与外部电网的交互功率
         layout.addWidget(QLabel("系统与外部电网的交互功率（kW）"), 1, 0)
-        power_input_btn = QPushButton("在列表中输入各方案数据")
+        power_input_btn = self.create_series_button("外部能源网-系统与外部电网的交互功率(kW)")
         power_input_btn.setMaximumWidth(250)
         layout.addWidget(power_input_btn, 1, 1)
         
@@ -642,7 +666,7 @@ class ProjectDesignPage(QWidget):
         oxygen_layout = QGridLayout(oxygen_frame)
         
         oxygen_layout.addWidget(QLabel("销售氧气的质量（kg）"), 0, 0)
-        oxygen_sell_btn = QPushButton("在列表中输入各方案数据")
+        oxygen_sell_btn = self.create_series_button("氧负荷-销售氧气的质量(kg)")
         oxygen_sell_btn.setMaximumWidth(250)
         oxygen_layout.addWidget(oxygen_sell_btn, 0, 1)
         
@@ -657,16 +681,20 @@ class ProjectDesignPage(QWidget):
         hydrogen_frame.setFrameStyle(QFrame.Box)
         hydrogen_layout = QGridLayout(hydrogen_frame)
         
-        # 添加各种氢负荷项目
+        # 添加各种氢负荷项目: (显示名称, 时序数据名称)
         hydrogen_items = [
-            "合成氨（kg）", "合成甲醇（kg）", "成品油加工（kg）", 
-            "燃料电池汽车加氢（kg）", "钢铁冶炼（kg）", "其他用途售氢（kg）"
+            ("合成氨（kg）", "氢负荷-合成氨所耗氢气质量(kg)"),
+            ("合成甲醇（kg）", "氢负荷-生产甲醇所耗氢气质量(kg)"),
+            ("成品油加工（kg）", "氢负荷-用于炼油所耗氢气质量(kg)"),
+            ("燃料电池汽车加氢（kg）", "氢负荷-氢燃料电池汽车加氢所耗氢气质量(kg)"),
+            ("钢铁冶炼（kg）", "氢负荷-用于钢铁冶炼所耗氢气质量(kg)"),
+            ("其他用途售氢（kg）", "氢负荷-用于其他方面的销售氢气年总质量(kg)")
         ]
         
-        for i, item in enumerate(hydrogen_items):
+        for i, (item, series_name) in enumerate(hydrogen_items):
             row = i
             hydrogen_layout.addWidget(QLabel(item), row, 0)
-            btn = QPushButton("在列表中输入各方案数据")
+            btn = self.create_series_button(series_name)
             btn.setMaximumWidth(250)
             hydrogen_layout.addWidget(btn, row, 1)
         
@@ -682,16 +710,42 @@ class ProjectDesignPage(QWidget):
         power_layout = QGridLayout(power_frame)
         
         power_layout.addWidget(QLabel("电负荷所消耗的功率（kW）"), 0, 0)
-        power_consumption_btn = QPushButton("在列表中输入各方案数据")
+        power_consumption_btn = self.create_series_button("电负荷-电负荷所消耗的功率(kW)")
         power_consumption_btn.setMaximumWidth(250)
         power_layout.addWidget(power_consumption_btn, 0, 1)
         
         layout.addWidget(power_frame)
+        
+        # 批量导入风光出力、负荷和外部能源网交互等时序数据
+        import_layout = QHBoxLayout()
+        import_note = QLabel("※可从CSV/Parquet文件批量导入各方案逐时数据，文件名需与数据名称对应")
+        set_style_class(import_note, "note")
+        import_layout.addWidget(import_note)
+        import_layout.addStretch()
+        import_btn = QPushButton("批量导入时序数据...")
+        import_btn.setMaximumWidth(250)
+        import_btn.clicked.connect(self.timeseries_import_requested.emit)
+        import_layout.addWidget(import_btn)
+        layout.addLayout(import_layout)
+        
         parent_layout.addWidget(group)
     
+    def create_series_button(self, series_name):
+        """创建“在列表中输入各方案数据”按钮，点击时请求编辑对应的时序数据"""
+        btn = QPushButton("在列表中输入各方案数据")
+        btn.clicked.connect(lambda: self.series_edit_requested.emit(series_name))
+        self.series_buttons[series_name] = btn
+        return btn
+    
     def create_bottom_buttons(self, parent_layout):
         """创建底部按钮"""
         button_layout = QHBoxLayout()
+        
+        # 校验结果汇总
+        self.validation_label = QLabel()
+        set_style_class(self.validation_label, "validation")
+        self.validation_label.hide()
+        button_layout.addWidget(self.validation_label)
         button_layout.addStretch()
         
         # 更新数据按钮组合
@@ -699,36 +753,17 @@ class ProjectDesignPage(QWidget):
         update_layout.setSpacing(8)
         
         # 添加图标
-        if 'project_design' in self.icons and not self.icons['project_design'].isNull():
+        if self.resources.has_icon('project_design'):
             update_icon = QLabel()
-            update_icon.setPixmap(self.icons['project_design'].pixmap(24, 24))
+            update_icon.setPixmap(self.resources.pixmap('project_design', 24))
             update_icon.setAlignment(Qt.AlignCenter)
-            update_icon.setStyleSheet("QLabel { border: none; background: transparent; }")  # 去掉边框和背景
+            set_style_class(update_icon, "icon")  # 去掉边框和背景
             update_layout.addWidget(update_icon)
-            print("项目设计页面 - 已设置按钮图标")  # 调试信息
-        else:
-            print("项目设计页面 - 图标为空，未设置按钮图标")  # 调试信息
         
         # 更新数据按钮
         self.update_data_btn = QPushButton("更新数据")
         self.update_data_btn.setMinimumSize(100, 35)
-        self.update_data_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 8px 16px;
-                font-size: 9pt;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
-            }
-            QPushButton:pressed {
-                background-color: #21618c;
-            }
-        """)
+        set_style_class(self.update_data_btn, "primary")
         self.update_data_btn.clicked.connect(self.update_data)
         update_layout.addWidget(self.update_data_btn)
         
@@ -738,22 +773,110 @@ class ProjectDesignPage(QWidget):
     def setup_connections(self):
         """设置信号连接"""
         # 项目名称变化时发出信号
-        self.project_name_edit.textChanged.connect(self.data_updated.emit)
+        self.project_name_edit.textChanged.connect(self.notify_data_changed)
         
         # 其他重要参数变化时发出信号
-        self.project_life_edit.textChanged.connect(self.data_updated.emit)
-        self.project_people_edit.textChanged.connect(self.data_updated.emit)
+        self.project_life_edit.textChanged.connect(self.notify_data_changed)
+        self.project_people_edit.textChanged.connect(self.notify_data_changed)
         
         # 系统拓扑选择变化时发出信号
         self.wind_turbine_checkbox.toggled.connect(self.on_system_topology_changed)
         self.pv_checkbox.toggled.connect(self.on_system_topology_changed)
         self.fuel_cell_checkbox.toggled.connect(self.on_system_topology_changed)
         self.battery_storage_checkbox.toggled.connect(self.on_system_topology_changed)
-        self.inflation_rate_checkbox.toggled.connect(self.data_updated.emit)
-        
+        self.inflation_rate_checkbox.toggled.connect(self.notify_data_changed)
+        
+        # 价格和容量序列编辑完成时检查无效数值
+        self.series_edits = [
+            self.oxygen_price_edit, self.electricity_sell_price_edit,
+            self.electricity_buy_price_edit, self.hydrogen_price_edit,
+            self.wt_total_capacity_edit, self.pv_total_capacity_edit,
+            self.ess_total_capacity_edit, self.hes_total_capacity_edit,
+            self.el_total_capacity_edit, self.hfc_total_capacity_edit
+        ]
+        for edit in self.series_edits:
+            edit.editingFinished.connect(lambda edit=edit: self.check_series_input(edit))
+        
+        # 任意字段变化后延迟请求一次校验，连续输入只触发一次
+        self.validation_timer = QTimer(self)
+        self.validation_timer.setSingleShot(True)
+        self.validation_timer.setInterval(300)
+        self.validation_timer.timeout.connect(self.validation_requested.emit)
+        for widget in self.findChildren(QLineEdit):
+            widget.textChanged.connect(self.validation_timer.start)
+        for widget in self.findChildren(QCheckBox):
+            widget.toggled.connect(self.validation_timer.start)
+        self.dispatch_mode_combo.currentIndexChanged.connect(self.validation_timer.start)
+        self.validation_widgets = self.build_validation_widgets()
+    
+    def build_validation_widgets(self):
+        """字段键/时序数据名称 -> 显示校验结果的控件"""
+        # 控件名称与字段键不一致的字段
+        renamed = {
+            'scheme_count': self.project_scheme_edit,
+            'ess_capacity': self.ess_total_capacity_edit,
+            'hes_capacity': self.hes_total_capacity_edit,
+            'el_capacity': self.el_total_capacity_edit,
+            'hfc_capacity': self.hfc_total_capacity_edit,
+        }
+        widgets = {}
+        for key in self.get_project_data():
+            widget = renamed.get(key) or getattr(self, f"{key}_edit", None)
+            if widget is None and key.endswith('_ratio'):
+                widget = getattr(self, f"{key[:-len('_ratio')]}_edit", None)
+            if isinstance(widget, QLineEdit):
+                widgets[key] = widget
+        widgets['dispatch_mode'] = self.dispatch_mode_combo
+        widgets.update(self.series_buttons)
+        return widgets
+    
+    def show_validation_results(self, issues):
+        """在对应控件上显示校验结果，issues 为 {字段键: [ValidationIssue]}"""
+        for key, widget in self.validation_widgets.items():
+            key_issues = issues.get(key)
+            if not key_issues:
+                self.set_input_error(widget, None)
+            else:
+                self.set_input_error(widget, "\n".join(issue.message for issue in key_issues),
+                                     warning=key_issues[0].level != ERROR)
+        
+        all_issues = [issue for key_issues in issues.values() for issue in key_issues]
+        errors = sum(issue.level == ERROR for issue in all_issues)
+        warnings = len(all_issues) - errors
+        if not all_issues:
+            self.validation_label.hide()
+            return
+        summary = f"发现 {errors} 个错误" if errors else ""
+        if warnings:
+            summary += ("、" if summary else "发现 ") + f"{warnings} 个警告"
+        # 不属于单个控件的问题直接显示在汇总中
+        summary += "".join(f"；{issue.message}" for issue in issues.get(PROJECT_KEY, []))
+        self.validation_label.setText(summary + "（鼠标悬停在标出的输入框上查看详情）")
+        self.validation_label.setToolTip("\n".join(issue.message for issue in all_issues[:30]))
+        self.validation_label.show()
+        
+    def check_series_input(self, edit):
+        """检查序列输入框中的无效数值并在界面上标出"""
+        _, bad_positions = parse_series(edit.text())
+        self.set_input_error(edit, describe_bad_positions(bad_positions) if bad_positions else None)
+        return not bad_positions
+    
+    def check_series_inputs(self):
+        """检查所有序列输入框"""
+        return all([self.check_series_input(edit) for edit in self.series_edits])
+    
+    def set_input_error(self, edit, message, warning=False):
+        """设置输入框的错误（或警告）状态，message 为空时清除"""
+        edit.setProperty("invalid", bool(message) and not warning)
+        edit.setProperty("warning", bool(message) and warning)
+        edit.setToolTip(message or edit.property("hint") or "")
+        # 动态属性变化后需要重新应用样式
+        edit.style().unpolish(edit)
+        edit.style().polish(edit)
+    
     def on_system_topology_changed(self):
         """系统拓扑发生变化时的处理"""
-        self.data_updated.emit()
+        self.notify_data_changed()
         # 这里可以添加根据选择的组件动态显示/隐藏相关参数组的逻辑
     
     def update_data(self):
@@ -789,8 +912,12 @@ class ProjectDesignPage(QWidget):
             'vat_additional_rate': self.vat_additional_rate_edit.text(),
             'equity_ratio': self.equity_ratio_edit.text(),
             'loan_rate': self.loan_rate_edit.text(),
+            'loan_term': self.loan_term_edit.text(),
+            'grace_period': self.grace_period_edit.text(),
+            'repayment_method': self.repayment_method_combo.currentText(),
             'nominal_discount_rate': self.nominal_discount_rate_edit.text(),
             'inflation_rate': self.inflation_rate_edit.text(),
+            'dispatch_mode': self.dispatch_mode_combo.currentText(),
             'oxygen_price': self.oxygen_price_edit.text(),
             'electricity_sell_price': self.electricity_sell_price_edit.text(),
             'electricity_buy_price': self.electricity_buy_price_edit.text(),
@@ -847,6 +974,7 @@ class ProjectDesignPage(QWidget):
             'el_investment_cost': self.el_investment_cost_edit.text(),
             'el_maintenance_cost': self.el_maintenance_cost_edit.text(),
             'el_residual_value': self.el_residual_value_edit.text(),
+            'el_capacity': self.el_total_capacity_edit.text(),
             'hfc_lifetime': self.hfc_lifetime_edit.text(),
             'hfc_investment_cost': self.hfc_investment_cost_edit.text(),
             'hfc_maintenance_cost': self.hfc_maintenance_cost_edit.text(),
@@ -866,235 +994,222 @@ class ProjectDesignPage(QWidget):
         }
     
     def validate_data(self, data):
-        """验证数据有效性"""
-        # 检查必填项
-        required_fields = ['project_name', 'project_life', 'project_people']
-        for field in required_fields:
-            if not data.get(field):
-                print(f"缺少必填项: {field}")
-                return False
-        
-        # 检查数值型字段
-        numeric_fields = [
-            'project_life', 'project_people', 'vat_rate', 'income_tax_rate',
-            'vat_additional_rate', 'equity_ratio', 'loan_rate',
-            'nominal_discount_rate', 'inflation_rate'
-        ]
-        for field in numeric_fields:
-            value = data.get(field)
-            if value:
-                try:
-                    float(value)
-                except ValueError:
-                    print(f"数值格式错误: {field}")
-                    return False
-        
-        # 检查百分比字段范围
-        percentage_fields = [
-            'vat_rate', 'income_tax_rate', 'vat_additional_rate', 
-            'equity_ratio', 'loan_rate', 'nominal_discount_rate', 'inflation_rate'
-        ]
-        for field in percentage_fields:
-            value = data.get(field)
-            if value:
-                try:
-                    val = float(value)
-                    if val < 0 or val > 100:
-                        print(f"百分比字段超出范围 (0-100): {field}")
-                        return False
-                except ValueError:
-                    pass  # 已在上面检查过
-        
-        return True
+        """验证数据有效性（与后台校验使用同一套规则，不含时序数据）"""
+        issues = validate_project(data)
+        for key_issues in issues.values():
+            for issue in key_issues:
+                if issue.level == ERROR:
+                    print(f"{issue.key}: {issue.message}")
+        return not has_errors(issues)
     
     def load_project_data(self, data):
         """加载项目数据到界面"""
         if not data:
             return
         
-        # 基本信息
-        self.project_name_edit.setText(data.get('project_name', ''))
-        self.project_life_edit.setText(data.get('project_life', ''))
-        self.project_people_edit.setText(data.get('project_people', ''))
-        self.project_scheme_edit.setText(data.get('scheme_count', ''))  # 修正：使用正确的字段名
-        
-        # 财税参数
-        self.vat_rate_edit.setText(data.get('vat_rate', ''))
-        self.income_tax_rate_edit.setText(data.get('income_tax_rate', ''))
-        self.vat_additional_rate_edit.setText(data.get('vat_additional_rate', ''))
-        self.equity_ratio_edit.setText(data.get('equity_ratio', ''))
-        self.loan_rate_edit.setText(data.get('loan_rate', ''))
-        
-        # 财务分析参数
-        self.nominal_discount_rate_edit.setText(data.get('nominal_discount_rate', ''))
-        self.inflation_rate_edit.setText(data.get('inflation_rate', ''))
-        self.inflation_rate_checkbox.setChecked(data.get('inflation_rate_enabled', False))
-        
-        # 价格参数
-        self.oxygen_price_edit.setText(data.get('oxygen_price', ''))
-        self.electricity_sell_price_edit.setText(data.get('electricity_sell_price', ''))
-        self.electricity_buy_price_edit.setText(data.get('electricity_buy_price', ''))
-        self.hydrogen_price_edit.setText(data.get('hydrogen_price', ''))
-        
-        # 成本参数
-        self.site_cost_edit.setText(data.get('site_cost', ''))
-        self.construction_cost_edit.setText(data.get('construction_cost', ''))
-        self.personnel_cost_edit.setText(data.get('personnel_cost', ''))
-        self.site_cost_checkbox.setChecked(data.get('site_cost_enabled', False))
-        self.construction_cost_checkbox.setChecked(data.get('construction_cost_enabled', False))
-        
-        # 系统拓扑
-        self.wind_turbine_checkbox.setChecked(data.get('wind_turbine', False))
-        self.pv_checkbox.setChecked(data.get('pv', False))
-        # 电解槽和氢储能系统是必选的，不需要设置
-        self.fuel_cell_checkbox.setChecked(data.get('fuel_cell', False))
-        self.battery_storage_checkbox.setChecked(data.get('battery_storage', False))
-        self.external_grid_checkbox.setChecked(data.get('external_grid', True))
-        self.external_hydrogen_checkbox.setChecked(data.get('external_hydrogen', True))
-        
-        # 消费侧
-        self.oxygen_sell_checkbox.setChecked(data.get('oxygen_load', False))
-        self.ammonia_checkbox.setChecked(data.get('ammonia_load', False))
-        self.methanol_checkbox.setChecked(data.get('methanol_load', False))
-        self.oil_processing_checkbox.setChecked(data.get('oil_refining_load', False))
-        self.fuel_cell_vehicle_checkbox.setChecked(data.get('vehicle_hydrogen_load', False))
-        self.steel_making_checkbox.setChecked(data.get('steel_load', False))
-        self.other_hydrogen_checkbox.setChecked(data.get('other_hydrogen_load', False))
-        self.internal_power_checkbox.setChecked(data.get('electrical_load', False))
-        
-        # 设备参数
-        self.wt_lifetime_edit.setText(data.get('wt_lifetime', ''))
-        self.wt_investment_cost_edit.setText(data.get('wt_investment_cost', ''))
-        self.wt_maintenance_cost_edit.setText(data.get('wt_maintenance_cost', ''))
-        self.wt_residual_value_edit.setText(data.get('wt_residual_value', ''))
-        self.wt_total_capacity_edit.setText(data.get('wt_total_capacity', ''))
-        
-        self.pv_lifetime_edit.setText(data.get('pv_lifetime', ''))
-        self.pv_investment_cost_edit.setText(data.get('pv_investment_cost', ''))
-        self.pv_maintenance_cost_edit.setText(data.get('pv_maintenance_cost', ''))
-        self.pv_residual_value_edit.setText(data.get('pv_residual_value', ''))
-        self.pv_total_capacity_edit.setText(data.get('pv_total_capacity', ''))
-        
-        self.ess_efficiency_edit.setText(data.get('ess_efficiency', ''))
-        self.ess_operation_cost_edit.setText(data.get('ess_operation_cost', ''))
-        self.ess_lifetime_edit.setText(data.get('ess_lifetime', ''))
-        self.ess_investment_cost_edit.setText(data.get('ess_investment_cost', ''))
-        self.ess_residual_value_edit.setText(data.get('ess_residual_value', ''))
-        self.ess_total_capacity_edit.setText(data.get('ess_capacity', ''))
+        # 加载期间屏蔽逐字段的更新信号，数据来自磁盘，无需回写
+        with self.bulk_update(emit=False):
+        
+            # 基本信息
+            self.project_name_edit.setText(data.get('project_name', ''))
+            self.project_life_edit.setText(data.get('project_life', ''))
+            self.project_people_edit.setText(data.get('project_people', ''))
+            self.project_scheme_edit.setText(data.get('scheme_count', ''))  # 修正：使用正确的字段名
+        
+            # 财税参数
+            self.vat_rate_edit.setText(data.get('vat_rate', ''))
+            self.income_tax_rate_edit.setText(data.get('income_tax_rate', ''))
+            self.vat_additional_rate_edit.setText(data.get('vat_additional_rate', ''))
+            self.equity_ratio_edit.setText(data.get('equity_ratio', ''))
+            self.loan_rate_edit.setText(data.get('loan_rate', ''))
+            self.loan_term_edit.setText(data.get('loan_term', ''))
+            self.grace_period_edit.setText(data.get('grace_period', ''))
+            self.repayment_method_combo.setCurrentIndex(
+                max(self.repayment_method_combo.findText(data.get('repayment_method', '')), 0))
+        
+            # 财务分析参数
+            self.nominal_discount_rate_edit.setText(data.get('nominal_discount_rate', ''))
+            self.inflation_rate_edit.setText(data.get('inflation_rate', ''))
+            self.inflation_rate_checkbox.setChecked(data.get('inflation_rate_enabled', False))
+            self.dispatch_mode_combo.setCurrentIndex(
+                max(self.dispatch_mode_combo.findText(data.get('dispatch_mode', '')), 0))
+        
+            # 价格参数
+            self.oxygen_price_edit.setText(data.get('oxygen_price', ''))
+            self.electricity_sell_price_edit.setText(data.get('electricity_sell_price', ''))
+            self.electricity_buy_price_edit.setText(data.get('electricity_buy_price', ''))
+            self.hydrogen_price_edit.setText(data.get('hydrogen_price', ''))
+        
+            # 成本参数
+            self.site_cost_edit.setText(data.get('site_cost', ''))
+            self.construction_cost_edit.setText(data.get('construction_cost', ''))
+            self.personnel_cost_edit.setText(data.get('personnel_cost', ''))
+            self.site_cost_checkbox.setChecked(data.get('site_cost_enabled', False))
+            self.construction_cost_checkbox.setChecked(data.get('construction_cost_enabled', False))
+        
+            # 系统拓扑
+            self.wind_turbine_checkbox.setChecked(data.get('wind_turbine', False))
+            self.pv_checkbox.setChecked(data.get('pv', False))
+            # 电解槽和氢储能系统是必选的，不需要设置
+            self.fuel_cell_checkbox.setChecked(data.get('fuel_cell', False))
+            self.battery_storage_checkbox.setChecked(data.get('battery_storage', False))
+            self.external_grid_checkbox.setChecked(data.get('external_grid', True))
+            self.external_hydrogen_checkbox.setChecked(data.get('external_hydrogen', True))
+        
+            # 消费侧
+            self.oxygen_sell_checkbox.setChecked(data.get('oxygen_load', False))
+            self.ammonia_checkbox.setChecked(data.get('ammonia_load', False))
+            self.methanol_checkbox.setChecked(data.get('methanol_load', False))
+            self.oil_processing_checkbox.setChecked(data.get('oil_refining_load', False))
+            self.fuel_cell_vehicle_checkbox.setChecked(data.get('vehicle_hydrogen_load', False))
+            self.steel_making_checkbox.setChecked(data.get('steel_load', False))
+            self.other_hydrogen_checkbox.setChecked(data.get('other_hydrogen_load', False))
+            self.internal_power_checkbox.setChecked(data.get('electrical_load', False))
+        
+            # 设备参数
+            self.wt_lifetime_edit.setText(data.get('wt_lifetime', ''))
+            self.wt_investment_cost_edit.setText(data.get('wt_investment_cost', ''))
+            self.wt_maintenance_cost_edit.setText(data.get('wt_maintenance_cost', ''))
+            self.wt_residual_value_edit.setText(data.get('wt_residual_value', ''))
+            self.wt_total_capacity_edit.setText(data.get('wt_total_capacity', ''))
+        
+            self.pv_lifetime_edit.setText(data.get('pv_lifetime', ''))
+            self.pv_investment_cost_edit.setText(data.get('pv_investment_cost', ''))
+            self.pv_maintenance_cost_edit.setText(data.get('pv_maintenance_cost', ''))
+            self.pv_residual_value_edit.setText(data.get('pv_residual_value', ''))
+            self.pv_total_capacity_edit.setText(data.get('pv_total_capacity', ''))
+        
+            self.ess_efficiency_edit.setText(data.get('ess_efficiency', ''))
+            self.ess_operation_cost_edit.setText(data.get('ess_operation_cost', ''))
+            self.ess_lifetime_edit.setText(data.get('ess_lifetime', ''))
+            self.ess_investment_cost_edit.setText(data.get('ess_investment_cost', ''))
+            self.ess_residual_value_edit.setText(data.get('ess_residual_value', ''))
+            self.ess_total_capacity_edit.setText(data.get('ess_capacity', ''))
 
-        self.hes_lifetime_edit.setText(data.get('hes_lifetime', ''))
-        self.hes_investment_cost_edit.setText(data.get('hes_investment_cost', ''))
-        self.hes_maintenance_cost_edit.setText(data.get('hes_maintenance_cost', ''))
-        self.hes_residual_value_edit.setText(data.get('hes_residual_value', ''))
-        self.hes_total_capacity_edit.setText(data.get('hes_capacity', ''))  # 修正：使用正确的字段名
+            self.hes_lifetime_edit.setText(data.get('hes_lifetime', ''))
+            self.hes_investment_cost_edit.setText(data.get('hes_investment_cost', ''))
+            self.hes_maintenance_cost_edit.setText(data.get('hes_maintenance_cost', ''))
+            self.hes_residual_value_edit.setText(data.get('hes_residual_value', ''))
+            self.hes_total_capacity_edit.setText(data.get('hes_capacity', ''))  # 修正：使用正确的字段名
     
-        self.el_lifetime_edit.setText(data.get('el_lifetime', ''))
-        self.el_efficiency_edit.setText(data.get('el_efficiency', ''))
-        self.el_investment_cost_edit.setText(data.get('el_investment_cost', ''))
-        self.el_maintenance_cost_edit.setText(data.get('el_maintenance_cost', ''))
-        self.el_residual_value_edit.setText(data.get('el_residual_value', ''))
-        self.el_total_capacity_edit.setText(data.get('el_capacity', ''))  # 修正：使用正确的字段名
-        
-        self.hfc_lifetime_edit.setText(data.get('hfc_lifetime', ''))
-        self.hfc_investment_cost_edit.setText(data.get('hfc_investment_cost', ''))
-        self.hfc_maintenance_cost_edit.setText(data.get('hfc_maintenance_cost', ''))
-        self.hfc_residual_value_edit.setText(data.get('hfc_residual_value', ''))
-        self.hfc_total_capacity_edit.setText(data.get('hfc_capacity', ''))  # 修正：使用正确的字段名
+            self.el_lifetime_edit.setText(data.get('el_lifetime', ''))
+            self.el_efficiency_edit.setText(data.get('el_efficiency', ''))
+            self.el_investment_cost_edit.setText(data.get('el_investment_cost', ''))
+            self.el_maintenance_cost_edit.setText(data.get('el_maintenance_cost', ''))
+            self.el_residual_value_edit.setText(data.get('el_residual_value', ''))
+            self.el_total_capacity_edit.setText(data.get('el_capacity', ''))  # 修正：使用正确的字段名
+        
+            self.hfc_lifetime_edit.setText(data.get('hfc_lifetime', ''))
+            self.hfc_investment_cost_edit.setText(data.get('hfc_investment_cost', ''))
+            self.hfc_maintenance_cost_edit.setText(data.get('hfc_maintenance_cost', ''))
+            self.hfc_residual_value_edit.setText(data.get('hfc_residual_value', ''))
+            self.hfc_total_capacity_edit.setText(data.get('hfc_capacity', ''))  # 修正：使用正确的字段名
 
-        # 电力电子接口装置参数
-        self.wt_power_electronics_checkbox.setChecked(data.get('wt_power_electronics_enabled', False))
-        self.wt_power_electronics_edit.setText(data.get('wt_power_electronics_ratio', ''))
+            # 电力电子接口装置参数
+            self.wt_power_electronics_checkbox.setChecked(data.get('wt_power_electronics_enabled', False))
+            self.wt_power_electronics_edit.setText(data.get('wt_power_electronics_ratio', ''))
         
-        self.pv_power_electronics_checkbox.setChecked(data.get('pv_power_electronics_enabled', False))
-        self.pv_power_electronics_edit.setText(data.get('pv_power_electronics_ratio', ''))
+            self.pv_power_electronics_checkbox.setChecked(data.get('pv_power_electronics_enabled', False))
+            self.pv_power_electronics_edit.setText(data.get('pv_power_electronics_ratio', ''))
         
-        self.el_power_electronics_checkbox.setChecked(data.get('el_power_electronics_enabled', False))
-        self.el_power_electronics_edit.setText(data.get('el_power_electronics_ratio', ''))
+            self.el_power_electronics_checkbox.setChecked(data.get('el_power_electronics_enabled', False))
+            self.el_power_electronics_edit.setText(data.get('el_power_electronics_ratio', ''))
         
-        self.hfc_power_electronics_checkbox.setChecked(data.get('hfc_power_electronics_enabled', False))
-        self.hfc_power_electronics_edit.setText(data.get('hfc_power_electronics_ratio', ''))
+            self.hfc_power_electronics_checkbox.setChecked(data.get('hfc_power_electronics_enabled', False))
+            self.hfc_power_electronics_edit.setText(data.get('hfc_power_electronics_ratio', ''))
         
-        self.ess_power_electronics_checkbox.setChecked(data.get('ess_power_electronics_enabled', False))
-        self.ess_power_electronics_edit.setText(data.get('ess_power_electronics_ratio', ''))
+            self.ess_power_electronics_checkbox.setChecked(data.get('ess_power_electronics_enabled', False))
+            self.ess_power_electronics_edit.setText(data.get('ess_power_electronics_ratio', ''))
+        
+        # 标出加载数据中的无效数值
+        self.check_series_inputs()
     
     def reset_form(self):
         """重置表单"""
-        # 清空所有输入框
-        for widget in self.findChildren(QLineEdit):
-            widget.clear()
-        
-        # 重置所有复选框
-        for widget in self.findChildren(QCheckBox):
-            widget.setChecked(False)
-        
-        # 设置默认项目名称
-        self.project_name_edit.setText("新项目_" + str(hash(self))[-6:])
-        
-        # 设置系统拓扑设计下的所有条目默认选中
-        self.wind_turbine_checkbox.setChecked(True)
-        self.pv_checkbox.setChecked(True)
-        self.fuel_cell_checkbox.setChecked(True)
-        self.battery_storage_checkbox.setChecked(True)
-        self.external_grid_checkbox.setChecked(True)
-        self.external_hydrogen_checkbox.setChecked(True)
-        
-        # 设置消费侧设计下的所有条目默认选中
-        self.oxygen_sell_checkbox.setChecked(True)
-        self.ammonia_checkbox.setChecked(True)
-        self.methanol_checkbox.setChecked(True)
-        self.oil_processing_checkbox.setChecked(True)
-        self.fuel_cell_vehicle_checkbox.setChecked(True)
-        self.steel_making_checkbox.setChecked(True)
-        self.other_hydrogen_checkbox.setChecked(True)
-        self.internal_power_checkbox.setChecked(True)
-        
-        # 设置财税与融资参数默认值
-        self.vat_rate_edit.setText("13")
-        self.income_tax_rate_edit.setText("25")
-        self.vat_additional_rate_edit.setText("3.14")
-        self.loan_rate_edit.setText("4.9")
-        
-        # 设置财务分析参数默认值
-        self.nominal_discount_rate_edit.setText("8")
-        self.inflation_rate_checkbox.setChecked(True)
-        self.inflation_rate_edit.setText("2")
-        
-        # 设置价格参数默认值
-        self.oxygen_price_edit.setText(",".join(["0.5"] * 24))
-        self.electricity_sell_price_edit.setText(",".join(["0.3"] * 24))
-        # 电能的购买价格不设置默认值，保持为空
-        self.electricity_buy_price_edit.setText("")
-        self.hydrogen_price_edit.setText(",".join(["33.4"] * 24))
-        
-        # 设置WT默认值
-        self.wt_power_electronics_checkbox.setChecked(True)
-        self.wt_power_electronics_edit.setText("5")
-        self.wt_residual_value_edit.setText("5")
-        
-        # 设置PV默认值
-        self.pv_power_electronics_checkbox.setChecked(True)
-        self.pv_power_electronics_edit.setText("5")
-        self.pv_residual_value_edit.setText("5")
-        
-        # 设置EL默认值
-        self.el_efficiency_edit.setText("33.4")
-        self.el_power_electronics_checkbox.setChecked(True)
-        self.el_power_electronics_edit.setText("5")
-        self.el_residual_value_edit.setText("5")
-        
-        # 设置HES默认值
-        self.hes_residual_value_edit.setText("5")
-        
-        # 设置HFC默认值
-        self.hfc_power_electronics_checkbox.setChecked(True)
-        self.hfc_power_electronics_edit.setText("5")
-        self.hfc_residual_value_edit.setText("5")
-        
-        # 设置ESS默认值
-        self.ess_efficiency_edit.setText("90")
-        self.ess_power_electronics_checkbox.setChecked(True)
-        self.ess_power_electronics_edit.setText("5")
-        self.ess_residual_value_edit.setText("5")
+        # 重置期间屏蔽逐字段的更新信号，结束后合并为一次更新
+        with self.bulk_update():
+            # 清空所有输入框
+            for widget in self.findChildren(QLineEdit):
+                widget.clear()
+        
+            # 重置所有复选框
+            for widget in self.findChildren(QCheckBox):
+                widget.setChecked(False)
+        
+            # 设置默认项目名称
+            self.project_name_edit.setText("新项目_" + str(hash(self))[-6:])
+        
+            # 设置系统拓扑设计下的所有条目默认选中
+            self.wind_turbine_checkbox.setChecked(True)
+            self.pv_checkbox.setChecked(True)
+            self.fuel_cell_checkbox.setChecked(True)
+            self.battery_storage_checkbox.setChecked(True)
+            self.external_grid_checkbox.setChecked(True)
+            self.external_hydrogen_checkbox.setChecked(True)
+        
+            # 设置消费侧设计下的所有条目默认选中
+            self.oxygen_sell_checkbox.setChecked(True)
+            self.ammonia_checkbox.setChecked(True)
+            self.methanol_checkbox.setChecked(True)
+            self.oil_processing_checkbox.setChecked(True)
+            self.fuel_cell_vehicle_checkbox.setChecked(True)
+            self.steel_making_checkbox.setChecked(True)
+            self.other_hydrogen_checkbox.setChecked(True)
+            self.internal_power_checkbox.setChecked(True)
+        
+            # 设置财税与融资参数默认值
+            self.vat_rate_edit.setText("13")
+            self.income_tax_rate_edit.setText("25")
+            self.vat_additional_rate_edit.setText("3.14")
+            self.loan_rate_edit.setText("4.9")
+            self.loan_term_edit.setText("10")
+            self.grace_period_edit.setText("0")
+            self.repayment_method_combo.setCurrentIndex(0)
+        
+            # 设置财务分析参数默认值
+            self.nominal_discount_rate_edit.setText("8")
+            self.inflation_rate_checkbox.setChecked(True)
+            self.inflation_rate_edit.setText("2")
+            self.dispatch_mode_combo.setCurrentIndex(0)
+        
+            # 设置价格参数默认值
+            self.oxygen_price_edit.setText(",".join(["0.5"] * 24))
+            self.electricity_sell_price_edit.setText(",".join(["0.3"] * 24))
+            # 电能的购买价格不设置默认值，保持为空
+            self.electricity_buy_price_edit.setText("")
+            self.hydrogen_price_edit.setText(",".join(["33.4"] * 24))
+        
+            # 设置WT默认值
+            self.wt_power_electronics_checkbox.setChecked(True)
+            self.wt_power_electronics_edit.setText("5")
+            self.wt_residual_value_edit.setText("5")
+        
+            # 设置PV默认值
+            self.pv_power_electronics_checkbox.setChecked(True)
+            self.pv_power_electronics_edit.setText("5")
+            self.pv_residual_value_edit.setText("5")
+        
+            # 设置EL默认值
+            self.el_efficiency_edit.setText("33.4")
+            self.el_power_electronics_checkbox.setChecked(True)
+            self.el_power_electronics_edit.setText("5")
+            self.el_residual_value_edit.setText("5")
+        
+            # 设置HES默认值
+            self.hes_residual_value_edit.setText("5")
+        
+            # 设置HFC默认值
+            self.hfc_power_electronics_checkbox.setChecked(True)
+            self.hfc_power_electronics_edit.setText("5")
+            self.hfc_residual_value_edit.setText("5")
+        
+            # 设置ESS默认值
+            self.ess_efficiency_edit.setText("90")
+            self.ess_power_electronics_checkbox.setChecked(True)
+            self.ess_power_electronics_edit.setText("5")
+            self.ess_residual_value_edit.setText("5")
+        
+        self.check_series_inputs()
 
     def create_el_parameters(self, parent_layout):
         """创建电解槽参数组"""
@@ -1136,7 +1251,7 @@ class ProjectDesignPage(QWidget):
         
         # 说明文字和配置容量
         note_label = QLabel("※在输入框中输入各方案EL容量，使用半角逗号\",\"隔开")
-        note_label.setStyleSheet("QLabel { color: #666; font-size: 9pt; }")
+        set_style_class(note_label, "note")
         layout.addWidget(note_label, 7, 0, 1, 2)
         
         layout.addWidget(QLabel("电解槽配置容量（kW）"), 8, 0)
@@ -0,0 +1,94 @@
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from project_store import open_project_store, OUTPUT_TABLE_NAMES
+
+
+class ProjectLoadWorker(QObject):
+    """在后台线程中分阶段读取项目：先读取两个JSON文件，再逐个读取时序数据和输出表格"""
+
+    json_loaded = pyqtSignal(object, object)       # (User_input.json 数据, IndicatorSystem.json 数据)
+    timeseries_loaded = pyqtSignal(str, object)    # (时序数据名称, 数组或None)
+    output_loaded = pyqtSignal(str, object)        # (输出表格名称, 行列表或None)
+    progress = pyqtSignal(int, int, str)           # (已完成, 总数, 说明)
+    finished = pyqtSignal(bool, str)               # (是否成功, 错误信息)
+
+    def __init__(self, project_path):
+        super().__init__()
+        self.project_path = project_path
+        self._cancelled = False
+
+    def cancel(self):
+        """请求取消，当前这一项读完后停止"""
+        self._cancelled = True
+
+    def run(self):
+        # 后台线程使用独立的存储实例（SQLite连接不能跨线程使用）
+        try:
+            store = open_project_store(self.project_path)
+        except Exception as e:
+            self.finished.emit(False, str(e))
+            return
+
+        try:
+            # 第一阶段：项目参数和指标数据
+            self.json_loaded.emit(store.read_user_input(), store.read_indicator_system())
+
+            # 第二阶段：时序数据和上次的计算结果
+            names = store.list_timeseries()
+            total = len(names) + len(OUTPUT_TABLE_NAMES)
+            done = 0
+            for name in names:
+                if self._cancelled:
+                    break
+                self.progress.emit(done, total, f"正在读取 {name}")
+                self.timeseries_loaded.emit(name, store.read_timeseries(name))
+                done += 1
+            for name in OUTPUT_TABLE_NAMES:
+                if self._cancelled:
+                    break
+                self.progress.emit(done, total, f"正在读取 {name}")
+                self.output_loaded.emit(name, store.read_output_table(name))
+                done += 1
+            self.progress.emit(done, total, "")
+            self.finished.emit(True, "")
+        except Exception as e:
+            self.finished.emit(False, str(e))
+        finally:
+            store.close()
+
+
+class ProjectLoader(QObject):
+    """管理项目加载线程，对外转发后台读取的各阶段信号"""
+
+    def __init__(self, project_path, parent=None):
+        super().__init__(parent)
+        self.project_path = project_path
+        self.worker = ProjectLoadWorker(project_path)
+        self.thread = QThread()
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.run)
+        self.worker.finished.connect(self.thread.quit)
+        self.thread.finished.connect(self.worker.deleteLater)
+        self.thread.finished.connect(self.thread.deleteLater)
+
+        # 便于调用方直接连接
+        self.json_loaded = self.worker.json_loaded
+        self.timeseries_loaded = self.worker.timeseries_loaded
+        self.output_loaded = self.worker.output_loaded
+        self.progress = self.worker.progress
+        self.finished = self.worker.finished
+
+    def start(self):
+        """开始加载"""
+        self.thread.start()
+
+    def cancel(self):
+        """取消加载"""
+        self.worker.cancel()
+
+    def is_running(self):
+        return self.thread.isRunning()
+
+    def wait(self, msecs=5000):
+        """等待后台线程结束（关闭窗口时使用）"""
+        return self.thread.wait(msecs)
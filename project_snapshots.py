@@ -0,0 +1,263 @@
+import io
+import os
+import json
+import time
+import zlib
+import hashlib
+import numpy as np
+
+from project_store import OUTPUT_TABLE_NAMES
+from evaluation_checkpoint import is_checkpoint
+
+# 快照目录：项目文件夹内的 .snapshots，单文件项目旁的 <文件名>.snapshots
+SNAPSHOT_FOLDER = ".snapshots"
+
+# 快照清单中按内容寻址的部分
+MANIFEST_PARTS = ("user_input", "indicator_system", "timeseries", "arrays", "outputs")
+
+
+def snapshot_root(project_path):
+    """获取项目的快照目录"""
+    if os.path.isdir(project_path):
+        return os.path.join(project_path, SNAPSHOT_FOLDER)
+    return project_path + SNAPSHOT_FOLDER
+
+
+def encode_json(value):
+    """JSON对象的规范化字节表示"""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def encode_array(values):
+    """时序数组的字节表示，包含形状和类型"""
+    buffer = io.BytesIO()
+    np.save(buffer, np.ascontiguousarray(values, dtype='<f8'), allow_pickle=False)
+    return buffer.getvalue()
+
+
+def decode_array(data):
+    return np.load(io.BytesIO(data), allow_pickle=False)
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _content(manifest, part):
+    """清单中的一部分，不含旧版本快照保存的评估检查点"""
+    entries = manifest.get(part, {})
+    if part == "arrays":
+        return {name: digest for name, digest in entries.items() if not is_checkpoint(name)}
+    return entries
+
+
+class SnapshotStore:
+    """项目快照存储，相同的JSON分区和时序数据只保存一份，磁盘占用只随实际变化增长"""
+
+    def __init__(self, root):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.snapshots_dir = os.path.join(root, "snapshots")
+        self.index_path = os.path.join(root, "index.json")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+        self._index = None
+
+    # ---- 对象存储 ----
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def put_object(self, data):
+        """保存对象，返回其SHA-256摘要，已存在的对象不重复写入"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _write_atomic(path, zlib.compress(data, 6))
+        return digest
+
+    def get_object(self, digest):
+        """读取对象"""
+        with open(self.object_path(digest), 'rb') as f:
+            return zlib.decompress(f.read())
+
+    def get_json(self, digest):
+        return json.loads(self.get_object(digest).decode('utf-8'))
+
+    def get_array(self, digest):
+        return decode_array(self.get_object(digest))
+
+    # ---- 时序文件状态缓存 ----
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        _write_atomic(self.index_path, encode_json(self._load_index()))
+
+    def _cached_digest(self, store, name):
+        """按文件修改时间和大小命中缓存时直接返回摘要，避免重新读取xlsx"""
+        stamp = store.timeseries_stamp(name)
+        cached = self._load_index().get(name)
+        if stamp is not None and cached and cached[:2] == list(stamp):
+            return True, cached[2]
+        return False, None
+
+    def _remember(self, store, name, digest):
+        stamp = store.timeseries_stamp(name)
+        if stamp is not None:
+            self._load_index()[name] = [*stamp, digest]
+
+    def timeseries_digest(self, store, name):
+        """保存时序数据并返回其摘要，数据为空时返回None"""
+        hit, digest = self._cached_digest(store, name)
+        if hit:
+            return digest
+        values = store.read_timeseries(name)
+        digest = None if values is None else self.put_object(encode_array(values))
+        self._remember(store, name, digest)
+        return digest
+
+    # ---- 快照 ----
+
+    def build_manifest(self, store):
+        """保存项目当前状态的全部对象并生成清单，未引用的对象由 gc 回收"""
+        put = self.put_object
+        manifest = {
+            "user_input": {section: put(encode_json(value))
+                           for section, value in store.read_user_input().items()},
+            "indicator_system": {category: put(encode_json(value))
+                                 for category, value in store.read_indicator_system().items()},
+            "timeseries": {},
+            # 评估检查点只是中间结果，不进入快照
+            "arrays": {name: put(encode_array(store.read_array(name)))
+                       for name in store.list_arrays() if not is_checkpoint(name)},
+            "outputs": {}
+        }
+        for name in store.list_timeseries():
+            digest = self.timeseries_digest(store, name)
+            if digest is not None:
+                manifest["timeseries"][name] = digest
+        for name in OUTPUT_TABLE_NAMES:
+            rows = store.read_output_table(name)
+            if rows:
+                manifest["outputs"][name] = put(encode_json(rows))
+        self._save_index()
+        return manifest
+
+    def create(self, store, name="", note=""):
+        """为项目当前状态创建快照，返回快照ID"""
+        manifest = self.build_manifest(store)
+        created = time.time()
+        digest = hashlib.sha256(encode_json(manifest)).hexdigest()
+        snapshot_id = time.strftime("%Y%m%d_%H%M%S", time.localtime(created)) + "_" + digest[:8]
+        snapshot = {"id": snapshot_id, "name": name or snapshot_id, "note": note,
+                    "created": created, **manifest}
+        _write_atomic(os.path.join(self.snapshots_dir, f"{snapshot_id}.json"), encode_json(snapshot))
+        return snapshot_id
+
+    def load(self, snapshot_id):
+        """读取快照清单"""
+        with open(os.path.join(self.snapshots_dir, f"{snapshot_id}.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def list(self):
+        """列出全部快照，按创建时间排序"""
+        snapshots = []
+        for filename in os.listdir(self.snapshots_dir):
+            if filename.endswith(".json"):
+                snapshot = self.load(filename[:-5])
+                snapshots.append({key: snapshot[key] for key in ("id", "name", "note", "created")})
+        snapshots.sort(key=lambda s: s["created"])
+        return snapshots
+
+    def delete(self, snapshot_id):
+        """删除快照，对象由 gc 回收"""
+        os.remove(os.path.join(self.snapshots_dir, f"{snapshot_id}.json"))
+
+    def gc(self):
+        """删除不再被任何快照引用的对象，返回删除数量"""
+        referenced = set()
+        for filename in os.listdir(self.snapshots_dir):
+            if filename.endswith(".json"):
+                snapshot = self.load(filename[:-5])
+                for part in MANIFEST_PARTS:
+                    referenced.update(snapshot.get(part, {}).values())
+
+        removed = 0
+        for prefix in os.listdir(self.objects_dir):
+            prefix_dir = os.path.join(self.objects_dir, prefix)
+            for rest in os.listdir(prefix_dir):
+                if prefix + rest not in referenced:
+                    os.remove(os.path.join(prefix_dir, rest))
+                    removed += 1
+        return removed
+
+    def diff(self, old, new):
+        """比较两个清单，返回各部分新增、删除和修改的条目，User_input 中修改的分区细化到参数"""
+        result = {}
+        for part in MANIFEST_PARTS:
+            old_part, new_part = _content(old, part), _content(new, part)
+            changed = [key for key in new_part if key in old_part and old_part[key] != new_part[key]]
+            result[part] = {
+                "added": [key for key in new_part if key not in old_part],
+                "removed": [key for key in old_part if key not in new_part],
+                "changed": changed
+            }
+
+        parameters = []
+        for section in result["user_input"]["changed"]:
+            old_section = self.get_json(old["user_input"][section])
+            new_section = self.get_json(new["user_input"][section])
+            if not (isinstance(old_section, dict) and isinstance(new_section, dict)):
+                parameters.append(section)
+                continue
+            for name in dict.fromkeys([*old_section, *new_section]):
+                if old_section.get(name) != new_section.get(name):
+                    parameters.append(f"{section}.{name}")
+        result["parameters"] = parameters
+        return result
+
+    def restore(self, snapshot_id, store):
+        """把快照恢复到项目存储，内容未变化的时序数据不重写"""
+        snapshot = self.load(snapshot_id)
+        store.write_user_input({section: self.get_json(digest)
+                                for section, digest in snapshot["user_input"].items()})
+        store.write_indicator_system({category: self.get_json(digest)
+                                      for category, digest in snapshot["indicator_system"].items()})
+
+        target = snapshot["timeseries"]
+        for name in dict.fromkeys([*store.list_timeseries(), *target]):
+            digest = target.get(name)
+            if self.timeseries_digest(store, name) == digest:
+                continue
+            store.write_timeseries(name, None if digest is None else self.get_array(digest))
+            self._remember(store, name, digest)
+
+        # 价格曲线等二进制数据较小，直接按快照内容重写；
+        # 评估检查点按恢复前的参数计算，随之清除（旧版本快照中的检查点也不恢复）
+        arrays = _content(snapshot, "arrays")
+        for name in dict.fromkeys([*store.list_arrays(), *arrays]):
+            digest = arrays.get(name)
+            store.write_array(name, None if digest is None else self.get_array(digest))
+
+        # 快照中没有的输出表格（快照时为空）写为空表，清除快照之后生成的结果
+        outputs = snapshot["outputs"]
+        for name in OUTPUT_TABLE_NAMES:
+            digest = outputs.get(name)
+            if digest is not None:
+                store.write_output_table(name, self.get_json(digest))
+            elif store.read_output_table(name):
+                store.write_output_table(name, [])
+        self._save_index()
+        return snapshot
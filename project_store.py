@@ -0,0 +1,331 @@
+import os
+import json
+import numpy as np
+from openpyxl import Workbook, load_workbook
+
+USER_INPUT_FILE = "User_input.json"
+INDICATOR_SYSTEM_FILE = "IndicatorSystem.json"
+OUTPUT_FOLDER = "输出表格"
+ARRAY_FOLDER = "数据文件"
+# 时序数据的列式副本（.npy），与xlsx中较新的一份为准
+TIMESERIES_CACHE_FOLDER = os.path.join(ARRAY_FOLDER, "时序")
+
+# 项目输入时序数据，名称即xlsx文件名（不含扩展名）
+TIMESERIES_NAMES = [
+    "ESS-电储能装置充放功率(kW·h)",
+    "HES-氢储能装置加氢放氢(kg)",
+    "PV-光伏机组出力(kW)",
+    "WT-风力发电单元出力(kW)",
+    "外部能源网-系统与外部氢源的交互质量(kg)",
+    "外部能源网-系统与外部电网的交互功率(kW)",
+    "氢负荷-合成氨所耗氢气质量(kg)",
+    "氢负荷-氢燃料电池汽车加氢所耗氢气质量(kg)",
+    "氢负荷-生产甲醇所耗氢气质量(kg)",
+    "氢负荷-用于其他方面的销售氢气年总质量(kg)",
+    "氢负荷-用于炼油所耗氢气质量(kg)",
+    "氢负荷-用于钢铁冶炼所耗氢气质量(kg)",
+    "氧负荷-销售氧气的质量(kg)",
+    "电负荷-电负荷所消耗的功率(kW)"
+]
+
+# 时序数据对应的拓扑选择字段（界面字段键），未选择的设备或负荷不参与计算
+TIMESERIES_SELECTION = {
+    "ESS-电储能装置充放功率(kW·h)": 'battery_storage',
+    "HES-氢储能装置加氢放氢(kg)": 'hydrogen_storage',
+    "PV-光伏机组出力(kW)": 'pv',
+    "WT-风力发电单元出力(kW)": 'wind_turbine',
+    "外部能源网-系统与外部氢源的交互质量(kg)": 'external_hydrogen',
+    "外部能源网-系统与外部电网的交互功率(kW)": 'external_grid',
+    "氢负荷-合成氨所耗氢气质量(kg)": 'ammonia_load',
+    "氢负荷-氢燃料电池汽车加氢所耗氢气质量(kg)": 'vehicle_hydrogen_load',
+    "氢负荷-生产甲醇所耗氢气质量(kg)": 'methanol_load',
+    "氢负荷-用于其他方面的销售氢气年总质量(kg)": 'other_hydrogen_load',
+    "氢负荷-用于炼油所耗氢气质量(kg)": 'oil_refining_load',
+    "氢负荷-用于钢铁冶炼所耗氢气质量(kg)": 'steel_load',
+    "氧负荷-销售氧气的质量(kg)": 'oxygen_load',
+    "电负荷-电负荷所消耗的功率(kW)": 'electrical_load',
+}
+
+# 输出表格名称
+OUTPUT_TABLE_NAMES = ["利润表", "成本费用表", "现金流量表", "还本付息表"]
+
+SHEET_TITLE = "数据"
+
+
+def read_json(path):
+    """读取JSON文件"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_json(path, data):
+    """写入JSON文件"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def read_xlsx_series(path):
+    """读取时序xlsx，第一行为方案表头，之后每行为一个小时，返回 (小时数, 方案数) 数组，空表返回None"""
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[SHEET_TITLE] if SHEET_TITLE in wb.sheetnames else wb.active
+        rows = [row for row in ws.iter_rows(values_only=True)
+                if any(v is not None for v in row)]
+    finally:
+        wb.close()
+
+    if rows and not all(isinstance(v, (int, float)) or v is None for v in rows[0]):
+        rows = rows[1:]  # 跳过表头
+    if not rows:
+        return None
+    return np.array([[np.nan if v is None else v for v in row] for row in rows], dtype=np.float64)
+
+
+def write_xlsx_series(path, values):
+    """写入时序xlsx，values 为 (小时数, 方案数) 数组"""
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(SHEET_TITLE)
+    ws.append([f"方案{i + 1}" for i in range(values.shape[1])])
+    for row in values.tolist():
+        ws.append(row)
+    wb.save(path)
+
+
+def write_empty_xlsx(path):
+    """写入空白xlsx"""
+    wb = Workbook()
+    wb.active.title = SHEET_TITLE
+    wb.save(path)
+
+
+def read_xlsx_table(path):
+    """读取输出表格，返回行列表"""
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[SHEET_TITLE] if SHEET_TITLE in wb.sheetnames else wb.active
+        return [list(row) for row in ws.iter_rows(values_only=True)
+                if any(v is not None for v in row)]
+    finally:
+        wb.close()
+
+
+def write_xlsx_table(path, rows):
+    """写入输出表格"""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(SHEET_TITLE)
+    for row in rows:
+        ws.append(list(row))
+    wb.save(path)
+
+
+class FolderProjectStore:
+    """文件夹项目存储：两个JSON文件、14个输入xlsx和4个输出xlsx"""
+
+    def __init__(self, path):
+        self.path = path
+        self._pending_xlsx = set()
+
+    def close(self):
+        """写回尚未导出为xlsx的时序数据"""
+        self.flush()
+
+    def flush(self):
+        """把只写入了列式副本的时序数据导出为xlsx，便于在Excel中查看和编辑"""
+        for name in sorted(self._pending_xlsx):
+            cache_path = self.timeseries_cache_path(name)
+            if os.path.exists(cache_path):
+                write_xlsx_series(self.timeseries_path(name), np.load(cache_path, allow_pickle=False))
+                os.utime(cache_path)  # 保持列式副本为较新的一份
+        self._pending_xlsx.clear()
+
+    def read_user_input(self):
+        """读取 User_input.json"""
+        return read_json(os.path.join(self.path, USER_INPUT_FILE))
+
+    def write_user_input(self, data):
+        """写入 User_input.json"""
+        write_json(os.path.join(self.path, USER_INPUT_FILE), data)
+
+    def read_indicator_system(self):
+        """读取 IndicatorSystem.json"""
+        return read_json(os.path.join(self.path, INDICATOR_SYSTEM_FILE))
+
+    def write_indicator_system(self, data):
+        """写入 IndicatorSystem.json"""
+        write_json(os.path.join(self.path, INDICATOR_SYSTEM_FILE), data)
+
+    def read_indicator_scores(self):
+        """只读取各指标的数值和得分，返回 {指标编码: {...}}"""
+        return indicator_scores(self.read_indicator_system())
+
+    def timeseries_path(self, name):
+        return os.path.join(self.path, f"{name}.xlsx")
+
+    def timeseries_cache_path(self, name):
+        return os.path.join(self.path, TIMESERIES_CACHE_FOLDER, f"{name}.npy")
+
+    def _timeseries_source(self, name):
+        """返回时序数据当前有效的文件路径：列式副本不比xlsx旧时使用列式副本"""
+        xlsx_path = self.timeseries_path(name)
+        cache_path = self.timeseries_cache_path(name)
+        xlsx_mtime = os.stat(xlsx_path).st_mtime_ns if os.path.exists(xlsx_path) else None
+        if os.path.exists(cache_path) and (xlsx_mtime is None or
+                                           os.stat(cache_path).st_mtime_ns >= xlsx_mtime):
+            return cache_path
+        return xlsx_path if xlsx_mtime is not None else None
+
+    def list_timeseries(self):
+        """列出已存在的时序数据名称"""
+        return [name for name in TIMESERIES_NAMES if self._timeseries_source(name)]
+
+    def timeseries_stamp(self, name):
+        """时序文件的 (修改时间, 大小)，用于判断文件是否变化，不存在时返回None"""
+        path = self._timeseries_source(name)
+        if path is None:
+            return None
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def read_timeseries(self, name):
+        """读取时序数据，不存在或为空时返回None；从xlsx读取后保存列式副本，之后直接读取副本"""
+        path = self._timeseries_source(name)
+        if path is None:
+            return None
+        if path.endswith(".npy"):
+            return np.load(path, allow_pickle=False)
+        values = read_xlsx_series(path)
+        if values is not None:
+            cache_path = self.timeseries_cache_path(name)
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            np.save(cache_path, values, allow_pickle=False)
+        return values
+
+    def write_timeseries(self, name, values):
+        """写入时序数据：先写列式副本，xlsx在 flush 时导出"""
+        cache_path = self.timeseries_cache_path(name)
+        if values is None:
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            self._pending_xlsx.discard(name)
+            write_empty_xlsx(self.timeseries_path(name))
+            return
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, None]
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        np.save(cache_path, values, allow_pickle=False)
+        self._pending_xlsx.add(name)
+
+    def array_path(self, name):
+        return os.path.join(self.path, ARRAY_FOLDER, f"{name}.npy")
+
+    def list_arrays(self):
+        """列出二进制数据文件名称"""
+        folder = os.path.join(self.path, ARRAY_FOLDER)
+        if not os.path.isdir(folder):
+            return []
+        return sorted(filename[:-4] for filename in os.listdir(folder) if filename.endswith(".npy"))
+
+    def read_array(self, name):
+        """读取二进制数据文件，不存在时返回None"""
+        path = self.array_path(name)
+        if not os.path.exists(path):
+            return None
+        return np.load(path, allow_pickle=False)
+
+    def write_array(self, name, values):
+        """写入二进制数据文件，values 为None时删除"""
+        path = self.array_path(name)
+        if values is None:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.save(path, np.ascontiguousarray(values, dtype='<f8'), allow_pickle=False)
+
+    def output_table_path(self, name):
+        return os.path.join(self.path, OUTPUT_FOLDER, f"{name}.xlsx")
+
+    def read_output_table(self, name):
+        """读取输出表格，不存在时返回None"""
+        path = self.output_table_path(name)
+        if not os.path.exists(path):
+            return None
+        return read_xlsx_table(path)
+
+    def write_output_table(self, name, rows):
+        """写入输出表格"""
+        os.makedirs(os.path.join(self.path, OUTPUT_FOLDER), exist_ok=True)
+        write_xlsx_table(self.output_table_path(name), rows)
+
+
+def indicator_scores(indicator_system_data):
+    """从 IndicatorSystem.json 数据中提取各指标的数值和得分"""
+    scores = {}
+    for indicators in indicator_system_data.values():
+        if isinstance(indicators, dict):
+            for indicator_info in indicators.values():
+                if isinstance(indicator_info, dict) and "指标编码" in indicator_info:
+                    scores[indicator_info["指标编码"]] = {
+                        "数值": indicator_info.get("数值"),
+                        "综合评估得分分量": indicator_info.get("综合评估得分分量"),
+                        "组合权值": indicator_info.get("组合权值"),
+                        "选择状态": indicator_info.get("选择状态")
+                    }
+    return scores
+
+
+def is_project_path(path):
+    """判断路径是否为可打开的项目（项目文件夹或单文件项目）"""
+    if os.path.isdir(path):
+        return all(os.path.isfile(os.path.join(path, name))
+                   for name in (USER_INPUT_FILE, INDICATOR_SYSTEM_FILE))
+    from archive_project_store import is_archive_project
+    from sqlite_project_store import is_sqlite_project
+    return is_archive_project(path) or is_sqlite_project(path)
+
+
+def open_project_store(path):
+    """按路径类型打开项目存储"""
+    if os.path.isdir(path):
+        return FolderProjectStore(path)
+    from archive_project_store import ArchiveProjectStore, is_archive_project
+    from sqlite_project_store import SQLiteProjectStore, is_sqlite_project
+    if is_archive_project(path):
+        return ArchiveProjectStore(path)
+    if is_sqlite_project(path):
+        return SQLiteProjectStore(path)
+    raise ValueError(f"无法识别的项目路径: {path}")
+
+
+def copy_project(source, target):
+    """在两种项目存储之间复制全部数据"""
+    target.write_user_input(source.read_user_input())
+    target.write_indicator_system(source.read_indicator_system())
+    for name in source.list_timeseries():
+        target.write_timeseries(name, source.read_timeseries(name))
+    for name in source.list_arrays():
+        target.write_array(name, source.read_array(name))
+    for name in OUTPUT_TABLE_NAMES:
+        rows = source.read_output_table(name)
+        if rows is not None:
+            target.write_output_table(name, rows)
+
+
+def export_to_folder(source, folder_path):
+    """把项目存储导出为项目文件夹，缺少的表格补为空白文件"""
+    os.makedirs(os.path.join(folder_path, OUTPUT_FOLDER), exist_ok=True)
+    target = FolderProjectStore(folder_path)
+    copy_project(source, target)
+    target.close()
+    # 补齐空白表格，保持与新建项目相同的文件夹结构
+    for name in TIMESERIES_NAMES:
+        if not os.path.exists(target.timeseries_path(name)):
+            write_empty_xlsx(target.timeseries_path(name))
+    for name in OUTPUT_TABLE_NAMES:
+        if not os.path.exists(target.output_table_path(name)):
+            write_empty_xlsx(target.output_table_path(name))
+    return folder_path
@@ -0,0 +1,374 @@
+import math
+import numpy as np
+from PyQt5.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
+
+from field_schema import USER_INPUT_FIELDS, parse_number
+from financial_inputs import OPTIMAL_DISPATCH
+from dispatch_optimizer import optimal_dispatch_available
+from project_store import TIMESERIES_NAMES, TIMESERIES_SELECTION
+from series_parser import parse_series, describe_bad_positions, HOURS_PER_YEAR, SERIES_LENGTHS
+
+# 问题级别
+ERROR = "error"
+WARNING = "warning"
+
+# 不属于单个输入框的问题（如整体拓扑），只在汇总中显示
+PROJECT_KEY = "project"
+
+REQUIRED_FIELDS = {
+    'project_name': "项目名称",
+    'project_life': "项目生命周期",
+    'project_people': "项目人数",
+    'scheme_count': "评估方案数",
+}
+
+# 必须为正整数的字段
+INTEGER_FIELDS = ('project_life', 'project_people', 'scheme_count', 'loan_term')
+
+# 百分比字段 (0-100)，即界面上单位为（%）的字段
+PERCENTAGE_FIELDS = ('vat_rate', 'income_tax_rate', 'vat_additional_rate', 'equity_ratio',
+                     'loan_rate', 'nominal_discount_rate', 'inflation_rate',
+                     'ess_efficiency',
+                     *(f"{device}_residual_value" for device in ('wt', 'pv', 'el', 'hes', 'hfc', 'ess')),
+                     *(f"{device}_power_electronics_ratio" for device in ('wt', 'pv', 'el', 'hfc', 'ess')))
+
+PRICE_FIELDS = ('oxygen_price', 'electricity_sell_price', 'electricity_buy_price', 'hydrogen_price')
+
+# 设备: (拓扑选择键, 名称, 使用寿命键, 配置容量键)
+DEVICES = [
+    ('wind_turbine', "风力发电单元", 'wt_lifetime', 'wt_total_capacity'),
+    ('pv', "光伏机组", 'pv_lifetime', 'pv_total_capacity'),
+    ('electrolyzer', "电解槽", 'el_lifetime', 'el_capacity'),
+    ('hydrogen_storage', "氢储能系统", 'hes_lifetime', 'hes_capacity'),
+    ('fuel_cell', "氢燃料电池", 'hfc_lifetime', 'hfc_capacity'),
+    ('battery_storage', "电储能系统", 'ess_lifetime', 'ess_capacity'),
+]
+
+# 时序数据: 名称 -> (显示名称, 是否允许负值)，拓扑选择键见 TIMESERIES_SELECTION
+# 储能充放和外部能源网交互有方向，允许负值
+SERIES_TOPOLOGY = {
+    "ESS-电储能装置充放功率(kW·h)": ("电储能系统", True),
+    "HES-氢储能装置加氢放氢(kg)": ("氢储能系统", True),
+    "PV-光伏机组出力(kW)": ("光伏机组", False),
+    "WT-风力发电单元出力(kW)": ("风力发电单元", False),
+    "外部能源网-系统与外部氢源的交互质量(kg)": ("外部氢源", True),
+    "外部能源网-系统与外部电网的交互功率(kW)": ("外部电网", True),
+    "氢负荷-合成氨所耗氢气质量(kg)": ("合成氨", False),
+    "氢负荷-氢燃料电池汽车加氢所耗氢气质量(kg)": ("燃料电池汽车加氢", False),
+    "氢负荷-生产甲醇所耗氢气质量(kg)": ("合成甲醇", False),
+    "氢负荷-用于其他方面的销售氢气年总质量(kg)": ("其他用途售氢", False),
+    "氢负荷-用于炼油所耗氢气质量(kg)": ("成品油加工", False),
+    "氢负荷-用于钢铁冶炼所耗氢气质量(kg)": ("钢铁冶炼", False),
+    "氧负荷-销售氧气的质量(kg)": ("售氧", False),
+    "电负荷-电负荷所消耗的功率(kW)": ("系统内用电单元", False),
+}
+
+
+class ValidationIssue:
+    """一条校验结果"""
+
+    __slots__ = ('key', 'level', 'message')
+
+    def __init__(self, key, level, message):
+        self.key = key            # 界面字段键或时序数据名称
+        self.level = level
+        self.message = message
+
+    def __repr__(self):
+        return f"ValidationIssue({self.key!r}, {self.level!r}, {self.message!r})"
+
+
+class SeriesSummary:
+    """时序数据的校验摘要，每个数组只计算一次"""
+
+    __slots__ = ('shape', 'invalid_count', 'negative_count', 'first_negative')
+
+    def __init__(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, None]
+        self.shape = values.shape
+        self.invalid_count = int(values.size - np.count_nonzero(np.isfinite(values)))
+        negative = values < 0
+        self.negative_count = int(np.count_nonzero(negative))
+        self.first_negative = None
+        if self.negative_count:
+            hour, scheme = np.unravel_index(int(np.argmax(negative)), values.shape)
+            self.first_negative = (int(hour), int(scheme))
+
+
+class ValidationRule:
+    """校验规则：inputs 为依赖的字段键和时序数据名称，只有这些输入变化时才重新检查。
+    check(ui_data, series) 返回 [(字段键, 级别, 说明)]"""
+
+    __slots__ = ('name', 'inputs', 'check', 'uses_series')
+
+    def __init__(self, name, inputs, check):
+        self.name = name
+        self.inputs = frozenset(inputs)
+        self.check = check
+        self.uses_series = any(key in SERIES_TOPOLOGY for key in self.inputs)
+
+
+def _number(ui_data, key):
+    return parse_number(ui_data.get(key))
+
+
+def _text(ui_data, key):
+    value = ui_data.get(key)
+    return "" if value is None else str(value).strip()
+
+
+def _scheme_count(ui_data):
+    value = _number(ui_data, 'scheme_count')
+    return int(value) if value is not None and value > 0 and value == int(value) else None
+
+
+def _check_required(ui_data, series):
+    return [(key, ERROR, f"{label}为必填项") for key, label in REQUIRED_FIELDS.items()
+            if not _text(ui_data, key)]
+
+
+def _number_rule(key):
+    def check(ui_data, series):
+        text = _text(ui_data, key)
+        if not text:
+            return []
+        value = parse_number(text)
+        if value is None:
+            return [(key, ERROR, f"数值格式错误: {text}")]
+        if key in INTEGER_FIELDS and (value <= 0 or value != int(value)):
+            return [(key, ERROR, "应为正整数")]
+        if key in PERCENTAGE_FIELDS and not 0 <= value <= 100:
+            return [(key, ERROR, "百分比超出范围 (0-100)")]
+        if value < 0:
+            return [(key, ERROR, "不能为负数")]
+        return []
+    return ValidationRule(f"数值:{key}", [key], check)
+
+
+def _price_rule(key):
+    def check(ui_data, series):
+        text = _text(ui_data, key)
+        if not text:
+            return []
+        values, bad_positions = parse_series(text)
+        if bad_positions:
+            return [(key, ERROR, describe_bad_positions(bad_positions))]
+        if (values < 0).any():
+            return [(key, ERROR, "价格不能为负数")]
+        if len(values) not in (1,) + SERIES_LENGTHS:
+            return [(key, WARNING, f"共 {len(values)} 个数值，将按24小时数据补全或截断")]
+        return []
+    return ValidationRule(f"价格:{key}", [key], check)
+
+
+def _capacity_rule(topology_key, label, capacity_key):
+    def check(ui_data, series):
+        text = _text(ui_data, capacity_key)
+        if not text:
+            if ui_data.get(topology_key):
+                return [(capacity_key, ERROR, f"已选择{label}，请填写各方案的配置容量")]
+            return []
+        values, bad_positions = parse_series(text)
+        if bad_positions:
+            return [(capacity_key, ERROR, describe_bad_positions(bad_positions))]
+        if (values < 0).any():
+            return [(capacity_key, ERROR, "配置容量不能为负数")]
+        scheme_count = _scheme_count(ui_data)
+        if scheme_count and len(values) != scheme_count:
+            return [(capacity_key, ERROR, f"有 {len(values)} 个数值，应与方案个数 {scheme_count} 一致")]
+        return []
+    return ValidationRule(f"容量:{capacity_key}", [topology_key, capacity_key, 'scheme_count'], check)
+
+
+def _lifetime_rule(topology_key, label, lifetime_key):
+    def check(ui_data, series):
+        lifetime = _number(ui_data, lifetime_key)
+        if lifetime is None:
+            if ui_data.get(topology_key) and not _text(ui_data, lifetime_key):
+                return [(lifetime_key, ERROR, f"已选择{label}，请填写设备使用寿命")]
+            return []
+        if lifetime <= 0:
+            return [(lifetime_key, ERROR, "设备使用寿命应大于0")]
+        project_life = _number(ui_data, 'project_life')
+        if project_life and lifetime < project_life:
+            replacements = math.ceil(project_life / lifetime) - 1
+            return [(lifetime_key, WARNING,
+                     f"小于项目生命周期 {project_life:g} 年，计算期内需更换 {replacements} 次")]
+        return []
+    return ValidationRule(f"寿命:{lifetime_key}", [topology_key, lifetime_key, 'project_life'], check)
+
+
+def _series_rule(name):
+    topology_key = TIMESERIES_SELECTION[name]
+    label, signed = SERIES_TOPOLOGY[name]
+
+    def check(ui_data, series):
+        summary = series.get(name)
+        selected = ui_data.get(topology_key)
+        if summary is None:
+            return [(name, ERROR, f"已选择{label}，但未提供逐时数据")] if selected else []
+        issues = []
+        if not selected:
+            issues.append((name, WARNING, f"未选择{label}，该数据不参与计算"))
+        hours, schemes = summary.shape
+        if hours != HOURS_PER_YEAR:
+            issues.append((name, ERROR, f"数据有 {hours} 行，应为 {HOURS_PER_YEAR} 行（逐时数据）"))
+        scheme_count = _scheme_count(ui_data)
+        if scheme_count and schemes != scheme_count:
+            issues.append((name, ERROR, f"数据有 {schemes} 个方案，应与方案个数 {scheme_count} 一致"))
+        if summary.invalid_count:
+            issues.append((name, ERROR, f"有 {summary.invalid_count} 个数值缺失或无效"))
+        if not signed and summary.negative_count:
+            hour, scheme = summary.first_negative
+            issues.append((name, ERROR, f"方案{scheme + 1} 第 {hour + 1} 小时为负数"
+                                        f"（共 {summary.negative_count} 处）"))
+        return issues
+    return ValidationRule(f"时序:{name}", [name, topology_key, 'scheme_count'], check)
+
+
+def _check_loan(ui_data, series):
+    issues = []
+    loan_term = _number(ui_data, 'loan_term')
+    grace_period = _number(ui_data, 'grace_period')
+    project_life = _number(ui_data, 'project_life')
+    if grace_period is not None and grace_period != int(grace_period):
+        issues.append(('grace_period', ERROR, "应为整数"))
+    elif loan_term and grace_period is not None and grace_period >= loan_term:
+        issues.append(('grace_period', ERROR, f"宽限期应小于贷款期限 {loan_term:g} 年"))
+    if loan_term and project_life and loan_term > project_life:
+        issues.append(('loan_term', WARNING, f"超过项目生命周期 {project_life:g} 年，剩余本金将在最后一年一次还清"))
+    return issues
+
+
+def _check_power_source(ui_data, series):
+    if not any(ui_data.get(key) for key in ('wind_turbine', 'pv', 'external_grid')):
+        return [(PROJECT_KEY, ERROR, "系统中没有电源：请至少选择风力发电、光伏或外部电网")]
+    return []
+
+
+def _check_dispatch_mode(ui_data, series):
+    if ui_data.get('dispatch_mode') == OPTIMAL_DISPATCH and not optimal_dispatch_available():
+        return [('dispatch_mode', ERROR, "优化调度需要安装 scipy（pip install scipy），未安装时请选择规则调度")]
+    return []
+
+
+def build_rules():
+    """生成完整的校验规则表"""
+    rules = [ValidationRule("必填项", REQUIRED_FIELDS, _check_required),
+             ValidationRule("电源", ['wind_turbine', 'pv', 'external_grid'], _check_power_source),
+             ValidationRule("贷款", ['loan_term', 'grace_period', 'project_life'], _check_loan),
+             ValidationRule("调度方式", ['dispatch_mode'], _check_dispatch_mode)]
+    rules += [_number_rule(field[0]) for field in USER_INPUT_FIELDS if field[2] == 'number']
+    rules += [_price_rule(key) for key in PRICE_FIELDS]
+    for topology_key, label, lifetime_key, capacity_key in DEVICES:
+        rules.append(_lifetime_rule(topology_key, label, lifetime_key))
+        rules.append(_capacity_rule(topology_key, label, capacity_key))
+    rules += [_series_rule(name) for name in TIMESERIES_NAMES]
+    return rules
+
+
+RULES = build_rules()
+
+
+class ValidationEngine:
+    """增量校验引擎：记录上次的输入，只重新运行依赖已变化输入的规则"""
+
+    def __init__(self, rules=None):
+        self.rules = RULES if rules is None else rules
+        self._inputs = {}
+        self._series = {}     # 名称 -> (数组, 摘要)
+        self._results = {}    # 规则名称 -> [ValidationIssue]
+
+    def update(self, ui_data, series_values=None):
+        """用最新的界面数据和时序数据更新校验结果，返回 {字段键: [ValidationIssue]}"""
+        changed = {key for key, value in ui_data.items() if self._inputs.get(key) != value}
+        changed.update(key for key in self._inputs if key not in ui_data)
+        self._inputs = dict(ui_data)
+
+        for name, values in (series_values or {}).items():
+            cached = self._series.get(name)
+            if cached is not None and cached[0] is values:
+                continue
+            # 数组对象变化时才重新计算摘要
+            self._series[name] = (values, None if values is None else SeriesSummary(values))
+            changed.add(name)
+        summaries = {name: summary for name, (_, summary) in self._series.items()}
+
+        for rule in self.rules:
+            if rule.name in self._results and not (rule.inputs & changed):
+                continue
+            self._results[rule.name] = [ValidationIssue(*issue) for issue in rule.check(ui_data, summaries)]
+        return self.issues()
+
+    def issues(self):
+        """按字段汇总当前的校验结果，错误排在警告之前"""
+        by_key = {}
+        for issues in self._results.values():
+            for issue in issues:
+                by_key.setdefault(issue.key, []).append(issue)
+        for issues in by_key.values():
+            issues.sort(key=lambda issue: issue.level != ERROR)
+        return by_key
+
+
+def validate_project(ui_data):
+    """同步校验界面参数（不含时序数据），返回 {字段键: [ValidationIssue]}"""
+    return ValidationEngine([rule for rule in RULES if not rule.uses_series]).update(ui_data)
+
+
+def has_errors(issues):
+    """校验结果中是否有错误"""
+    return any(issue.level == ERROR for key_issues in issues.values() for issue in key_issues)
+
+
+class ValidationWorker(QObject):
+    """在后台线程中运行校验引擎"""
+
+    validated = pyqtSignal(int, object)   # (请求序号, {字段键: [ValidationIssue]})
+
+    def __init__(self):
+        super().__init__()
+        self.engine = ValidationEngine()
+        self.latest_request = 0
+
+    @pyqtSlot(int, object, object)
+    def validate(self, request, ui_data, series_values):
+        # 已有更新的请求在排队时跳过，引擎按上次处理的输入计算差异，跳过不会漏掉变化
+        if request != self.latest_request:
+            return
+        self.validated.emit(request, self.engine.update(ui_data, series_values))
+
+
+class ProjectValidator(QObject):
+    """管理校验线程，合并连续的校验请求，只发出最新一次的结果"""
+
+    requested = pyqtSignal(int, object, object)
+    validated = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._request = 0
+        self.worker = ValidationWorker()
+        self.thread = QThread()
+        self.worker.moveToThread(self.thread)
+        self.requested.connect(self.worker.validate)
+        self.worker.validated.connect(self._on_validated)
+        self.thread.finished.connect(self.worker.deleteLater)
+        self.thread.start()
+
+    def submit(self, ui_data, series_values):
+        """提交校验请求，series_values 为 {时序数据名称: 数组或None}"""
+        self._request += 1
+        self.worker.latest_request = self._request
+        self.requested.emit(self._request, dict(ui_data), dict(series_values))
+
+    def _on_validated(self, request, issues):
+        if request == self._request:
+            self.validated.emit(issues)
+
+    def stop(self):
+        """结束校验线程（关闭窗口时使用）"""
+        self.thread.quit()
+        self.thread.wait(5000)
@@ -0,0 +1,217 @@
+import os
+from PyQt5.QtGui import QIcon
+
+# 图标目录，只在模块导入时解析一次
+ICONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons")
+
+# 图标键与文件名的对应关系
+ICON_FILES = {
+    'new_project': '新建评估.svg',
+    'open_project': '打开评估文件.svg',
+    'project_design': '项目参数设计.svg',
+    'indicator_management': '指标管理.svg',
+    'evaluation': '综合评估.svg',
+    'help': '查看帮助文档.svg'
+}
+
+# 共享样式片段，通过动态属性 styleClass 选择控件，在页面级别统一设置
+STYLE_RULES = {
+    'primary_button': """
+        QPushButton[styleClass="primary"] {
+            background-color: #3498db;
+            color: white;
+            border: none;
+            border-radius: 5px;
+            padding: 8px 16px;
+            font-size: 9pt;
+            font-weight: bold;
+        }
+        QPushButton[styleClass="primary"]:hover {
+            background-color: #2980b9;
+        }
+        QPushButton[styleClass="primary"]:pressed {
+            background-color: #21618c;
+        }
+    """,
+    'success_button': """
+        QPushButton[styleClass="success"] {
+            background-color: #27ae60;
+            color: white;
+            border: none;
+            border-radius: 5px;
+            padding: 8px 16px;
+            font-size: 9pt;
+            font-weight: bold;
+        }
+        QPushButton[styleClass="success"]:hover {
+            background-color: #219a52;
+        }
+        QPushButton[styleClass="success"]:pressed {
+            background-color: #1e8449;
+        }
+    """,
+    'toolbar_button': """
+        QPushButton[styleClass="toolbar"] {
+            background-color: #3498db;
+            color: white;
+            border: none;
+            border-radius: 5px;
+            padding: 8px 12px;
+            font-size: 12px;
+            font-weight: bold;
+        }
+        QPushButton[styleClass="toolbar"]:hover {
+            background-color: #2980b9;
+        }
+        QPushButton[styleClass="toolbar"]:pressed {
+            background-color: #21618c;
+        }
+    """,
+    'nav_button': """
+        QPushButton[styleClass="nav"] {
+            background-color: #ecf0f1;
+            color: #2c3e50;
+            border: 1px solid #bdc3c7;
+            border-radius: 5px;
+            padding: 10px;
+            font-size: 12px;
+            text-align: left;
+        }
+        QPushButton[styleClass="nav"]:hover {
+            background-color: #d5dbdb;
+        }
+        QPushButton[styleClass="nav"]:pressed {
+            background-color: #aeb6bf;
+        }
+    """,
+    'detail_button': """
+        QPushButton[styleClass="detail"] {
+            background-color: #ecf0f1;
+            color: #2c3e50;
+            border: 1px solid #bdc3c7;
+            border-radius: 3px;
+            padding: 5px 15px;
+            font-size: 9pt;
+        }
+        QPushButton[styleClass="detail"]:hover {
+            background-color: #d5dbdb;
+        }
+        QPushButton[styleClass="detail"]:pressed {
+            background-color: #aeb6bf;
+        }
+    """,
+    'indicator_group': """
+        QGroupBox[styleClass="indicator"] {
+            border: 2px solid #cccccc;
+            border-radius: 5px;
+            margin-top: 10px;
+            padding-top: 10px;
+        }
+        QGroupBox[styleClass="indicator"]::title {
+            subcontrol-origin: margin;
+            left: 20px;
+            padding: 0 10px 0 10px;
+        }
+    """,
+    'sub_group': """
+        QGroupBox[styleClass="sub"] {
+            border: 1px solid gray;
+            margin: 5px;
+            padding-top: 15px;
+        }
+    """,
+    'note_label': """
+        QLabel[styleClass="note"] {
+            color: #666;
+            font-size: 9pt;
+        }
+    """,
+    'invalid_input': """
+        QLineEdit[invalid="true"], QPushButton[invalid="true"], QComboBox[invalid="true"] {
+            border: 1px solid #e74c3c;
+            background-color: #fdecea;
+        }
+        QLineEdit[warning="true"], QPushButton[warning="true"], QComboBox[warning="true"] {
+            border: 1px solid #f0ad4e;
+            background-color: #fff8e6;
+        }
+        QLabel[styleClass="validation"] {
+            color: #c0392b;
+        }
+    """,
+    'icon_label': """
+        QLabel[styleClass="icon"] {
+            border: none;
+            background: transparent;
+        }
+    """
+}
+
+
+class ResourceManager:
+    """进程级资源注册表，图标只加载一次，按尺寸缓存渲染后的位图，并统一提供页面级样式表"""
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        """获取全局唯一的资源注册表"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self._icons = {}
+        self._pixmaps = {}
+        self._page_styles = {}
+
+    def icon(self, key):
+        """获取图标，首次访问时从磁盘加载，文件不存在时返回空图标"""
+        icon = self._icons.get(key)
+        if icon is None:
+            filename = ICON_FILES.get(key)
+            icon_path = os.path.join(ICONS_DIR, filename) if filename else None
+            if icon_path and os.path.exists(icon_path):
+                icon = QIcon(icon_path)
+            else:
+                icon = QIcon()  # 空图标
+            self._icons[key] = icon
+        return icon
+
+    def icons(self, *keys):
+        """批量获取图标，返回 {键: 图标} 字典"""
+        return {key: self.icon(key) for key in keys}
+
+    def pixmap(self, key, width, height=None):
+        """获取指定尺寸的图标位图，同一尺寸只渲染一次"""
+        if height is None:
+            height = width
+        cache_key = (key, width, height)
+        pixmap = self._pixmaps.get(cache_key)
+        if pixmap is None:
+            pixmap = self.icon(key).pixmap(width, height)
+            self._pixmaps[cache_key] = pixmap
+        return pixmap
+
+    def has_icon(self, key):
+        """判断图标是否可用"""
+        return not self.icon(key).isNull()
+
+    def page_style(self, *rule_names):
+        """拼接页面级样式表，同一组合只拼接一次"""
+        style = self._page_styles.get(rule_names)
+        if style is None:
+            style = "".join(STYLE_RULES[name] for name in rule_names)
+            self._page_styles[rule_names] = style
+        return style
+
+
+def get_resources():
+    """获取全局资源注册表"""
+    return ResourceManager.instance()
+
+
+def set_style_class(widget, style_class):
+    """为控件设置共享样式类，样式由所在页面的样式表统一提供"""
+    widget.setProperty("styleClass", style_class)
+    return widget
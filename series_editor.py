@@ -0,0 +1,235 @@
+import numpy as np
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QTableView, QHeaderView, QAbstractItemView, QApplication,
+                             QMessageBox, QShortcut)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QKeySequence
+
+from series_parser import HOURS_PER_YEAR
+
+
+def parse_clipboard_block(text):
+    """解析从Excel复制的文本块（行用换行、列用制表符分隔），空单元格为 NaN"""
+    lines = text.rstrip("\r\n").replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    rows = [line.split("\t") for line in lines]
+    width = max(len(row) for row in rows)
+    if all(len(row) == width for row in rows):
+        try:
+            # 快速路径：整块一次性转换
+            return np.array(rows, dtype=np.float64)
+        except ValueError:
+            pass
+
+    block = np.full((len(rows), width), np.nan)
+    for r, row in enumerate(rows):
+        for c, cell in enumerate(row):
+            try:
+                block[r, c] = float(cell)
+            except ValueError:
+                pass
+    return block
+
+
+def format_block(block):
+    """把数值块格式化为制表符分隔的文本"""
+    return "\n".join("\t".join("" if np.isnan(v) else f"{v:g}" for v in row) for row in block.tolist())
+
+
+class SeriesTableModel(QAbstractTableModel):
+    """逐时序列表格模型，直接以 (小时数, 方案数) 数组为数据源，编辑原地写入数组"""
+
+    def __init__(self, values, parent=None):
+        super().__init__(parent)
+        self.values = values
+        self.modified = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.values.shape[0]
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.values.shape[1]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            value = self.values[index.row(), index.column()]
+            return "" if np.isnan(value) else f"{value:g}"
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return f"方案{section + 1}"
+        return str(section + 1)
+
+    def flags(self, index):
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole:
+            return False
+        text = str(value).strip()
+        try:
+            number = float(text) if text else np.nan
+        except ValueError:
+            return False
+        self.values[index.row(), index.column()] = number
+        self.modified = True
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def write_block(self, row, column, block):
+        """从 (row, column) 开始写入数值块，超出表格的部分忽略，返回写入的行列数"""
+        rows = min(block.shape[0], self.values.shape[0] - row)
+        columns = min(block.shape[1], self.values.shape[1] - column)
+        if rows <= 0 or columns <= 0:
+            return 0, 0
+        self.values[row:row + rows, column:column + columns] = block[:rows, :columns]
+        self._changed(row, column, row + rows - 1, column + columns - 1)
+        return rows, columns
+
+    def fill_down(self, top, left, bottom, right):
+        """用选区第一行的值向下填充选区"""
+        if bottom <= top:
+            return
+        self.values[top + 1:bottom + 1, left:right + 1] = self.values[top, left:right + 1]
+        self._changed(top + 1, left, bottom, right)
+
+    def fill(self, top, left, bottom, right, value):
+        """把选区填充为同一个值"""
+        self.values[top:bottom + 1, left:right + 1] = value
+        self._changed(top, left, bottom, right)
+
+    def block(self, top, left, bottom, right):
+        """获取选区数值块"""
+        return self.values[top:bottom + 1, left:right + 1]
+
+    def _changed(self, top, left, bottom, right):
+        self.modified = True
+        self.dataChanged.emit(self.index(top, left), self.index(bottom, right),
+                              [Qt.DisplayRole, Qt.EditRole])
+
+
+class SeriesEditorDialog(QDialog):
+    """各方案逐时数据编辑对话框，支持从Excel整块粘贴、向下填充和复制"""
+
+    def __init__(self, title, values=None, scheme_count=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.resize(900, 600)
+        self.model = SeriesTableModel(self.prepare_values(values, scheme_count), self)
+        self.init_ui(title)
+
+    @staticmethod
+    def prepare_values(values, scheme_count):
+        """准备可编辑的数组：没有数据时新建全零数组，方案数不足时补零列"""
+        scheme_count = scheme_count or 1
+        if values is None:
+            return np.zeros((HOURS_PER_YEAR, scheme_count))
+        values = np.array(values, dtype=np.float64)  # 编辑副本，取消时不影响项目数据
+        if values.ndim == 1:
+            values = values[:, None]
+        if values.shape[1] < scheme_count:
+            values = np.hstack([values, np.zeros((values.shape[0], scheme_count - values.shape[1]))])
+        return values
+
+    def init_ui(self, title):
+        """初始化用户界面"""
+        layout = QVBoxLayout(self)
+
+        hours, schemes = self.model.values.shape
+        info_label = QLabel(f"{title}：{hours} 小时 × {schemes} 个方案。"
+                            "可从Excel复制后按 Ctrl+V 整块粘贴，Ctrl+D 向下填充选区")
+        layout.addWidget(info_label)
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionMode(QAbstractItemView.ContiguousSelection)
+        # 固定行高，避免按内容计算8760行的尺寸
+        vertical_header = self.table.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.Fixed)
+        vertical_header.setDefaultSectionSize(22)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.table.horizontalHeader().setDefaultSectionSize(90)
+        layout.addWidget(self.table)
+
+        # 快捷键只在表格本身有焦点时生效，单元格编辑器中的复制粘贴不受影响
+        for key, slot in ((QKeySequence.Paste, self.paste), (QKeySequence.Copy, self.copy),
+                          (QKeySequence("Ctrl+D"), self.fill_down),
+                          (QKeySequence.Delete, self.clear_selection)):
+            shortcut = QShortcut(key, self.table, slot)
+            shortcut.setContext(Qt.WidgetShortcut)
+
+        button_layout = QHBoxLayout()
+        paste_btn = QPushButton("粘贴")
+        paste_btn.clicked.connect(self.paste)
+        button_layout.addWidget(paste_btn)
+        fill_btn = QPushButton("向下填充")
+        fill_btn.clicked.connect(self.fill_down)
+        button_layout.addWidget(fill_btn)
+        button_layout.addStretch()
+        ok_btn = QPushButton("确定")
+        ok_btn.setDefault(True)
+        ok_btn.clicked.connect(self.accept_values)
+        button_layout.addWidget(ok_btn)
+        cancel_btn = QPushButton("取消")
+        cancel_btn.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_btn)
+        layout.addLayout(button_layout)
+
+    def selection_bounds(self):
+        """当前选区的 (上, 左, 下, 右)，没有选区时使用当前单元格"""
+        ranges = self.table.selectionModel().selection()
+        if not ranges.isEmpty():
+            r = ranges[0]
+            return r.top(), r.left(), r.bottom(), r.right()
+        index = self.table.currentIndex()
+        if not index.isValid():
+            return None
+        return index.row(), index.column(), index.row(), index.column()
+
+    def paste(self):
+        """从剪贴板整块粘贴，从选区左上角开始写入"""
+        bounds = self.selection_bounds()
+        text = QApplication.clipboard().text()
+        if bounds is None or not text.strip():
+            return
+        block = parse_clipboard_block(text)
+        top, left, bottom, right = bounds
+        if block.shape == (1, 1) and (bottom > top or right > left):
+            # 单个值粘贴到选区时填满整个选区
+            self.model.fill(top, left, bottom, right, block[0, 0])
+            return
+        self.model.write_block(top, left, block)
+
+    def copy(self):
+        """复制选区到剪贴板"""
+        bounds = self.selection_bounds()
+        if bounds is not None:
+            QApplication.clipboard().setText(format_block(self.model.block(*bounds)))
+
+    def fill_down(self):
+        """用选区第一行向下填充"""
+        bounds = self.selection_bounds()
+        if bounds is not None:
+            self.model.fill_down(*bounds)
+
+    def clear_selection(self):
+        """清空选区"""
+        bounds = self.selection_bounds()
+        if bounds is not None:
+            self.model.fill(*bounds, np.nan)
+
+    def accept_values(self):
+        """检查空值后确认"""
+        missing = int(np.isnan(self.model.values).sum())
+        if missing:
+            QMessageBox.warning(self, "提示", f"还有 {missing} 个单元格为空，请填写后再确定！")
+            return
+        self.accept()
+
+    def values(self):
+        """编辑后的 (小时数, 方案数) 数组"""
+        return self.model.values
@@ -0,0 +1,72 @@
+import re
+import numpy as np
+
+# 价格等分时序列支持的长度：24小时、逐月24小时（12×24）或全年8760小时
+HOURS_PER_DAY = 24
+MONTHS_PER_YEAR = 12
+HOURS_PER_MONTHLY_DAY = MONTHS_PER_YEAR * HOURS_PER_DAY
+HOURS_PER_YEAR = 8760
+SERIES_LENGTHS = (HOURS_PER_DAY, HOURS_PER_MONTHLY_DAY, HOURS_PER_YEAR)
+
+# 分隔符：半角/全角逗号、分号、制表符（从Excel粘贴）、换行，或连续空格
+# 单个分隔符两侧的空白会被吸收，连续两个逗号之间视为一个空值并报告位置
+_SEPARATOR = re.compile(r'\s*[,，;；\t\r\n]\s*|[ 　]+')
+
+
+def split_tokens(text):
+    """把输入文本拆分为数值字符串列表"""
+    text = text.strip()
+    if not text:
+        return []
+    return _SEPARATOR.split(text)
+
+
+def parse_series(value):
+    """批量解析数值序列
+
+    接受字符串（逗号、空白、换行或制表符分隔）、列表或数组，
+    返回 (float64 数组, 出错位置列表)。无法解析或非有限的值在数组中为 NaN，
+    其下标（从0开始）记录在出错位置列表中，由调用方决定如何提示。
+    """
+    if value is None:
+        return np.empty(0, dtype=np.float64), []
+
+    if isinstance(value, np.ndarray):
+        tokens = value.ravel()
+    elif isinstance(value, (list, tuple)):
+        tokens = [np.nan if v is None or v == "" else v for v in value]
+    elif isinstance(value, str):
+        tokens = split_tokens(value)
+    else:
+        tokens = [value]
+
+    try:
+        # 快速路径：整个序列一次性在C层完成转换
+        values = np.array(tokens, dtype=np.float64)
+    except (ValueError, TypeError):
+        # 存在无法解析的值时才逐个定位
+        values = np.full(len(tokens), np.nan, dtype=np.float64)
+        for i, token in enumerate(tokens):
+            try:
+                values[i] = float(token)
+            except (ValueError, TypeError):
+                pass
+
+    bad_positions = np.flatnonzero(~np.isfinite(values)).tolist()
+    return values, bad_positions
+
+
+def fit_series_length(values, length):
+    """调整序列长度：不足时用最后一个值填充，超出时截断"""
+    if len(values) >= length:
+        return values[:length]
+    fill = values[-1] if len(values) else 0.0
+    return np.concatenate([values, np.full(length - len(values), fill, dtype=np.float64)])
+
+
+def describe_bad_positions(bad_positions, limit=10):
+    """把出错位置格式化为提示文字（位置从1开始计数）"""
+    shown = "、".join(str(i + 1) for i in bad_positions[:limit])
+    if len(bad_positions) > limit:
+        shown += f" 等{len(bad_positions)}处"
+    return f"第 {shown} 个数值无效"
@@ -0,0 +1,343 @@
+import os
+import json
+import sqlite3
+import numpy as np
+
+from indicator_registry import EVALUATION_RESULT_KEY
+
+# 单文件项目扩展名
+SQLITE_PROJECT_EXTENSION = ".iesdb"
+
+SQLITE_SCHEMA_VERSION = 1
+
+SQLITE_PROJECT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS parameters (
+    section TEXT NOT NULL,
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    unit TEXT,
+    type TEXT,
+    selected INTEGER,
+    value TEXT,
+    note TEXT,
+    raw TEXT,
+    PRIMARY KEY (section, name)
+);
+CREATE TABLE IF NOT EXISTS sections (
+    section TEXT PRIMARY KEY,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS indicators (
+    code TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    indicator_type INTEGER,
+    unit TEXT,
+    selected INTEGER,
+    value TEXT,
+    normalized TEXT,
+    score TEXT,
+    critic TEXT,
+    dematel TEXT,
+    weight TEXT,
+    note TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_indicators_category ON indicators(category);
+CREATE TABLE IF NOT EXISTS timeseries (
+    name TEXT PRIMARY KEY,
+    dtype TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    cols INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS arrays (
+    name TEXT PRIMARY KEY,
+    dtype TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    cols INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS output_rows (
+    table_name TEXT NOT NULL,
+    row_index INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (table_name, row_index)
+);
+"""
+
+# 参数条目中单独成列的键: (JSON键, 列名)
+PARAMETER_COLUMNS = [("单位", "unit"), ("类型", "type"), ("选择状态", "selected"),
+                     ("数值", "value"), ("备注", "note")]
+
+# 指标条目中单独成列的键: (JSON键, 列名)
+INDICATOR_COLUMNS = [("指标类型", "indicator_type"), ("单位", "unit"), ("选择状态", "selected"),
+                     ("数值", "value"), ("规范化值", "normalized"),
+                     ("综合评估得分分量", "score"), ("critic", "critic"),
+                     ("demantel", "dematel"), ("组合权值", "weight"), ("备注", "note")]
+
+# 以JSON文本保存的列
+JSON_COLUMNS = {"value", "normalized", "score", "critic", "dematel", "weight"}
+
+
+def is_sqlite_project(path):
+    """判断文件是否为单文件项目"""
+    if not os.path.isfile(path):
+        return False
+    with open(path, 'rb') as f:
+        return f.read(16) == b"SQLite format 3\x00"
+
+
+def encode_series(values):
+    """把时序数组编码为小端float64二进制，返回 (dtype, 行数, 列数, 数据)"""
+    values = np.asarray(values, dtype='<f8')
+    if values.ndim == 1:
+        values = values[:, None]
+    return '<f8', values.shape[0], values.shape[1], values.tobytes()
+
+
+def decode_series(dtype, rows, cols, data):
+    """解码时序二进制数据"""
+    return np.frombuffer(data, dtype=dtype).reshape(rows, cols).astype(np.float64)
+
+
+def _to_column(column, value):
+    if column in JSON_COLUMNS:
+        return json.dumps(value, ensure_ascii=False)
+    if column == "selected":
+        return None if value is None else int(bool(value))
+    return value
+
+
+def _from_column(column, value):
+    if column in JSON_COLUMNS:
+        return None if value is None else json.loads(value)
+    if column == "selected":
+        return None if value is None else bool(value)
+    return value
+
+
+class SQLiteProjectStore:
+    """单文件项目存储：参数和指标存放在表中，时序数据以二进制保存，可以只读取部分数据"""
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SQLITE_PROJECT_SCHEMA)
+        with self.connection:
+            self.connection.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('schema_version', ?)",
+                                    (str(SQLITE_SCHEMA_VERSION),))
+
+    def close(self):
+        """关闭数据库连接"""
+        self.connection.close()
+
+    def read_user_input(self):
+        """读取参数表，还原为 User_input.json 结构"""
+        data = {}
+        for row in self.connection.execute("SELECT section FROM sections ORDER BY position"):
+            data[row["section"]] = {}
+
+        for row in self.connection.execute(
+                "SELECT * FROM parameters ORDER BY section, position"):
+            if row["name"] == "":
+                data[row["section"]] = json.loads(row["raw"])
+                continue
+            section = data.setdefault(row["section"], {})
+            if row["raw"] is not None:
+                section[row["name"]] = json.loads(row["raw"])
+            else:
+                section[row["name"]] = {key: _from_column(column, row[column])
+                                        for key, column in PARAMETER_COLUMNS}
+        return data
+
+    def write_user_input(self, data):
+        """把 User_input.json 结构写入参数表，每个参数一行"""
+        sections = []
+        parameters = []
+        for section_position, (section, entries) in enumerate(data.items()):
+            sections.append((section, section_position))
+            if not isinstance(entries, dict):
+                parameters.append((section, "", 0, None, None, None, None, None,
+                                   json.dumps(entries, ensure_ascii=False)))
+                continue
+            for position, (name, entry) in enumerate(entries.items()):
+                if isinstance(entry, dict) and set(entry) == {key for key, _ in PARAMETER_COLUMNS}:
+                    parameters.append((section, name, position,
+                                       *(_to_column(column, entry[key]) for key, column in PARAMETER_COLUMNS),
+                                       None))
+                else:
+                    # 设备选择状态、负荷分组等非标准条目原样保存
+                    parameters.append((section, name, position, None, None, None, None, None,
+                                       json.dumps(entry, ensure_ascii=False)))
+
+        with self.connection:
+            self.connection.execute("DELETE FROM sections")
+            self.connection.execute("DELETE FROM parameters")
+            self.connection.executemany("INSERT INTO sections (section, position) VALUES (?, ?)", sections)
+            self.connection.executemany(
+                "INSERT INTO parameters (section, name, position, unit, type, selected, value, note, raw)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", parameters)
+
+    def read_parameter(self, section, name):
+        """只读取单个参数的数值"""
+        row = self.connection.execute("SELECT value, raw FROM parameters WHERE section = ? AND name = ?",
+                                      (section, name)).fetchone()
+        if row is None:
+            return None
+        if row["raw"] is not None:
+            return json.loads(row["raw"])
+        return _from_column("value", row["value"])
+
+    def read_indicator_system(self):
+        """读取指标表，还原为 IndicatorSystem.json 结构"""
+        data = {}
+        for row in self.connection.execute("SELECT * FROM indicators ORDER BY position"):
+            entry = {"指标编码": row["code"]}
+            entry.update((key, _from_column(column, row[column])) for key, column in INDICATOR_COLUMNS)
+            if row["extra"]:
+                entry.update(json.loads(row["extra"]))
+            data.setdefault(row["category"], {})[row["name"]] = entry
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'evaluation_result'").fetchone()
+        if row is not None:
+            data[EVALUATION_RESULT_KEY] = json.loads(row["value"])
+        return data
+
+    def write_indicator_system(self, data):
+        """把 IndicatorSystem.json 结构写入指标表"""
+        known_keys = {"指标编码"} | {key for key, _ in INDICATOR_COLUMNS}
+        rows = []
+        position = 0
+        for category, indicators in data.items():
+            if not isinstance(indicators, dict):
+                continue
+            for name, entry in indicators.items():
+                if not isinstance(entry, dict) or "指标编码" not in entry:
+                    continue
+                extra = {key: value for key, value in entry.items() if key not in known_keys}
+                rows.append((entry["指标编码"], category, name, position,
+                             *(_to_column(column, entry.get(key)) for key, column in INDICATOR_COLUMNS),
+                             json.dumps(extra, ensure_ascii=False) if extra else None))
+                position += 1
+
+        with self.connection:
+            # 最近一次综合评估结果不属于任何指标，保存在 meta 表中
+            self.connection.execute("DELETE FROM meta WHERE key = 'evaluation_result'")
+            if data.get(EVALUATION_RESULT_KEY) is not None:
+                self.connection.execute("INSERT INTO meta (key, value) VALUES ('evaluation_result', ?)",
+                                        (json.dumps(data[EVALUATION_RESULT_KEY], ensure_ascii=False),))
+            self.connection.execute("DELETE FROM indicators")
+            self.connection.executemany(
+                "INSERT INTO indicators (code, category, name, position, indicator_type, unit, selected,"
+                " value, normalized, score, critic, dematel, weight, note, extra)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def read_indicator_scores(self):
+        """只读取各指标的数值和得分，返回 {指标编码: {...}}"""
+        return {
+            row["code"]: {
+                "数值": _from_column("value", row["value"]),
+                "综合评估得分分量": _from_column("score", row["score"]),
+                "组合权值": _from_column("weight", row["weight"]),
+                "选择状态": _from_column("selected", row["selected"])
+            }
+            for row in self.connection.execute(
+                "SELECT code, value, score, weight, selected FROM indicators ORDER BY position")
+        }
+
+    def list_timeseries(self):
+        """列出已保存的时序数据名称"""
+        return [row["name"] for row in self.connection.execute("SELECT name FROM timeseries ORDER BY name")]
+
+    def timeseries_stamp(self, name):
+        """二进制时序数据读取很快，不使用文件状态缓存"""
+        return None
+
+    def read_timeseries(self, name):
+        """读取时序数据，不存在时返回None"""
+        row = self.connection.execute("SELECT dtype, rows, cols, data FROM timeseries WHERE name = ?",
+                                      (name,)).fetchone()
+        if row is None:
+            return None
+        return decode_series(row["dtype"], row["rows"], row["cols"], row["data"])
+
+    def write_timeseries(self, name, values):
+        """写入时序数据，values 为None时删除"""
+        with self.connection:
+            if values is None:
+                self.connection.execute("DELETE FROM timeseries WHERE name = ?", (name,))
+                return
+            dtype, rows, cols, data = encode_series(values)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO timeseries (name, dtype, rows, cols, data) VALUES (?, ?, ?, ?, ?)",
+                (name, dtype, rows, cols, sqlite3.Binary(data)))
+
+    def list_arrays(self):
+        """列出二进制数据名称"""
+        return [row["name"] for row in self.connection.execute("SELECT name FROM arrays ORDER BY name")]
+
+    def read_array(self, name):
+        """读取二进制数据，不存在时返回None"""
+        row = self.connection.execute("SELECT dtype, rows, cols, data FROM arrays WHERE name = ?",
+                                      (name,)).fetchone()
+        if row is None:
+            return None
+        if row["cols"] == 0:
+            # 一维数据
+            return np.frombuffer(row["data"], dtype=row["dtype"]).astype(np.float64)
+        return decode_series(row["dtype"], row["rows"], row["cols"], row["data"])
+
+    def write_array(self, name, values):
+        """写入二进制数据，values 为None时删除"""
+        with self.connection:
+            if values is None:
+                self.connection.execute("DELETE FROM arrays WHERE name = ?", (name,))
+                return
+            values = np.asarray(values, dtype='<f8')
+            dtype, rows, cols, data = encode_series(values)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO arrays (name, dtype, rows, cols, data) VALUES (?, ?, ?, ?, ?)",
+                (name, dtype, rows, 0 if values.ndim == 1 else cols, sqlite3.Binary(data)))
+
+    def read_output_table(self, name):
+        """读取输出表格，不存在时返回None"""
+        rows = [json.loads(row["data"]) for row in self.connection.execute(
+            "SELECT data FROM output_rows WHERE table_name = ? ORDER BY row_index", (name,))]
+        return rows or None
+
+    def write_output_table(self, name, rows):
+        """写入输出表格"""
+        with self.connection:
+            self.connection.execute("DELETE FROM output_rows WHERE table_name = ?", (name,))
+            self.connection.executemany(
+                "INSERT INTO output_rows (table_name, row_index, data) VALUES (?, ?, ?)",
+                [(name, index, json.dumps(list(row), ensure_ascii=False)) for index, row in enumerate(rows)])
+
+
+def import_folder(folder_path, db_path):
+    """把项目文件夹导入为单文件项目"""
+    from project_store import FolderProjectStore, copy_project
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    target = SQLiteProjectStore(db_path)
+    try:
+        copy_project(FolderProjectStore(folder_path), target)
+    finally:
+        target.close()
+    return db_path
+
+
+def export_folder(db_path, folder_path):
+    """把单文件项目导出为项目文件夹"""
+    from project_store import export_to_folder
+    source = SQLiteProjectStore(db_path)
+    try:
+        return export_to_folder(source, folder_path)
+    finally:
+        source.close()
@@ -0,0 +1,141 @@
+import copy
+import hashlib
+import numpy as np
+
+from series_parser import (HOURS_PER_DAY, HOURS_PER_MONTHLY_DAY, HOURS_PER_YEAR,
+                           MONTHS_PER_YEAR, parse_series, fit_series_length)
+
+# 价格参数所在的分区
+TARIFF_SECTION = "价格参数"
+
+# 超过该长度的价格曲线保存为二进制数据文件，User_input.json 中只保留引用
+INLINE_TARIFF_LENGTH = HOURS_PER_DAY
+
+# 引用中的键
+TARIFF_FILE_KEY = "曲线文件"
+TARIFF_LENGTH_KEY = "点数"
+TARIFF_DIGEST_KEY = "校验码"
+
+# 平年各月天数
+MONTH_DAYS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+_monthly_index = None
+
+
+def tariff_array_name(name):
+    """价格参数对应的二进制数据文件名称"""
+    return f"{TARIFF_SECTION}-{name}"
+
+
+def is_tariff_reference(value):
+    """判断数值是否为价格曲线文件引用"""
+    return isinstance(value, dict) and TARIFF_FILE_KEY in value
+
+
+def _digest(values):
+    return hashlib.sha1(np.ascontiguousarray(values, dtype='<f8').tobytes()).hexdigest()
+
+
+def monthly_hour_index():
+    """全年每个小时在 12×24 逐月曲线中的下标，只计算一次"""
+    global _monthly_index
+    if _monthly_index is None:
+        months = np.repeat(np.arange(MONTHS_PER_YEAR), MONTH_DAYS)          # 每天所属月份
+        hours = np.arange(HOURS_PER_DAY)
+        _monthly_index = (months[:, None] * HOURS_PER_DAY + hours[None, :]).ravel()
+    return _monthly_index
+
+
+def expand_tariff(values, horizon=HOURS_PER_YEAR):
+    """把24小时、12×24逐月或8760小时价格曲线展开为 horizon 小时的逐时价格，
+    其他长度与 parse_price_list 一样按24小时处理"""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 1:
+        values = np.repeat(values, HOURS_PER_DAY)
+    if len(values) == HOURS_PER_MONTHLY_DAY:
+        annual = values[monthly_hour_index()]
+    elif len(values) == HOURS_PER_YEAR:
+        annual = values
+    else:
+        annual = np.tile(fit_series_length(values, HOURS_PER_DAY), HOURS_PER_YEAR // HOURS_PER_DAY)
+    # 超过一年时逐年重复
+    return np.resize(annual, horizon)
+
+
+def tariff_references(user_input_data):
+    """获取已保存为文件引用的价格参数，返回 {参数名称: 引用}"""
+    return {name: dict(entry["数值"])
+            for name, entry in user_input_data.get(TARIFF_SECTION, {}).items()
+            if isinstance(entry, dict) and is_tariff_reference(entry.get("数值"))}
+
+
+def store_tariffs(store, user_input_data, previous_references=None):
+    """把较长的价格曲线写入二进制数据文件，User_input.json 中替换为引用；
+    内容与上次保存相同时不重写文件"""
+    previous_references = previous_references or {}
+    for name, entry in user_input_data.get(TARIFF_SECTION, {}).items():
+        if not isinstance(entry, dict):
+            continue
+        value = entry.get("数值")
+        array_name = tariff_array_name(name)
+        if isinstance(value, list) and len(value) > INLINE_TARIFF_LENGTH:
+            values = np.asarray(value, dtype=np.float64)
+            digest = _digest(values)
+            if previous_references.get(name, {}).get(TARIFF_DIGEST_KEY) != digest:
+                store.write_array(array_name, values)
+            entry["数值"] = {TARIFF_FILE_KEY: array_name, TARIFF_LENGTH_KEY: len(values),
+                            TARIFF_DIGEST_KEY: digest}
+        elif not is_tariff_reference(value) and array_name in store.list_arrays():
+            # 改回24小时数据后删除旧的曲线文件
+            store.write_array(array_name, None)
+
+
+def load_tariff_values(store, value):
+    """读取价格参数的原始曲线（未展开），value 为列表或文件引用"""
+    if is_tariff_reference(value):
+        values = store.read_array(value[TARIFF_FILE_KEY])
+        return None if values is None else np.asarray(values, dtype=np.float64)
+    if value is None:
+        return None
+    values, bad_positions = parse_series(value)
+    return None if bad_positions or len(values) == 0 else values
+
+
+def resolve_tariffs(store, user_input_data):
+    """返回价格曲线引用已替换为数值列表的 User_input.json 数据副本，供界面显示"""
+    section = user_input_data.get(TARIFF_SECTION, {})
+    if not any(isinstance(entry, dict) and is_tariff_reference(entry.get("数值"))
+               for entry in section.values()):
+        return user_input_data
+
+    data = dict(user_input_data)
+    data[TARIFF_SECTION] = copy.deepcopy(section)
+    for entry in data[TARIFF_SECTION].values():
+        if isinstance(entry, dict) and is_tariff_reference(entry.get("数值")):
+            values = load_tariff_values(store, entry["数值"])
+            entry["数值"] = None if values is None else values.tolist()
+    return data
+
+
+class TariffCache:
+    """价格曲线缓存，按 (参数名称, 时长) 缓存展开后的逐时价格，项目数据变化时清空"""
+
+    def __init__(self):
+        self._expanded = {}
+
+    def get(self, store, user_input_data, name, horizon=HOURS_PER_YEAR):
+        """获取价格参数展开后的逐时价格（只读数组），参数未填写时返回None"""
+        key = (name, horizon)
+        if key not in self._expanded:
+            entry = user_input_data.get(TARIFF_SECTION, {}).get(name)
+            values = load_tariff_values(store, entry.get("数值")) if isinstance(entry, dict) else None
+            expanded = None
+            if values is not None:
+                expanded = expand_tariff(values, horizon)
+                expanded.setflags(write=False)
+            self._expanded[key] = expanded
+        return self._expanded[key]
+
+    def clear(self):
+        """清空缓存"""
+        self._expanded.clear()
@@ -0,0 +1,79 @@
+import numpy as np
+
+# 亏损可向以后年度结转弥补的最长年限
+LOSS_CARRY_YEARS = 5
+
+
+class VatResult:
+    """增值税及附加，各项均为 (方案数, 年数) 数组（万元）"""
+
+    __slots__ = ('output', 'input', 'payable', 'credit', 'surcharge')
+
+    def __init__(self, output, input_tax, payable, credit, surcharge):
+        self.output = output          # 销项税额
+        self.input = input_tax        # 进项税额
+        self.payable = payable        # 应纳增值税
+        self.credit = credit          # 年末留抵税额
+        self.surcharge = surcharge    # 增值税附加
+
+
+class IncomeTaxResult:
+    """企业所得税，各项均为 (方案数, 年数) 数组（万元）"""
+
+    __slots__ = ('loss_offset', 'taxable', 'tax', 'loss_balance')
+
+    def __init__(self, loss_offset, taxable, tax, loss_balance):
+        self.loss_offset = loss_offset      # 弥补以前年度亏损
+        self.taxable = taxable              # 应纳税所得额
+        self.tax = tax                      # 所得税
+        self.loss_balance = loss_balance    # 年末尚可弥补的亏损
+
+
+def value_added_tax(sales, purchases, rate, surcharge_rate, opening_credit=0.0, capital_credit=0.0):
+    """计算增值税及附加
+
+    sales、purchases 为不含税的销售收入和外购费用 (方案数, 年数)；opening_credit 为
+    第1年初的留抵税额 (方案数,)，如设备投资的进项税；capital_credit 为各年设备更换的进项税额
+    (方案数, 年数)。设备投资按含税价计入现金流出，其进项税只用于抵减应纳增值税，不计入
+    进项税额。进项大于销项的部分留抵以后年度。
+    """
+    output = sales * rate
+    input_tax = purchases * rate
+    schemes, years = output.shape
+    capital_credit = np.broadcast_to(np.asarray(capital_credit, dtype=np.float64), output.shape)
+    payable = np.empty_like(output)
+    credit = np.empty_like(output)
+    balance = np.broadcast_to(np.asarray(opening_credit, dtype=np.float64), (schemes,)).copy()
+    # 留抵只向后结转，逐年计算，各方案同时计算
+    for t in range(years):
+        net = output[:, t] - input_tax[:, t] - capital_credit[:, t] - balance
+        payable[:, t] = np.maximum(net, 0.0)
+        balance = np.maximum(-net, 0.0)
+        credit[:, t] = balance
+    return VatResult(output, input_tax, payable, credit, payable * surcharge_rate)
+
+
+def income_tax(profit, rate, carry_years=LOSS_CARRY_YEARS):
+    """计算企业所得税
+
+    profit 为利润总额 (方案数, 年数)。亏损年度的亏损在以后 carry_years 年内用利润弥补，
+    先弥补较早年度的亏损，超过年限未弥补的不再结转。
+    """
+    schemes, years = profit.shape
+    # losses[:, k] 为 k+1 年前发生、尚未弥补的亏损
+    losses = np.zeros((schemes, max(int(carry_years), 0)))
+    loss_offset = np.zeros_like(profit)
+    loss_balance = np.zeros_like(profit)
+    for t in range(years):
+        remaining = np.maximum(profit[:, t], 0.0)
+        for k in range(losses.shape[1] - 1, -1, -1):
+            used = np.minimum(losses[:, k], remaining)
+            losses[:, k] -= used
+            remaining -= used
+            loss_offset[:, t] += used
+        if losses.shape[1]:
+            losses[:, 1:] = losses[:, :-1]
+            losses[:, 0] = np.maximum(-profit[:, t], 0.0)
+        loss_balance[:, t] = losses.sum(axis=1)
+    taxable = np.maximum(profit, 0.0) - loss_offset
+    return IncomeTaxResult(loss_offset, taxable, taxable * rate, loss_balance)
@@ -0,0 +1,48 @@
+import os
+import sys
+import zipfile
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from archive_project_store import ArchiveProjectStore
+
+
+def test_writes_replace_members_instead_of_appending(tmp_path):
+    path = str(tmp_path / "project.iesz")
+    store = ArchiveProjectStore(path)
+    for k in range(3):
+        store.write_array("结果", np.full(4, k))
+    store.write_array("临时", np.zeros(2))
+    store.write_array("临时", None)
+    store.close()
+
+    with zipfile.ZipFile(path) as archive:
+        names = archive.namelist()
+    assert len(names) == len(set(names))
+    assert "arrays/临时.npy" not in names
+    assert not os.path.exists(path + ".tmp")
+    assert np.array_equal(ArchiveProjectStore(path).read_array("结果"), np.full(4, 2.0))
+
+
+def test_interrupted_write_keeps_previous_archive(tmp_path, monkeypatch):
+    path = str(tmp_path / "project.iesz")
+    store = ArchiveProjectStore(path)
+    store.write_array("结果", np.ones(3))
+
+    def fail(*args, **kwargs):
+        raise OSError("磁盘已满")
+
+    monkeypatch.setattr(zipfile.ZipFile, "writestr", fail)
+    with pytest.raises(OSError):
+        store.write_array("新结果", np.zeros(3))
+    monkeypatch.undo()
+
+    assert store.list_arrays() == ["结果"]
+    store.close()
+    reopened = ArchiveProjectStore(path)
+    assert reopened.list_arrays() == ["结果"]
+    assert np.array_equal(reopened.read_array("结果"), np.ones(3))
+    assert not os.path.exists(path + ".tmp")
@@ -0,0 +1,58 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_manager import DataManager
+from evaluation_methods import EvaluationSession, apply_result, build_decision_matrix
+from indicator_registry import INDICATORS, EVALUATION_RESULT_KEY
+from sqlite_project_store import SQLiteProjectStore
+from workspace_catalog import read_project_summary
+
+
+def _indicator_system():
+    data = DataManager().get_default_indicator_system_data()
+    rng = np.random.default_rng(3)
+    for definition, info in INDICATORS.entries(data):
+        info["数值"] = rng.random(3).tolist() if info["选择状态"] else None
+    return data
+
+
+def _evaluate(data, score_method):
+    matrix, _ = build_decision_matrix(data, 3)
+    session = EvaluationSession(matrix)
+    result = session.evaluate("critic", score_method)
+    apply_result(data, session, result)
+    return result
+
+
+def test_topsis_result_is_saved_as_scheme_scores(tmp_path):
+    data = _indicator_system()
+    result = _evaluate(data, "topsis")
+    saved = data[EVALUATION_RESULT_KEY]
+    assert saved["排序方法"] == "topsis"
+    assert np.allclose(saved["方案得分"], result.scores)
+    assert all(info["综合评估得分分量"] is None for _, info in INDICATORS.entries(data))
+
+    store = SQLiteProjectStore(str(tmp_path / "project.iesdb"))
+    store.write_indicator_system(data)
+    assert store.read_indicator_system()[EVALUATION_RESULT_KEY] == saved
+    store.close()
+
+
+def test_catalog_total_score_is_best_scheme_score(tmp_path):
+    manager = DataManager()
+    manager.create_json_files(str(tmp_path))
+    data = _indicator_system()
+    result = _evaluate(data, "topsis")
+    manager.begin_load(str(tmp_path))
+    manager.get_store().write_indicator_system(data)
+    manager.close_store()
+    assert np.isclose(read_project_summary(str(tmp_path))["total_score"], result.scores.max())
+
+    result = _evaluate(data, "weighted_sum")
+    components = np.sum([info["综合评估得分分量"] for _, info in INDICATORS.entries(data)
+                         if info["综合评估得分分量"] is not None], axis=0)
+    assert np.allclose(components, result.scores)
@@ -0,0 +1,42 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_manager import DataManager
+from financial_engine import FinancialModel
+from tax_engine import value_added_tax
+
+
+def _single_turbine_project():
+    data = DataManager().get_default_user_input_data()
+    data["项目基本信息"]["方案个数"]["数值"] = 1
+    data["项目基本信息"]["项目生命周期"]["数值"] = 10
+    data["财务分析参数"]["预期通货膨胀率"]["数值"] = 0
+    data["成本参数"]["场地购置费用"]["数值"] = 0
+    data["成本参数"]["工程施工费用"]["数值"] = 0
+    data["WT"]["风力发电总装机"]["数值"] = 1000
+    data["WT"]["单位容量投资成本"]["数值"] = 11300
+    data["WT"]["设备使用寿命"]["数值"] = 5
+    data["WT"]["电力电子接口装置成本设备成本的比例"]["数值"] = 0
+    return data
+
+
+def test_replacement_outflow_matches_construction_outflow():
+    flows = FinancialModel.from_user_input(_single_turbine_project(), {}, {}).cash_flows()
+    outflow = flows["现金流出"][0]
+    assert np.isclose(outflow[0], 1130.0)
+    assert np.isclose(outflow[5], outflow[0])
+    assert np.allclose(flows["进项税额"], 0.0)
+
+
+def test_replacement_vat_credits_payable_tax():
+    sales = np.full((1, 3), 1000.0)
+    purchases = np.zeros((1, 3))
+    replacement_vat = np.array([[0.0, 50.0, 200.0]])
+    vat = value_added_tax(sales, purchases, 0.13, 0.0, capital_credit=replacement_vat)
+    assert np.allclose(vat.input, 0.0)
+    assert np.allclose(vat.payable, [[130.0, 80.0, 0.0]])
+    assert np.allclose(vat.credit, [[0.0, 0.0, 70.0]])
@@ -0,0 +1,30 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_manager import DataManager
+from evaluation_checkpoint import CHECKPOINT_PREFIX
+from project_snapshots import SnapshotStore
+
+
+def test_snapshots_leave_out_evaluation_checkpoints(tmp_path):
+    manager = DataManager()
+    (tmp_path / "project").mkdir()
+    manager.create_json_files(str(tmp_path / "project"))
+    manager.begin_load(str(tmp_path / "project"))
+    store = manager.get_store()
+    checkpoint = f"{CHECKPOINT_PREFIX}-abc-0-指标"
+    store.write_array("电价", np.arange(24.0))
+    store.write_array(checkpoint, np.ones(3))
+
+    snapshots = SnapshotStore(str(tmp_path / "snapshots"))
+    snapshot_id = snapshots.create(store)
+    assert list(snapshots.load(snapshot_id)["arrays"]) == ["电价"]
+
+    store.write_array(f"{CHECKPOINT_PREFIX}-def-0-指标", np.zeros(3))
+    snapshots.restore(snapshot_id, store)
+    assert store.list_arrays() == ["电价"]
+    manager.close_store()
@@ -0,0 +1,52 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timeseries_import import import_timeseries_file, read_csv_table
+from series_parser import HOURS_PER_YEAR
+
+
+def _timestamps():
+    start = datetime(2024, 1, 1)
+    return [(start + timedelta(hours=h)).strftime("%Y-%m-%d %H:%M") for h in range(HOURS_PER_YEAR)]
+
+
+def _values():
+    return np.arange(HOURS_PER_YEAR * 2, dtype=np.float64).reshape(HOURS_PER_YEAR, 2) / 7
+
+
+def _write(path, header, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        if header:
+            f.write(header + "\n")
+        f.write("\n".join(rows) + "\n")
+    return str(path)
+
+
+def test_timestamp_index_column_with_header(tmp_path):
+    values = _values()
+    rows = [f"{t},{a!r},{b!r}" for t, (a, b) in zip(_timestamps(), values)]
+    path = _write(tmp_path / "PV-光伏机组出力.csv", "时间,方案1,方案2", rows)
+    result = import_timeseries_file(path, scheme_count=2)
+    assert result.columns == ["方案1", "方案2"]
+    np.testing.assert_array_equal(result.values, values)
+
+
+def test_timestamp_index_column_without_header(tmp_path):
+    values = _values()
+    rows = [f"{t},{a!r},{b!r}" for t, (a, b) in zip(_timestamps(), values)]
+    header, table = read_csv_table(_write(tmp_path / "PV.csv", "", rows))
+    assert header is None
+    np.testing.assert_array_equal(table, values)
+
+
+def test_quoted_timestamp_and_reordered_schemes(tmp_path):
+    values = _values()
+    rows = [f'"{t}",{b!r},{a!r}' for t, (a, b) in zip(_timestamps(), values)]
+    path = _write(tmp_path / "PV-光伏机组出力.csv", '"时间","方案2","方案1"', rows)
+    result = import_timeseries_file(path, scheme_count=2)
+    np.testing.assert_array_equal(result.values, values)
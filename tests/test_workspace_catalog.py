@@ -0,0 +1,29 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_manager import DataManager
+from workspace_catalog import WorkspaceCatalog
+
+
+def test_scan_indexes_single_file_projects(tmp_path):
+    folder = tmp_path / "projects" / "风光制氢"
+    folder.mkdir(parents=True)
+    manager = DataManager()
+    manager.create_json_files(str(folder))
+    manager.begin_load(str(folder))
+    manager.export_single_file(str(tmp_path / "projects" / "单文件.iesdb"))
+    manager.export_archive(str(tmp_path / "projects" / "分享.iesz"))
+    manager.close_store()
+    (tmp_path / "projects" / "其他.iesdb").write_bytes(b"not a project")
+
+    catalog = WorkspaceCatalog(":memory:")
+    updated, removed = catalog.scan(str(tmp_path / "projects"))
+    names = sorted(project["folder_name"] for project in catalog.search())
+    assert (updated, removed) == (3, 0)
+    assert names == sorted(["风光制氢", "单文件.iesdb", "分享.iesz"])
+
+    # 未修改的项目不重新读取
+    assert catalog.scan(str(tmp_path / "projects")) == (0, 0)
+    catalog.close()
@@ -0,0 +1,248 @@
+import csv
+import os
+import re
+import numpy as np
+
+from project_store import TIMESERIES_NAMES
+from series_parser import HOURS_PER_YEAR
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow 为可选依赖，未安装时只支持CSV
+    pq = None
+
+# 支持的导入文件类型
+CSV_EXTENSIONS = (".csv", ".txt", ".tsv")
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+
+# 视为时间或序号的列名，导入时跳过
+INDEX_COLUMN_NAMES = {"时间", "时刻", "小时", "日期", "序号", "编号",
+                      "time", "hour", "date", "datetime", "timestamp", "index", "t", "h"}
+
+# 方案列名，如 方案1、scheme 2、S3、3
+_SCHEME_COLUMN = re.compile(r'^\s*(?:方案|scheme|s)?\s*[_\-#]?\s*(\d+)\s*$', re.IGNORECASE)
+
+_DELIMITERS = (",", "\t", ";", "，")
+
+
+class TimeseriesImportError(ValueError):
+    """时序数据导入失败"""
+
+
+class ImportResult:
+    """单个文件的导入结果"""
+
+    __slots__ = ('path', 'name', 'values', 'columns', 'warnings')
+
+    def __init__(self, path, name, values, columns, warnings):
+        self.path = path
+        self.name = name            # 对应的时序数据名称
+        self.values = values        # (小时数, 方案数) 数组
+        self.columns = columns      # 各方案对应的源列名
+        self.warnings = warnings
+
+
+def parquet_available():
+    """是否安装了 pyarrow"""
+    return pq is not None
+
+
+def supported_extensions():
+    """当前环境可导入的文件扩展名"""
+    return CSV_EXTENSIONS + (PARQUET_EXTENSIONS if pq is not None else ())
+
+
+def match_timeseries_name(path):
+    """根据文件名匹配时序数据名称，无法识别时返回None"""
+    stem = os.path.splitext(os.path.basename(path))[0].strip()
+    if stem in TIMESERIES_NAMES:
+        return stem
+    for name in TIMESERIES_NAMES:
+        # 去掉单位后的名称，如 "PV-光伏机组出力"
+        if name.split("(")[0] in stem:
+            return name
+    for name in TIMESERIES_NAMES:
+        # 只写了名称中的说明部分，如 "光伏机组出力"
+        if name.split("(")[0].split("-", 1)[-1] in stem:
+            return name
+    # 文件名是说明部分的简称，如 "合成氨"
+    candidates = [name for name in TIMESERIES_NAMES if len(stem) >= 2 and stem in name]
+    if len(candidates) == 1:
+        return candidates[0]
+    prefix = re.split(r'[-_\s]', stem, maxsplit=1)[0].upper()
+    candidates = [name for name in TIMESERIES_NAMES if name.split("-")[0] == prefix]
+    return candidates[0] if len(candidates) == 1 else None
+
+
+def _sniff_delimiter(line):
+    counts = [(line.count(d), d) for d in _DELIMITERS]
+    count, delimiter = max(counts)
+    return delimiter if count else None
+
+
+def _is_number(token):
+    try:
+        float(token)
+        return True
+    except ValueError:
+        return False
+
+
+def _split_line(line, delimiter):
+    """拆分一行；含引号时按CSV规则拆分，引号内的分隔符和空格不拆开"""
+    if delimiter is None:
+        return [cell.strip() for cell in line.split()]
+    if '"' in line:
+        return [cell.strip() for cell in next(csv.reader([line], delimiter=delimiter))]
+    return [cell.strip() for cell in line.split(delimiter)]
+
+
+def _text_columns(cells):
+    return {i for i, cell in enumerate(cells) if cell and not _is_number(cell)}
+
+
+def read_csv_table(path):
+    """读取CSV数值表，返回 (列名列表, (行数, 列数) 数组)；没有表头时列名为None
+
+    时间戳、序号等索引列（列名为 INDEX_COLUMN_NAMES 之一，或第一行数据不是数值的列）
+    在转换前去掉，只返回方案数据列。
+    """
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        text = f.read()
+    lines = text.splitlines()
+    while lines and not lines[-1].strip():
+        lines.pop()
+    if not lines:
+        raise TimeseriesImportError("文件为空")
+
+    delimiter = _sniff_delimiter(lines[0])
+    first = _split_line(lines[0], delimiter)
+    text_columns = _text_columns(first)
+    # 第一行含索引列名或文本列与第二行不同时为表头；只有索引列是文本（如时间戳）时为数据行
+    header = None
+    if any(cell.lower() in INDEX_COLUMN_NAMES for cell in first) or text_columns and (
+            len(lines) == 1 or text_columns != _text_columns(_split_line(lines[1], delimiter))):
+        header = first
+        lines = lines[1:]
+    if not lines:
+        raise TimeseriesImportError("文件中没有数据行")
+    n_cols = len(first)
+    first_row = _split_line(lines[0], delimiter)
+    index_columns = _text_columns(first_row)
+    if header is not None:
+        index_columns |= {i for i, name in enumerate(header) if name.strip().lower() in INDEX_COLUMN_NAMES}
+    data_columns = [i for i in range(n_cols) if i not in index_columns]
+    if header is not None:
+        header = [header[i] for i in data_columns]
+    if not data_columns:
+        raise TimeseriesImportError("文件中没有数值列")
+
+    # 快速路径：索引列都在最前面且没有引号时，去掉索引列后整张表一次性转换
+    skip = len(index_columns)
+    body_lines = lines
+    if index_columns == set(range(skip)) and (skip == 0 or (delimiter and not any('"' in line for line in lines))):
+        if skip:
+            body_lines = [line.split(delimiter, skip)[-1] for line in lines]
+        body = "\n".join(body_lines)
+        if delimiter:
+            body = body.replace(delimiter, " ")
+        tokens = body.split()
+        try:
+            values = np.array(tokens, dtype=np.float64)
+            if values.size == len(lines) * len(data_columns):
+                return header, values.reshape(len(lines), len(data_columns))
+        except ValueError:
+            pass
+
+    # 存在空值、非数值、引号或行长度不一致时逐行定位
+    values = np.full((len(lines), len(data_columns)), np.nan)
+    for row, line in enumerate(lines):
+        cells = _split_line(line, delimiter)
+        if len(cells) != n_cols:
+            raise TimeseriesImportError(f"第 {row + (2 if header is not None else 1)} 行有 {len(cells)} 列，应为 {n_cols} 列")
+        for k, col in enumerate(data_columns):
+            cell = cells[col]
+            if not cell:
+                continue
+            try:
+                values[row, k] = float(cell)
+            except ValueError:
+                raise TimeseriesImportError(
+                    f"第 {row + (2 if header is not None else 1)} 行第 {col + 1} 列不是数值: {cell}") from None
+    return header, values
+
+
+def read_parquet_table(path):
+    """读取Parquet数值表，返回 (列名列表, (行数, 列数) 数组)"""
+    if pq is None:
+        raise TimeseriesImportError("未安装 pyarrow，无法导入 Parquet 文件")
+    table = pq.read_table(path)
+    header = []
+    columns = []
+    for name, column in zip(table.column_names, table.columns):
+        try:
+            values = column.to_numpy(zero_copy_only=False).astype(np.float64)
+        except (TypeError, ValueError):
+            continue  # 跳过时间戳、文本等非数值列
+        header.append(name)
+        columns.append(values)
+    if not columns:
+        raise TimeseriesImportError("文件中没有数值列")
+    return header, np.column_stack(columns)
+
+
+def read_table(path):
+    """按扩展名读取CSV或Parquet数值表"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in PARQUET_EXTENSIONS:
+        return read_parquet_table(path)
+    return read_csv_table(path)
+
+
+def map_scheme_columns(header, n_cols, scheme_count=None):
+    """把数据列映射到方案，返回各方案对应的列下标和说明
+
+    跳过时间/序号列；列名可以识别为方案编号时按编号排列，否则按列顺序排列。
+    """
+    if header is None:
+        candidates = list(range(n_cols))
+        names = [f"第{i + 1}列" for i in candidates]
+    else:
+        candidates = [i for i, name in enumerate(header)
+                      if str(name).strip().lower() not in INDEX_COLUMN_NAMES]
+        names = [str(header[i]) for i in candidates]
+
+    numbers = [_SCHEME_COLUMN.match(name) for name in names]
+    if header is not None and all(numbers) and \
+            sorted(int(m.group(1)) for m in numbers) == list(range(1, len(numbers) + 1)):
+        order = sorted(range(len(candidates)), key=lambda k: int(numbers[k].group(1)))
+        candidates = [candidates[k] for k in order]
+        names = [names[k] for k in order]
+
+    warnings = []
+    if scheme_count:
+        if len(candidates) < scheme_count:
+            raise TimeseriesImportError(f"文件只有 {len(candidates)} 个数据列，少于方案个数 {scheme_count}")
+        if len(candidates) > scheme_count:
+            warnings.append(f"文件有 {len(candidates)} 个数据列，只导入前 {scheme_count} 列")
+            candidates, names = candidates[:scheme_count], names[:scheme_count]
+    return candidates, names, warnings
+
+
+def import_timeseries_file(path, scheme_count=None, name=None, hours=HOURS_PER_YEAR):
+    """读取并校验一个时序数据文件，返回 ImportResult（不写入项目）"""
+    name = name or match_timeseries_name(path)
+    if name is None:
+        raise TimeseriesImportError(f"无法根据文件名识别数据类型: {os.path.basename(path)}")
+
+    header, table = read_table(path)
+    columns, column_names, warnings = map_scheme_columns(header, table.shape[1], scheme_count)
+    values = np.ascontiguousarray(table[:, columns])
+
+    if values.shape[0] != hours:
+        raise TimeseriesImportError(f"数据有 {values.shape[0]} 行，应为 {hours} 行（逐时数据）")
+    bad_rows, bad_cols = np.nonzero(~np.isfinite(values))
+    if len(bad_rows):
+        raise TimeseriesImportError(
+            f"{column_names[bad_cols[0]]} 第 {bad_rows[0] + 1} 小时的数据缺失或无效（共 {len(bad_rows)} 处）")
+    return ImportResult(path, name, values, column_names, warnings)
@@ -0,0 +1,276 @@
+import os
+import json
+import sqlite3
+import time
+import zipfile
+
+from indicator_registry import EVALUATION_RESULT_KEY
+from project_store import open_project_store, is_project_path
+from archive_project_store import ARCHIVE_PROJECT_EXTENSION
+from sqlite_project_store import SQLITE_PROJECT_EXTENSION
+
+# 默认目录数据库位置
+DEFAULT_CATALOG_PATH = os.path.join(os.path.expanduser("~"), ".assessment_software", "workspace.db")
+
+# 判断项目文件夹所需的文件
+PROJECT_MARKER_FILES = ("User_input.json", "IndicatorSystem.json")
+
+# 单文件项目的扩展名
+PROJECT_FILE_EXTENSIONS = (SQLITE_PROJECT_EXTENSION, ARCHIVE_PROJECT_EXTENSION)
+
+# 读取单个项目摘要时可能出现的错误，出错的项目跳过
+INDEX_ERRORS = (OSError, ValueError, KeyError, sqlite3.Error, zipfile.BadZipFile)
+
+# 目录中记录的设备
+CATALOG_EQUIPMENT = ("WT", "PV", "EL", "HES", "HFC", "ESS")
+
+# 允许排序的列
+SORTABLE_COLUMNS = ("project_name", "folder_name", "lifecycle", "scheme_count",
+                    "total_score", "mtime", "path")
+
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    folder_name TEXT NOT NULL,
+    project_name TEXT,
+    lifecycle REAL,
+    scheme_count INTEGER,
+    equipment TEXT,
+    scores TEXT,
+    total_score REAL,
+    mtime REAL NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_projects_root ON projects(root);
+CREATE INDEX IF NOT EXISTS idx_projects_name ON projects(project_name);
+CREATE INDEX IF NOT EXISTS idx_projects_mtime ON projects(mtime);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def is_project_folder(path):
+    """判断文件夹是否为评估项目"""
+    return all(os.path.isfile(os.path.join(path, name)) for name in PROJECT_MARKER_FILES)
+
+
+def is_project_file(path):
+    """判断文件是否为单文件项目（先按扩展名筛选，再检查文件内容）"""
+    return os.path.splitext(path)[1].lower() in PROJECT_FILE_EXTENSIONS and is_project_path(path)
+
+
+def is_catalog_project(path):
+    """判断路径是否为可以索引的项目（项目文件夹或单文件项目）"""
+    return is_project_folder(path) or is_project_file(path)
+
+
+def project_mtime(path):
+    """项目的修改时间：单文件项目取文件的修改时间，项目文件夹取JSON文件中最新的修改时间"""
+    if os.path.isfile(path):
+        return os.stat(path).st_mtime
+    return max(os.stat(os.path.join(path, name)).st_mtime for name in PROJECT_MARKER_FILES)
+
+
+def read_project_summary(path):
+    """读取项目摘要信息，按项目类型用打开项目时相同的存储读取"""
+    store = open_project_store(path)
+    try:
+        user_input = store.read_user_input()
+        indicator_system = store.read_indicator_system()
+    finally:
+        store.close()
+
+    basic_info = user_input.get("项目基本信息", {})
+    lifecycle = basic_info.get("项目生命周期", {}).get("数值")
+    scheme_count = basic_info.get("方案个数", {}).get("数值")
+
+    equipment = [name for name in CATALOG_EQUIPMENT
+                 if user_input.get(name, {}).get("设备选择状态", False)]
+
+    # 最近一次评估的各指标得分分量
+    scores = {}
+    for indicators in indicator_system.values():
+        if isinstance(indicators, dict):
+            for indicator_info in indicators.values():
+                if isinstance(indicator_info, dict) and indicator_info.get("综合评估得分分量") is not None:
+                    scores[indicator_info.get("指标编码", "")] = indicator_info["综合评估得分分量"]
+    # 最近一次评估保存了各方案得分时取最优方案的得分（TOPSIS等得分不能由分量相加得到）
+    result = indicator_system.get(EVALUATION_RESULT_KEY)
+    if isinstance(result, dict) and result.get("方案得分"):
+        total_score = max(result["方案得分"])
+    else:
+        total_score = _total_score(scores)
+
+    return {
+        'project_name': (basic_info.get("项目名称", {}).get("数值")
+                         or os.path.splitext(os.path.basename(path))[0]),
+        'lifecycle': lifecycle,
+        'scheme_count': int(scheme_count) if isinstance(scheme_count, (int, float)) else None,
+        'equipment': ",".join(equipment),
+        'scores': json.dumps(scores, ensure_ascii=False),
+        'total_score': total_score
+    }
+
+
+def _total_score(scores):
+    """综合评估总分：得分分量可能是单值或各方案的列表，先按方案逐项相加，再取最优方案的总分"""
+    common = None           # 单值分量，计入每个方案
+    per_scheme = {}         # 方案序号 -> 列表分量之和
+    for value in scores.values():
+        if isinstance(value, list):
+            for s, v in enumerate(value):
+                if isinstance(v, (int, float)):
+                    per_scheme[s] = per_scheme.get(s, 0.0) + v
+        elif isinstance(value, (int, float)):
+            common = (common or 0.0) + value
+    if not per_scheme:
+        return common
+    return max(per_scheme.values()) + (common or 0.0)
+
+
+class WorkspaceCatalog:
+    """工作区项目目录，把项目文件夹的摘要信息索引到本地SQLite数据库，支持快速搜索和排序"""
+
+    def __init__(self, db_path=DEFAULT_CATALOG_PATH):
+        self.db_path = db_path
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.connection = sqlite3.connect(db_path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(CATALOG_SCHEMA)
+
+    def close(self):
+        """关闭数据库连接"""
+        self.connection.close()
+
+    def get_setting(self, key, default=None):
+        """读取目录设置"""
+        row = self.connection.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else default
+
+    def set_setting(self, key, value):
+        """保存目录设置"""
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, value))
+
+    def find_projects(self, root, max_depth=3):
+        """查找根目录下的项目文件夹和单文件项目，不进入项目文件夹内部"""
+        root = os.path.abspath(root)
+        if is_catalog_project(root):
+            return [root]
+
+        projects = []
+        pending = [(root, 0)]
+        while pending:
+            folder, depth = pending.pop()
+            try:
+                entries = list(os.scandir(folder))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_file(follow_symlinks=False):
+                    if is_project_file(entry.path):
+                        projects.append(entry.path)
+                    continue
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                if is_project_folder(entry.path):
+                    projects.append(entry.path)
+                elif depth + 1 < max_depth:
+                    pending.append((entry.path, depth + 1))
+        return projects
+
+    def scan(self, root, max_depth=3):
+        """增量扫描根目录，只重新读取修改时间发生变化的项目，返回 (更新数, 删除数)"""
+        root = os.path.abspath(root)
+        known = {row["path"]: row["mtime"] for row in self.connection.execute(
+            "SELECT path, mtime FROM projects WHERE root = ?", (root,))}
+
+        updated = 0
+        found = set()
+        with self.connection:
+            for path in self.find_projects(root, max_depth):
+                found.add(path)
+                try:
+                    mtime = project_mtime(path)
+                    if known.get(path) == mtime:
+                        continue
+                    self._upsert(path, root, mtime, read_project_summary(path))
+                    updated += 1
+                except INDEX_ERRORS as e:
+                    print(f"索引项目失败：{path}：{str(e)}")
+
+            removed = [path for path in known if path not in found]
+            self.connection.executemany("DELETE FROM projects WHERE path = ?",
+                                        [(path,) for path in removed])
+
+        self.set_setting("last_root", root)
+        return updated, len(removed)
+
+    def index_project(self, path):
+        """立即索引单个项目（例如新建或打开项目之后）"""
+        path = os.path.abspath(path)
+        if not is_catalog_project(path):
+            return False
+        row = self.connection.execute("SELECT root FROM projects WHERE path = ?", (path,)).fetchone()
+        root = row["root"] if row else os.path.dirname(path)
+        try:
+            with self.connection:
+                self._upsert(path, root, project_mtime(path), read_project_summary(path))
+            return True
+        except INDEX_ERRORS as e:
+            print(f"索引项目失败：{path}：{str(e)}")
+            return False
+
+    def _upsert(self, path, root, mtime, summary):
+        self.connection.execute(
+            """INSERT OR REPLACE INTO projects
+               (path, root, folder_name, project_name, lifecycle, scheme_count,
+                equipment, scores, total_score, mtime, indexed_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (path, root, os.path.basename(path), summary['project_name'], summary['lifecycle'],
+             summary['scheme_count'], summary['equipment'], summary['scores'],
+             summary['total_score'], mtime, time.time()))
+
+    def search(self, text="", root=None, order_by="mtime", descending=True, limit=None):
+        """按名称、文件夹或设备搜索项目，返回字典列表"""
+        if order_by not in SORTABLE_COLUMNS:
+            raise ValueError(f"不支持的排序列: {order_by}")
+
+        conditions = []
+        params = []
+        if root:
+            conditions.append("root = ?")
+            params.append(os.path.abspath(root))
+        text = text.strip()
+        if text:
+            pattern = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            conditions.append("(project_name LIKE ? ESCAPE '\\' OR folder_name LIKE ? ESCAPE '\\'"
+                              " OR equipment LIKE ? ESCAPE '\\')")
+            params.extend([pattern] * 3)
+
+        sql = "SELECT * FROM projects"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        results = []
+        for row in self.connection.execute(sql, params):
+            item = dict(row)
+            item['scores'] = json.loads(item['scores']) if item['scores'] else {}
+            results.append(item)
+        return results
+
+    def remove(self, path):
+        """从目录中移除项目"""
+        with self.connection:
+            self.connection.execute("DELETE FROM projects WHERE path = ?", (os.path.abspath(path),))